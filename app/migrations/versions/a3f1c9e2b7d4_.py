@@ -0,0 +1,41 @@
+"""
+
+Revision ID: a3f1c9e2b7d4
+Revises: 02cde6b3561e
+Create Date: 2026-10-17 10:40:12.418305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3f1c9e2b7d4'
+down_revision: Union[str, None] = '02cde6b3561e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Композитный индекс под keyset-пагинацию по (created_at, id) среди активных проектов.
+    # CONCURRENTLY не блокирует запись в projects, но не работает внутри транзакции
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_projects_status_created_at_id',
+            'projects',
+            ['status', 'created_at', 'id'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_projects_status_created_at_id',
+            table_name='projects',
+            postgresql_concurrently=True,
+            if_exists=True
+        )
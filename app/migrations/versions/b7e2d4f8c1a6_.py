@@ -0,0 +1,49 @@
+"""
+
+Revision ID: b7e2d4f8c1a6
+Revises: a3f1c9e2b7d4
+Create Date: 2026-10-17 11:52:37.204917
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e2d4f8c1a6'
+down_revision: Union[str, None] = 'a3f1c9e2b7d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Генерируемая колонка для полнотекстового поиска + GIN индекс по ней
+    op.add_column(
+        'projects',
+        sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed(
+                "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+                "setweight(to_tsvector('english', coalesce(short_description, '')), 'B') || "
+                "setweight(to_tsvector('english', coalesce(description, '')), 'C')",
+                persisted=True
+            ),
+            nullable=True
+        )
+    )
+    op.create_index(
+        'ix_projects_search_vector',
+        'projects',
+        ['search_vector'],
+        unique=False,
+        postgresql_using='gin'
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_projects_search_vector', table_name='projects', postgresql_using='gin')
+    op.drop_column('projects', 'search_vector')
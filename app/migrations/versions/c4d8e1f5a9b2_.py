@@ -0,0 +1,49 @@
+"""
+
+Revision ID: c4d8e1f5a9b2
+Revises: b7e2d4f8c1a6
+Create Date: 2026-10-17 13:05:48.771203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d8e1f5a9b2'
+down_revision: Union[str, None] = 'b7e2d4f8c1a6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (имя, таблица, колонки) - под фильтры и сортировки публичных и админских запросов.
+# projects(status, created_at) уже покрыт ix_projects_status_created_at_id.
+INDEXES = [
+    ('ix_projects_status_featured', 'projects', ['status', 'featured']),
+    ('ix_projects_category', 'projects', ['category']),
+    ('ix_service_requests_status_priority_created_at', 'service_requests', ['status', 'priority', 'created_at']),
+    ('ix_project_photos_project_id_order_index', 'project_photos', ['project_id', 'order_index']),
+    ('ix_project_developers_developer_id', 'project_developers', ['developer_id']),
+]
+
+
+def upgrade() -> None:
+    # CONCURRENTLY не блокирует запись в таблицы, но не работает внутри транзакции.
+    # IF NOT EXISTS - чтобы можно было перезапустить миграцию после сбоя посередине
+    # (упавший CONCURRENTLY оставляет INVALID индекс - его надо удалить руками).
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                postgresql_concurrently=True,
+                if_not_exists=True
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,77 @@
+"""
+
+Revision ID: d5e9f2a6b3c7
+Revises: c4d8e1f5a9b2
+Create Date: 2026-10-17 14:21:09.530614
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5e9f2a6b3c7'
+down_revision: Union[str, None] = 'c4d8e1f5a9b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # JSON -> JSONB: только JSONB умеет @> и GIN индексы
+    op.alter_column(
+        'developers',
+        'skills',
+        type_=postgresql.JSONB(),
+        existing_type=sa.JSON(),
+        existing_nullable=True,
+        postgresql_using='skills::jsonb'
+    )
+    op.alter_column(
+        'service_requests',
+        'requirements',
+        type_=postgresql.JSONB(),
+        existing_type=sa.JSON(),
+        existing_nullable=True,
+        postgresql_using='requirements::jsonb'
+    )
+    # jsonb_path_ops: индекс меньше и быстрее, поддерживает только @> - нам больше и не нужно
+    op.create_index(
+        'ix_developers_skills',
+        'developers',
+        ['skills'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'skills': 'jsonb_path_ops'}
+    )
+    op.create_index(
+        'ix_service_requests_requirements',
+        'service_requests',
+        ['requirements'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'requirements': 'jsonb_path_ops'}
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_service_requests_requirements', table_name='service_requests', postgresql_using='gin')
+    op.drop_index('ix_developers_skills', table_name='developers', postgresql_using='gin')
+    op.alter_column(
+        'service_requests',
+        'requirements',
+        type_=sa.JSON(),
+        existing_type=postgresql.JSONB(),
+        existing_nullable=True,
+        postgresql_using='requirements::json'
+    )
+    op.alter_column(
+        'developers',
+        'skills',
+        type_=sa.JSON(),
+        existing_type=postgresql.JSONB(),
+        existing_nullable=True,
+        postgresql_using='skills::json'
+    )
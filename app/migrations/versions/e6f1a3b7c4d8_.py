@@ -0,0 +1,51 @@
+"""
+
+Revision ID: e6f1a3b7c4d8
+Revises: d5e9f2a6b3c7
+Create Date: 2026-10-17 15:02:44.190388
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6f1a3b7c4d8'
+down_revision: Union[str, None] = 'd5e9f2a6b3c7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (имя ограничения, таблица, колонка, ссылка, ondelete после миграции).
+# Имена - те, что Postgres дал безымянным FK из первых миграций.
+FOREIGN_KEYS = [
+    ('project_developers_project_id_fkey', 'project_developers', 'project_id', 'projects', 'CASCADE'),
+    ('project_developers_developer_id_fkey', 'project_developers', 'developer_id', 'developers', 'CASCADE'),
+    # Удаленный разработчик не должен блокировать удаление - заявка просто остается без исполнителя
+    ('service_requests_developer_id_fkey', 'service_requests', 'developer_id', 'developers', 'SET NULL'),
+]
+
+
+def _replace_foreign_keys(with_ondelete: bool) -> None:
+    for name, table, column, referred, ondelete in FOREIGN_KEYS:
+        op.drop_constraint(name, table, type_='foreignkey')
+        # NOT VALID + VALIDATE: проверка существующих строк не держит блокировку записи
+        op.create_foreign_key(
+            name,
+            table,
+            referred,
+            [column],
+            ['id'],
+            ondelete=ondelete if with_ondelete else None,
+            postgresql_not_valid=True
+        )
+        op.execute(f'ALTER TABLE {table} VALIDATE CONSTRAINT {name}')
+
+
+def upgrade() -> None:
+    # Массовое удаление идет одним DELETE ... RETURNING - связи чистит сама БД
+    _replace_foreign_keys(with_ondelete=True)
+
+
+def downgrade() -> None:
+    _replace_foreign_keys(with_ondelete=False)
@@ -0,0 +1,165 @@
+"""
+
+Revision ID: f7a2b5c9d3e1
+Revises: e6f1a3b7c4d8
+Create Date: 2026-10-17 16:10:27.845512
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f7a2b5c9d3e1'
+down_revision: Union[str, None] = 'e6f1a3b7c4d8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = (
+    'id, client_name, client_email, client_phone, company_name, project_type, budget_range, timeline, '
+    'description, requirements, status, priority, developer_id, notes, created_at, updated_at'
+)
+
+# Месячные партиции service_requests_yYYYYmMM: от самой старой заявки до +3 месяцев вперед.
+# Дальше новые месяцы создает storages.psql.partitions при старте сервера и по расписанию.
+# Если обслуживание отстанет, вставка не упадет - строка уйдет в DEFAULT-партицию,
+# откуда ensure_partitions перенесет ее в партицию месяца.
+CREATE_PARTITIONS = """
+DO $$
+DECLARE
+    month timestamp := date_trunc('month', COALESCE((SELECT min(created_at) FROM service_requests_unpartitioned), now()));
+    last_month timestamp := date_trunc('month', now()) + interval '3 months';
+BEGIN
+    WHILE month <= last_month LOOP
+        EXECUTE format(
+            'CREATE TABLE IF NOT EXISTS %I PARTITION OF service_requests FOR VALUES FROM (%L) TO (%L)',
+            'service_requests_' || to_char(month, '"y"YYYY"m"MM'),
+            month,
+            month + interval '1 month'
+        );
+        month := month + interval '1 month';
+    END LOOP;
+END $$;
+"""
+
+
+def _service_request_columns(id_column: sa.Column) -> list:
+    return [
+        id_column,
+        sa.Column('client_name', sa.String(length=100), nullable=False),
+        sa.Column('client_email', sa.String(length=255), nullable=False),
+        sa.Column('client_phone', sa.String(length=50), nullable=True),
+        sa.Column('company_name', sa.String(length=100), nullable=True),
+        sa.Column('project_type', sa.String(length=50), nullable=False),
+        sa.Column('budget_range', sa.String(length=50), nullable=True),
+        sa.Column('timeline', sa.String(length=100), nullable=True),
+        sa.Column('description', sa.Text(), nullable=False),
+        sa.Column('requirements', postgresql.JSONB(), nullable=True),
+        sa.Column('status', sa.String(length=50), nullable=False),
+        sa.Column('priority', sa.String(length=20), nullable=False),
+        sa.Column('developer_id', sa.Integer(), nullable=True),
+        sa.Column('notes', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+    ]
+
+
+def _create_indexes() -> None:
+    # Индексы на партиционированной таблице создаются в каждой партиции (и в будущих тоже)
+    op.create_index('ix_service_requests_created_at', 'service_requests', ['created_at'], unique=False)
+    op.create_index(
+        'ix_service_requests_status_priority_created_at',
+        'service_requests',
+        ['status', 'priority', 'created_at'],
+        unique=False
+    )
+    op.create_index(
+        'ix_service_requests_requirements',
+        'service_requests',
+        ['requirements'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'requirements': 'jsonb_path_ops'}
+    )
+
+
+def upgrade() -> None:
+    # Старую таблицу убираем в сторону; имена ее индексов освобождаем для новой
+    op.drop_index('ix_service_requests_requirements', table_name='service_requests', postgresql_using='gin')
+    op.drop_index('ix_service_requests_status_priority_created_at', table_name='service_requests')
+    op.rename_table('service_requests', 'service_requests_unpartitioned')
+    op.execute('ALTER INDEX service_requests_pkey RENAME TO service_requests_unpartitioned_pkey')
+
+    # Ключ партиционирования обязан входить в PK - поэтому (id, created_at).
+    # id по-прежнему из старой последовательности, так что id остаются уникальными.
+    op.create_table(
+        'service_requests',
+        *_service_request_columns(
+            sa.Column('id', sa.Integer(), server_default=sa.text("nextval('service_requests_id_seq')"), nullable=False)
+        ),
+        sa.ForeignKeyConstraint(['developer_id'], ['developers.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id', 'created_at'),
+        postgresql_partition_by='RANGE (created_at)'
+    )
+    op.execute(CREATE_PARTITIONS)
+    op.execute('CREATE TABLE service_requests_default PARTITION OF service_requests DEFAULT')
+    op.execute(f'INSERT INTO service_requests ({COLUMNS}) SELECT {COLUMNS} FROM service_requests_unpartitioned')
+    op.execute('ALTER SEQUENCE service_requests_id_seq OWNED BY service_requests.id')
+    op.drop_table('service_requests_unpartitioned')
+    _create_indexes()
+
+    # Архив старых партиций: обычная таблица без вторичных индексов, только PK
+    op.create_table(
+        'service_requests_archive',
+        *_service_request_columns(sa.Column('id', sa.Integer(), nullable=False)),
+        sa.Column('archived_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('id', 'created_at')
+    )
+
+
+def downgrade() -> None:
+    # Обратно в одну таблицу - вместе с архивом, чтобы ничего не потерять
+    op.execute('ALTER TABLE service_requests RENAME TO service_requests_partitioned')
+    op.execute('ALTER INDEX service_requests_pkey RENAME TO service_requests_partitioned_pkey')
+    op.drop_index('ix_service_requests_created_at', table_name='service_requests_partitioned')
+    op.drop_index('ix_service_requests_status_priority_created_at', table_name='service_requests_partitioned')
+    op.drop_index(
+        'ix_service_requests_requirements',
+        table_name='service_requests_partitioned',
+        postgresql_using='gin'
+    )
+
+    op.create_table(
+        'service_requests',
+        *_service_request_columns(
+            sa.Column('id', sa.Integer(), server_default=sa.text("nextval('service_requests_id_seq')"), nullable=False)
+        ),
+        sa.ForeignKeyConstraint(['developer_id'], ['developers.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.execute(f'INSERT INTO service_requests ({COLUMNS}) SELECT {COLUMNS} FROM service_requests_archive')
+    op.execute(f'INSERT INTO service_requests ({COLUMNS}) SELECT {COLUMNS} FROM service_requests_partitioned')
+    op.execute('ALTER SEQUENCE service_requests_id_seq OWNED BY service_requests.id')
+    # Партиции (и DEFAULT) удаляются вместе с родителем
+    op.drop_table('service_requests_partitioned')
+    op.drop_table('service_requests_archive')
+
+    # Индекс по created_at модель объявляет и без партиций - оставляем его
+    op.create_index('ix_service_requests_created_at', 'service_requests', ['created_at'], unique=False)
+    op.create_index(
+        'ix_service_requests_status_priority_created_at',
+        'service_requests',
+        ['status', 'priority', 'created_at'],
+        unique=False
+    )
+    op.create_index(
+        'ix_service_requests_requirements',
+        'service_requests',
+        ['requirements'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'requirements': 'jsonb_path_ops'}
+    )
@@ -0,0 +1,122 @@
+# app/server/benchmarks/serialization.py
+"""
+Сравнение старого и нового пути сериализации на списке из 1000 элементов.
+
+Запуск из app/server:
+    python -m benchmarks.serialization [--items 1000] [--rounds 50]
+"""
+import argparse
+import json
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from routers.public import PublicProject, project_out
+from services.portfolio_snapshot import DeveloperView, PortfolioSnapshot, ProjectView
+from services.serialization import dumps
+
+
+def build_snapshot(items: int) -> PortfolioSnapshot:
+    snapshot = PortfolioSnapshot(db_session=None)
+    snapshot.developers = {
+        dev_id: DeveloperView(
+            id=dev_id, name=f"Developer {dev_id}", bio="Bio " * 20, avatar_url=f"https://cdn.example/a{dev_id}.jpg",
+            github_url=None, linkedin_url=None, portfolio_url=None, years_experience=5,
+            skills=["Python", "React"], specialization="Full-Stack Developer", is_active=True, order_priority=dev_id
+        )
+        for dev_id in range(1, 6)
+    }
+    started = datetime(2025, 1, 1)
+    snapshot.projects = {
+        project_id: ProjectView(
+            id=project_id, title=f"Project {project_id}", description="Long description. " * 30,
+            short_description="Short description of the project", demo_url="https://demo.example",
+            github_url="https://github.com/example", image_urls=(f"https://cdn.example/p{project_id}_1.jpg",
+                                                              f"https://cdn.example/p{project_id}_2.jpg"),
+            project_type="web", category="saas", duration_months=3, featured=project_id % 5 == 0,
+            created_at=started + timedelta(hours=project_id), developer_ids=(1 + project_id % 5, 1 + (project_id + 1) % 5)
+        )
+        for project_id in range(1, items + 1)
+    }
+    snapshot._reindex_projects()
+    return snapshot
+
+
+def legacy_project_dict(project, snapshot):
+    """Старый project_to_dict: промежуточный dict на каждую строку"""
+    return {
+        "id": project.id,
+        "title": project.title,
+        "description": project.description,
+        "short_description": project.short_description,
+        "demo_url": project.demo_url,
+        "github_url": project.github_url,
+        "image_urls": list(project.image_urls),
+        "project_type": project.project_type,
+        "category": project.category,
+        "duration_months": project.duration_months,
+        "developers": [
+            {"id": dev.id, "name": dev.name, "specialization": dev.specialization, "avatar_url": dev.avatar_url}
+            for dev in (snapshot.developers[dev_id] for dev_id in project.developer_ids)
+        ]
+    }
+
+
+def measure(label: str, func, items: int, rounds: int) -> float:
+    func()  # прогрев
+    started = time.perf_counter()
+    for _ in range(rounds):
+        func()
+    per_item_us = (time.perf_counter() - started) / rounds / items * 1_000_000
+    print(f"{label:<58} {per_item_us:8.2f} µs/item")
+    return per_item_us
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+
+    snapshot = build_snapshot(args.items)
+    projects = [snapshot.projects[project_id] for project_id in snapshot.project_order]
+    response_adapter = TypeAdapter(List[PublicProject])
+
+    def public_before():
+        # dict -> валидация по response_model -> dump -> json.dumps (как делал FastAPI)
+        data = [legacy_project_dict(project, snapshot) for project in projects]
+        validated = response_adapter.validate_python(data)
+        return JSONResponse(content=response_adapter.dump_python(validated, mode="json")).body
+
+    def public_after():
+        return dumps([project_out(project, snapshot) for project in projects])
+
+    admin_rows = [
+        {"id": project.id, "title": project.title, "description": project.description,
+         "created_at": project.created_at, "updated_at": project.created_at}
+        for project in projects
+    ]
+
+    def admin_before():
+        return json.dumps([
+            {**row, "created_at": row["created_at"].isoformat(), "updated_at": row["updated_at"].isoformat()}
+            for row in admin_rows
+        ]).encode()
+
+    def admin_after():
+        return dumps(admin_rows)
+
+    print(f"{args.items} items, {args.rounds} rounds")
+    before = measure("public: dict + response_model validation + json.dumps", public_before, args.items, args.rounds)
+    after = measure("public: output struct + pydantic-core to_json", public_after, args.items, args.rounds)
+    print(f"{'speedup':<58} {before / after:8.1f}x")
+    before = measure("admin: isoformat + json.dumps", admin_before, args.items, args.rounds)
+    after = measure("admin: pydantic-core to_json", admin_after, args.items, args.rounds)
+    print(f"{'speedup':<58} {before / after:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,6 @@
 # app/server/main.py
+import asyncio
+import contextlib
 import logging
 import sys
 from contextlib import asynccontextmanager
@@ -12,8 +14,16 @@ from routers import test, public
 from routers.auth import router as auth_router
 from routers.admin import admin_router
 from settings import Settings
-from storages.psql.base import create_db_session_pool, close_db
+from storages.psql.base import create_db_session_pool, create_replica_session_pools, close_db, warm_up_pool
+from storages.psql.partitions import ensure_partitions, run_partition_maintenance
+from storages.psql.replicas import ReadSessionRouter
+from services.response_cache import ResponseCache
+from services.portfolio_snapshot import PortfolioSnapshot, run_periodic_reload
+from services.contact_ingest import ContactIngestor
+from services.static_export import StaticPublisher
 from middleware.logging_middleware import LoggingMiddleware
+from middleware.rate_limit_middleware import RateLimitMiddleware
+from middleware.sql_stats_middleware import SqlStatsMiddleware
 from exception_handlers import (
     validation_exception_handler,
     http_exception_handler,
@@ -32,7 +42,8 @@ logging.basicConfig(
 )
 
 # Настройка уровней для разных модулей
-logging.getLogger("sqlalchemy.engine").setLevel(logging.INFO)  # SQL запросы
+# Текст каждого SQL в stdout не нужен - число/время запросов на ручку пишет SqlStatsMiddleware
+logging.getLogger("sqlalchemy.engine").setLevel(logging.WARNING)
 logging.getLogger("uvicorn.access").setLevel(logging.INFO)
 logging.getLogger("fastapi").setLevel(logging.DEBUG)
 
@@ -43,8 +54,8 @@ async def lifespan(app: FastAPI):
     """Application lifespan manager."""
     logger.info("🚀 Starting FastAPI application...")
 
-    # Initialize settings
-    settings = Settings()
+    # Settings собраны в create_app - middleware и lifespan читают одни и те же
+    settings: Settings = app.state.settings
 
     # Create database session pool
     logger.info("📊 Creating database session pool...")
@@ -53,18 +64,117 @@ async def lifespan(app: FastAPI):
         app.state.db_session = db_session
         app.state.engine = engine
         logger.info("✅ Database session pool created successfully")
+        warmed = await warm_up_pool(engine, settings.pool.warmup_connections)
+        logger.info(f"🔥 Warmed up {warmed} database connections")
     except Exception as e:
         logger.error(f"❌ Failed to create database session pool: {e}")
         logger.exception("Database connection error:")
         raise
 
+    # Партиции service_requests на текущий и ближайшие месяцы - иначе INSERT заявки упадет
+    try:
+        await ensure_partitions(engine, settings.service_requests.partitions_ahead_months)
+    except Exception as e:
+        logger.error(f"❌ Failed to ensure service_requests partitions: {e}")
+    partition_task = asyncio.create_task(
+        run_partition_maintenance(
+            engine,
+            settings.service_requests.partitions_ahead_months,
+            settings.service_requests.archive_after_months,
+            settings.service_requests.maintenance_interval_seconds
+        )
+    )
+
+    # Реплики для публичных чтений из БД; снапшот и админка остаются на primary,
+    # чтобы правка в админке не "откатывалась" из-за отставшей реплики
+    replicas = create_replica_session_pools(settings)
+    app.state.db_read_session = db_session
+    app.state.replica_router = None
+    replica_task = None
+    if replicas:
+        app.state.replica_router = ReadSessionRouter(db_session, replicas, settings.psql_replica.max_lag_seconds)
+        app.state.db_read_session = app.state.replica_router
+        await app.state.replica_router.check()
+        replica_task = asyncio.create_task(
+            app.state.replica_router.run_health_checks(settings.psql_replica.health_check_interval_seconds)
+        )
+        logger.info(f"🔁 Read replicas: {', '.join(replica.name for replica in replicas)}")
+
+    # Кэш публичных ответов (сбрасывается админскими ручками по тегам)
+    app.state.response_cache = ResponseCache(
+        max_entries=settings.cache.public_max_entries,
+        max_bytes=settings.cache.public_max_bytes,
+        ttl_seconds=settings.cache.public_ttl_seconds,
+        stale_seconds=settings.cache.public_stale_seconds,
+        compress_min_bytes=settings.cache.compress_min_bytes,
+        gzip_level=settings.cache.gzip_level,
+        brotli_quality=settings.cache.brotli_quality if settings.cache.brotli_enabled else None,
+    )
+
+    # Публичные данные портфолио целиком в памяти
+    logger.info("📸 Loading portfolio snapshot...")
+    snapshot = PortfolioSnapshot(db_session)
+    await snapshot.load()
+    app.state.portfolio_snapshot = snapshot
+
+    # Статический экспорт публичного API для Caddy - публикуем сразу и после каждой правки
+    app.state.static_publisher = None
+    if settings.static_export.enabled:
+        app.state.static_publisher = StaticPublisher(
+            app,
+            settings.static_export.directory,
+            keep_versions=settings.static_export.keep_versions,
+            debounce_seconds=settings.static_export.debounce_seconds,
+            spa_index=settings.static_export.spa_index,
+        )
+        app.state.static_publisher.schedule()
+        logger.info(f"📦 Static export enabled: {settings.static_export.directory}")
+
+    reload_task = asyncio.create_task(
+        run_periodic_reload(
+            snapshot,
+            app.state.response_cache,
+            settings.snapshot.reload_interval_seconds,
+            app.state.static_publisher
+        )
+    )
+
+    # Фоновая пакетная запись заявок с формы контактов
+    app.state.contact_ingestor = None
+    if settings.contact.write_behind:
+        app.state.contact_ingestor = ContactIngestor(
+            db_session,
+            max_queue=settings.contact.queue_size,
+            batch_size=settings.contact.batch_size,
+            flush_interval=settings.contact.flush_interval_seconds,
+        )
+        app.state.contact_ingestor.start()
+        logger.info("📨 Contact write-behind ingestion enabled")
+
     logger.info("🌐 FastAPI application started successfully")
 
     yield
 
     # Cleanup
     logger.info("🔄 Shutting down FastAPI application...")
+    reload_task.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await reload_task
+    partition_task.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await partition_task
+    if replica_task is not None:
+        replica_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await replica_task
+    if app.state.static_publisher is not None:
+        await app.state.static_publisher.stop()
+    if app.state.contact_ingestor is not None:
+        # Дописываем очередь заявок до закрытия пула
+        await app.state.contact_ingestor.stop()
     try:
+        for replica in replicas:
+            await close_db(replica.engine)
         await close_db(engine)
         logger.info("✅ FastAPI application shut down successfully")
     except Exception as e:
@@ -80,9 +190,34 @@ def create_app() -> FastAPI:
         debug=True  # Включаем debug режим
     )
 
+    # Initialize settings
+    settings = Settings()
+    app.state.settings = settings
+
+    # SQL на запрос: Server-Timing + предупреждения о N+1
+    sql_stats = settings.sql_stats
+    if sql_stats.enabled:
+        app.add_middleware(
+            SqlStatsMiddleware,
+            n_plus_one_threshold=sql_stats.n_plus_one_threshold,
+            slow_request_ms=sql_stats.slow_request_ms,
+        )
+
     # Добавляем middleware для логирования (ПЕРВЫМ!)
     app.add_middleware(LoggingMiddleware)
 
+    # Rate limit для логина и формы контактов - срабатывает раньше логирования тела и БД
+    rate_limit = settings.rate_limit
+    if rate_limit.enabled:
+        app.add_middleware(
+            RateLimitMiddleware,
+            rules={
+                ("POST", "/api/auth/login"): (rate_limit.login_burst, rate_limit.login_per_minute),
+                ("POST", "/api/public/contact"): (rate_limit.contact_burst, rate_limit.contact_per_minute),
+            },
+            max_keys=rate_limit.max_keys,
+        )
+
     # CORS middleware
     app.add_middleware(
         CORSMiddleware,
@@ -0,0 +1,85 @@
+# app/server/middleware/rate_limit_middleware.py
+import logging
+import math
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBuckets:
+    """
+    Token bucket на каждый ключ (маршрут + IP) с ограниченным числом ключей.
+
+    Ведро - [токены, время последнего пополнения], пополняется лениво при обращении.
+    При переполнении выкидывается ведро, к которому дольше всех не обращались (LRU).
+    Выкинутый ключ просто начнет с полного ведра - лимит это ослабляет только
+    для самых "тихих" клиентов.
+    """
+
+    def __init__(self, max_keys: int = 10000):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[tuple, list]" = OrderedDict()
+
+    def take(self, key: tuple, capacity: float, refill_per_second: float) -> float:
+        """Забирает токен. 0 - можно, иначе через сколько секунд появится следующий токен"""
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = [capacity, now]
+            self._buckets[key] = bucket
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+            bucket[0] = min(capacity, bucket[0] + (now - bucket[1]) * refill_per_second)
+            bucket[1] = now
+
+        if bucket[0] >= 1:
+            bucket[0] -= 1
+            return 0.0
+        return (1 - bucket[0]) / refill_per_second
+
+
+class RateLimitMiddleware(BaseHTTPMiddleware):
+    """
+    Ограничивает частоту запросов к дорогим ручкам (bcrypt в логине, запись заявок).
+
+    rules: {(METHOD, path): (burst, requests_per_minute)}. Остальные запросы не трогаем.
+    Отказ происходит до тела запроса, сессии БД и bcrypt - 429 + Retry-After.
+    """
+
+    def __init__(self, app: ASGIApp, rules: dict, max_keys: int = 10000):
+        super().__init__(app)
+        self.rules = {route: (burst, per_minute / 60) for route, (burst, per_minute) in rules.items()}
+        self.buckets = TokenBuckets(max_keys)
+
+    @staticmethod
+    def client_ip(request: Request) -> Optional[str]:
+        # Caddy проставляет X-Real-IP, а наружу сервер доступен только через него
+        return request.headers.get("x-real-ip") or (request.client.host if request.client else None)
+
+    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+        route = (request.method, request.url.path.rstrip("/"))
+        rule = self.rules.get(route)
+        if rule is None:
+            return await call_next(request)
+
+        burst, refill_per_second = rule
+        client_ip = self.client_ip(request)
+        retry_after = self.buckets.take((route, client_ip), burst, refill_per_second)
+        if retry_after:
+            logger.warning(f"🛑 Rate limit exceeded for {client_ip} on {request.method} {request.url.path}")
+            return JSONResponse(
+                status_code=429,
+                content={"detail": "Too many requests", "status_code": 429},
+                headers={"Retry-After": str(math.ceil(retry_after))}
+            )
+
+        return await call_next(request)
@@ -0,0 +1,49 @@
+# app/server/middleware/sql_stats_middleware.py
+import logging
+from typing import Callable
+
+from fastapi import Request, Response
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp
+
+from storages.psql.instrumentation import start_query_stats
+
+logger = logging.getLogger(__name__)
+
+
+class SqlStatsMiddleware(BaseHTTPMiddleware):
+    """
+    Считает SQL на каждый запрос: число выражений, время в БД и самое медленное.
+
+    Результат - в заголовке Server-Timing (видно во вкладке Network браузера)
+    и в логе. Если одна форма запроса выполнилась больше n_plus_one_threshold раз -
+    это почти наверняка N+1, пишем warning с самим запросом.
+    """
+
+    def __init__(self, app: ASGIApp, n_plus_one_threshold: int = 10, slow_request_ms: float = 200.0):
+        super().__init__(app)
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.slow_request_ms = slow_request_ms
+
+    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+        # Задача call_next наследует контекст - события движка пишут в этот же объект
+        stats = start_query_stats()
+        response = await call_next(request)
+
+        if stats.count:
+            response.headers.append(
+                "Server-Timing",
+                f'db;dur={stats.total_ms:.1f};desc="{stats.count} queries", db-slowest;dur={stats.slowest_ms:.1f}'
+            )
+
+            route = f"[{request.method}] {request.url.path}"
+            summary = f"{stats.count} queries, {stats.total_ms:.1f}ms in DB (slowest {stats.slowest_ms:.1f}ms)"
+            if stats.total_ms >= self.slow_request_ms:
+                logger.warning(f"🐢 {route}: {summary}; slowest: {stats.slowest_statement[:500]}")
+            else:
+                logger.info(f"🗄️ {route}: {summary}")
+
+            for shape, count in stats.repeated(self.n_plus_one_threshold):
+                logger.warning(f"🔁 Possible N+1 in {route}: {count}x {shape[:500]}")
+
+        return response
@@ -7,6 +7,7 @@ from .developers import router as developers_router
 from .projects import router as projects_router
 from .technologies import router as technologies_router
 from .service_requests import router as service_requests_router
+from .system import router as system_router
 
 # Create admin router with auth protection
 admin_router = APIRouter(
@@ -19,4 +20,5 @@ admin_router = APIRouter(
 admin_router.include_router(developers_router)
 admin_router.include_router(projects_router)
 admin_router.include_router(technologies_router)
-admin_router.include_router(service_requests_router)
\ No newline at end of file
+admin_router.include_router(service_requests_router)
+admin_router.include_router(system_router)
\ No newline at end of file
@@ -1,13 +1,17 @@
-from fastapi import APIRouter, HTTPException, Query, Request, Response, UploadFile, File, Form, Depends
-from sqlalchemy import select, func
+from fastapi import APIRouter, HTTPException, Query, Request, UploadFile, File, Form, Depends
+from sqlalchemy import select
 from typing import List, Optional
 from pydantic import BaseModel
 from datetime import datetime
-import json
 
 from storages.psql.models.developer_model import DBDeveloperModel
 from services.r2_service import R2Service
 from settings import Settings
+from services.portfolio_snapshot import sync_developers
+from services.serialization import FastJSONResponse, load_only_fields, parse_fields, pick_fields
+from services.pagination import CountMode, fetch_page
+from services.bulk_delete import delete_returning, parse_ids
+from services.export import ExportFormat, export_response
 
 router = APIRouter(prefix="/developers", tags=["admin-developers"])
 
@@ -68,8 +72,11 @@ def get_r2_service() -> R2Service:
     settings = Settings()
     return R2Service(settings)
 
-def developer_to_dict(dev):
+def developer_to_dict(dev, fields: Optional[tuple] = None):
     """Convert developer model to dict"""
+    if fields is not None:
+        return pick_fields(dev, fields, {"skills": lambda d: d.skills or []})
+
     return {
         "id": dev.id,
         "name": dev.name,
@@ -85,10 +92,19 @@ def developer_to_dict(dev):
         "specialization": dev.specialization,
         "is_active": dev.is_active,
         "order_priority": dev.order_priority,
-        "created_at": dev.created_at.isoformat(),
-        "updated_at": dev.updated_at.isoformat()
+        "created_at": dev.created_at,
+        "updated_at": dev.updated_at
     }
 
+def developers_query(selected: Optional[tuple], skill: Optional[str]):
+    """Запрос списка разработчиков с фильтрами - общий для страницы и выгрузки"""
+    query = select(DBDeveloperModel)
+    if selected is not None:
+        query = query.options(load_only_fields(DBDeveloperModel, selected))
+    if skill:
+        query = query.where(DBDeveloperModel.skills.contains([skill]))
+    return query
+
 @router.get("", response_model=List[DeveloperResponse])
 async def get_developers(
         request: Request,
@@ -96,9 +112,14 @@ async def get_developers(
         _end: int = Query(10),
         _sort: str = Query("id"),
         _order: str = Query("ASC"),
+        skill: Optional[str] = Query(None, max_length=100),  # Фильтр по навыку (GIN индекс)
+        fields: Optional[str] = Query(None, description="Comma-separated list of fields"),
+        _count: CountMode = Query("exact"),  # estimated - оценка total по статистике для больших таблиц
 ):
+    selected = parse_fields(fields, DeveloperResponse.model_fields)
+
     async with request.app.state.db_session() as db:
-        query = select(DBDeveloperModel)
+        query = developers_query(selected, skill)
 
         # Sorting
         sort_field = getattr(DBDeveloperModel, _sort) if hasattr(DBDeveloperModel, _sort) else DBDeveloperModel.id
@@ -107,29 +128,40 @@ async def get_developers(
         else:
             query = query.order_by(sort_field.asc(), DBDeveloperModel.order_priority.asc())
 
-        # Get total count first
-        count_query = select(func.count(DBDeveloperModel.id))
-        count_result = await db.execute(count_query)
-        total = count_result.scalar()
-
-        # Pagination
-        query = query.offset(_start).limit(_end - _start)
-
-        result = await db.execute(query)
-        developers = result.scalars().all()
+        # Страница и total одним запросом
+        developers, total = await fetch_page(db, query, _start, _end, _count)
 
         # Convert to dicts
-        developers_data = [developer_to_dict(dev) for dev in developers]
+        developers_data = [developer_to_dict(dev, selected) for dev in developers]
 
         # Calculate end index for Content-Range
         actual_end = _start + len(developers_data)
 
         # Возвращаем ответ с заголовком Content-Range
-        return Response(
-            content=json.dumps(developers_data),
+        return FastJSONResponse(
+            content=developers_data,
             headers={"Content-Range": f"items {_start}-{actual_end}/{total}"}
         )
 
+# Объявлена до /{developer_id}, иначе "export" уйдет туда как id
+@router.get("/export")
+async def export_developers(
+        request: Request,
+        format: ExportFormat = Query("ndjson"),
+        skill: Optional[str] = Query(None, max_length=100),
+        fields: Optional[str] = Query(None, description="Comma-separated list of fields"),
+):
+    """Выгрузка всех разработчиков (с фильтрами списка) потоком NDJSON/CSV"""
+    selected = parse_fields(fields, DeveloperResponse.model_fields)
+    query = developers_query(selected, skill).order_by(DBDeveloperModel.id)
+    return export_response(
+        request.app.state.db_session,
+        query,
+        lambda dev: developer_to_dict(dev, selected),
+        format,
+        "developers"
+    )
+
 @router.get("/{developer_id}", response_model=DeveloperResponse)
 async def get_developer(developer_id: int, request: Request):
     async with request.app.state.db_session() as db:
@@ -140,7 +172,7 @@ async def get_developer(developer_id: int, request: Request):
         if not db_developer:
             raise HTTPException(status_code=404, detail="Developer not found")
 
-        return developer_to_dict(db_developer)
+        return FastJSONResponse(developer_to_dict(db_developer))
 
 @router.post("", response_model=DeveloperResponse)
 async def create_developer(developer: DeveloperCreate, request: Request):
@@ -152,9 +184,10 @@ async def create_developer(developer: DeveloperCreate, request: Request):
         db_developer = DBDeveloperModel(**developer.dict())
         db.add(db_developer)
         await db.commit()
+        await sync_developers(request, [db_developer.id])
         await db.refresh(db_developer)
 
-        return developer_to_dict(db_developer)
+        return FastJSONResponse(developer_to_dict(db_developer))
 
 @router.put("/{developer_id}", response_model=DeveloperResponse)
 async def update_developer(developer_id: int, developer_update: DeveloperUpdate, request: Request):
@@ -176,9 +209,10 @@ async def update_developer(developer_id: int, developer_update: DeveloperUpdate,
             setattr(db_developer, key, value)
 
         await db.commit()
+        await sync_developers(request, [developer_id])
         await db.refresh(db_developer)
 
-        return developer_to_dict(db_developer)
+        return FastJSONResponse(developer_to_dict(db_developer))
 
 @router.delete("/{developer_id}")
 async def delete_developer(
@@ -199,6 +233,7 @@ async def delete_developer(
 
         await db.delete(db_developer)
         await db.commit()
+        await sync_developers(request, [developer_id])
 
         return {"message": "Developer deleted"}
 
@@ -208,32 +243,23 @@ async def delete_many_developers(
         ids: str = Query(..., description="Comma-separated list of IDs"),
         r2_service: R2Service = Depends(get_r2_service)
 ):
-    async with request.app.state.db_session() as db:
-        try:
-            developer_ids = [int(id.strip()) for id in ids.split(',')]
-        except ValueError:
-            raise HTTPException(status_code=400, detail="Invalid IDs format")
+    developer_ids = parse_ids(ids)
 
-        query = select(DBDeveloperModel).where(DBDeveloperModel.id.in_(developer_ids))
-        result = await db.execute(query)
-        developers = result.scalars().all()
-
-        if not developers:
+    async with request.app.state.db_session() as db:
+        # project_developers - ON DELETE CASCADE, заявки отвязываются (ON DELETE SET NULL)
+        rows = await delete_returning(db, DBDeveloperModel, developer_ids, DBDeveloperModel.avatar_url)
+        if not rows:
             raise HTTPException(status_code=404, detail="No developers found")
-
-        for developer in developers:
-            if developer.avatar_url:
-                await r2_service.delete_avatar(developer.avatar_url)
-
-        for developer in developers:
-            await db.delete(developer)
-
         await db.commit()
 
-        return {
-            "message": f"Deleted {len(developers)} developers",
-            "deleted_ids": [dev.id for dev in developers]
-        }
+    deleted_ids = [row.id for row in rows]
+    await r2_service.delete_files([row.avatar_url for row in rows if row.avatar_url])
+    await sync_developers(request, deleted_ids)
+
+    return {
+        "message": f"Deleted {len(deleted_ids)} developers",
+        "deleted_ids": deleted_ids
+    }
 
 @router.post("/{developer_id}/avatar")
 async def upload_avatar(
@@ -256,6 +282,7 @@ async def upload_avatar(
         avatar_url = await r2_service.upload_avatar(avatar, developer_id)
         db_developer.avatar_url = avatar_url
         await db.commit()
+        await sync_developers(request, [developer_id])
         await db.refresh(db_developer)
 
         return {
@@ -284,6 +311,7 @@ async def delete_avatar(
         await r2_service.delete_avatar(db_developer.avatar_url)
         db_developer.avatar_url = None
         await db.commit()
+        await sync_developers(request, [developer_id])
         await db.refresh(db_developer)
 
         return {
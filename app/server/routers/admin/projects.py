@@ -1,16 +1,21 @@
 # app/server/routers/admin/projects.py - ПОЛНАЯ ВЕРСИЯ С ОТДЕЛЬНОЙ ТАБЛИЦЕЙ ФОТОК
-from fastapi import APIRouter, HTTPException, Query, Request, Response, UploadFile, File, Depends
+from fastapi import APIRouter, HTTPException, Query, Request, UploadFile, File, Depends
 from sqlalchemy import select, func
 from sqlalchemy.orm import selectinload
 from typing import List, Optional
 from pydantic import BaseModel
 from datetime import datetime
-import json
 
 from storages.psql.models.project_model import DBProjectModel
 from storages.psql.models.project_photo_model import DBProjectPhotoModel  # НОВЫЙ ИМПОРТ
 from services.r2_service import R2Service
 from settings import Settings
+from services.portfolio_snapshot import sync_projects
+from services.project_search import search_condition
+from services.serialization import FastJSONResponse, load_only_fields, parse_fields, pick_fields
+from services.pagination import CountMode, fetch_page
+from services.bulk_delete import delete_returning, parse_ids
+from services.export import ExportFormat, export_response
 
 router = APIRouter(prefix="/projects", tags=["admin-projects"])
 
@@ -70,10 +75,23 @@ def get_r2_service() -> R2Service:
     settings = Settings()
     return R2Service(settings)
 
-def project_to_dict(project):
+def project_photo_urls(project):
+    return [photo.photo_url for photo in project.photos] if project.photos else []
+
+def project_developer_ids(project):
+    return [dev.id for dev in project.developers] if project.developers else []
+
+def project_to_dict(project, fields: Optional[tuple] = None):
     """Convert project model to dict with developers and photos"""
+    if fields is not None:
+        # Трогаем только загруженные атрибуты - иначе в async сессии полетит lazy load
+        return pick_fields(project, fields, {
+            "image_urls": project_photo_urls,
+            "developer_ids": project_developer_ids,
+        })
+
     # Собираем URL фоток из связанной таблицы
-    image_urls = [photo.photo_url for photo in project.photos] if project.photos else []
+    image_urls = project_photo_urls(project)
 
     return {
         "id": project.id,
@@ -89,11 +107,32 @@ def project_to_dict(project):
         "category": project.category,
         "duration_months": project.duration_months,
         "budget_range": project.budget_range,
-        "developer_ids": [dev.id for dev in project.developers] if project.developers else [],
-        "created_at": project.created_at.isoformat(),
-        "updated_at": project.updated_at.isoformat()
+        "developer_ids": project_developer_ids(project),
+        "created_at": project.created_at,
+        "updated_at": project.updated_at
     }
 
+def projects_query(selected: Optional[tuple], category: Optional[str], q: Optional[str]):
+    """Запрос списка проектов с фильтрами - общий для страницы и выгрузки"""
+    # ВАЖНО: загружаем фотки через selectinload
+    query = select(DBProjectModel).options(
+        selectinload(DBProjectModel.developers),
+        selectinload(DBProjectModel.photos)  # ЗАГРУЖАЕМ ФОТКИ
+    )
+    if selected is not None:
+        # Только нужные колонки, связи - только если их попросили
+        query = select(DBProjectModel).options(load_only_fields(DBProjectModel, selected))
+        if "developer_ids" in selected:
+            query = query.options(selectinload(DBProjectModel.developers))
+        if "image_urls" in selected:
+            query = query.options(selectinload(DBProjectModel.photos))
+
+    if category:
+        query = query.where(DBProjectModel.category == category)
+    if q:
+        query = query.where(search_condition(q))
+    return query
+
 @router.get("")
 async def get_projects(
         request: Request,
@@ -102,16 +141,14 @@ async def get_projects(
         _sort: str = Query("id"),
         _order: str = Query("ASC"),
         category: Optional[str] = Query(None),
+        q: Optional[str] = Query(None, max_length=200),  # Полнотекстовый поиск
+        fields: Optional[str] = Query(None, description="Comma-separated list of fields"),
+        _count: CountMode = Query("exact"),  # estimated - оценка total по статистике для больших таблиц
 ):
-    async with request.app.state.db_session() as db:
-        # ВАЖНО: загружаем фотки через selectinload
-        query = select(DBProjectModel).options(
-            selectinload(DBProjectModel.developers),
-            selectinload(DBProjectModel.photos)  # ЗАГРУЖАЕМ ФОТКИ
-        )
+    selected = parse_fields(fields, ProjectResponse.model_fields)
 
-        if category:
-            query = query.where(DBProjectModel.category == category)
+    async with request.app.state.db_session() as db:
+        query = projects_query(selected, category, q)
 
         # Sorting
         if hasattr(DBProjectModel, _sort):
@@ -120,34 +157,43 @@ async def get_projects(
             else:
                 query = query.order_by(getattr(DBProjectModel, _sort))
 
-        # Get total count first
-        count_query = select(func.count(DBProjectModel.id))
-        if category:
-            count_query = count_query.where(DBProjectModel.category == category)
-        count_result = await db.execute(count_query)
-        total = count_result.scalar()
-
-        # Pagination
-        query = query.offset(_start).limit(_end - _start)
-
-        result = await db.execute(query)
-        projects = result.scalars().all()
+        # Страница и total одним запросом
+        projects, total = await fetch_page(db, query, _start, _end, _count)
 
         # Convert to dicts
-        projects_data = [project_to_dict(project) for project in projects]
+        projects_data = [project_to_dict(project, selected) for project in projects]
 
         # Calculate end index for Content-Range
         actual_end = min(_start + len(projects_data) - 1, total - 1) if projects_data else _start - 1
 
-        return Response(
-            content=json.dumps(projects_data),
+        return FastJSONResponse(
+            content=projects_data,
             headers={
                 "Content-Range": f"items {_start}-{actual_end}/{total}",
                 "Access-Control-Expose-Headers": "Content-Range"
-            },
-            media_type="application/json"
+            }
         )
 
+# Объявлена до /{project_id}, иначе "export" уйдет туда как id
+@router.get("/export")
+async def export_projects(
+        request: Request,
+        format: ExportFormat = Query("ndjson"),
+        category: Optional[str] = Query(None),
+        q: Optional[str] = Query(None, max_length=200),
+        fields: Optional[str] = Query(None, description="Comma-separated list of fields"),
+):
+    """Выгрузка всех проектов (с фильтрами списка) потоком NDJSON/CSV"""
+    selected = parse_fields(fields, ProjectResponse.model_fields)
+    query = projects_query(selected, category, q).order_by(DBProjectModel.id)
+    return export_response(
+        request.app.state.db_session,
+        query,
+        lambda project: project_to_dict(project, selected),
+        format,
+        "projects"
+    )
+
 @router.get("/{project_id}")
 async def get_project(project_id: int, request: Request):
     async with request.app.state.db_session() as db:
@@ -161,7 +207,7 @@ async def get_project(project_id: int, request: Request):
         if not project:
             raise HTTPException(status_code=404, detail="Project not found")
 
-        return project_to_dict(project)
+        return FastJSONResponse(project_to_dict(project))
 
 # НОВЫЙ ПРОСТОЙ ENDPOINT ДЛЯ ЗАГРУЗКИ ФОТОК - БЕЗ ЕБУЧИХ JSON
 @router.post("/{project_id}/photos")
@@ -215,6 +261,7 @@ async def upload_project_photos(
 
         # Коммитим все новые фотки
         await db.commit()
+        await sync_projects(request, [project_id])
 
         # Считаем общее количество фоток проекта
         count_query = select(func.count(DBProjectPhotoModel.id)).where(
@@ -255,6 +302,7 @@ async def delete_project_photo(
         # Удаляем из БД
         await db.delete(db_photo)
         await db.commit()
+        await sync_projects(request, [project_id])
 
         # Считаем оставшиеся фотки
         count_query = select(func.count(DBProjectPhotoModel.id)).where(
@@ -292,6 +340,7 @@ async def delete_project(
         # Удаляем проект (фотки удалятся автоматически через cascade)
         await db.delete(db_project)
         await db.commit()
+        await sync_projects(request, [project_id])
 
         return {"message": "Project deleted"}
 
@@ -302,37 +351,28 @@ async def delete_many_projects(
         r2_service: R2Service = Depends(get_r2_service)
 ):
     """Массовое удаление проектов"""
-    async with request.app.state.db_session() as db:
-        try:
-            project_ids = [int(id.strip()) for id in ids.split(',')]
-        except ValueError:
-            raise HTTPException(status_code=400, detail="Invalid IDs format")
+    project_ids = parse_ids(ids)
 
-        # Загружаем проекты с фотками
-        query = select(DBProjectModel).options(
-            selectinload(DBProjectModel.photos)
-        ).where(DBProjectModel.id.in_(project_ids))
-        result = await db.execute(query)
-        projects = result.scalars().all()
+    async with request.app.state.db_session() as db:
+        # URL фоток забираем тем же DELETE; project_developers чистит ON DELETE CASCADE
+        photo_rows = await delete_returning(
+            db, DBProjectPhotoModel, project_ids, DBProjectPhotoModel.photo_url, by=DBProjectPhotoModel.project_id
+        )
+        deleted_ids = [row.id for row in await delete_returning(db, DBProjectModel, project_ids)]
 
-        if not projects:
+        if not deleted_ids:
             raise HTTPException(status_code=404, detail="No projects found")
 
-        # Удаляем все фото проектов из R2
-        for project in projects:
-            for photo in project.photos:
-                await r2_service.delete_project_screenshot(photo.photo_url)
-
-        # Удаляем проекты (фотки удалятся автоматически через cascade)
-        for project in projects:
-            await db.delete(project)
-
         await db.commit()
 
-        return {
-            "message": f"Deleted {len(projects)} projects",
-            "deleted_ids": [proj.id for proj in projects]
-        }
+    # Файлы трогаем только после коммита - откат транзакции не оставит проекты без фоток
+    await r2_service.delete_files([row.photo_url for row in photo_rows])
+    await sync_projects(request, deleted_ids)
+
+    return {
+        "message": f"Deleted {len(deleted_ids)} projects",
+        "deleted_ids": deleted_ids
+    }
 
 # ENDPOINTS ДЛЯ ПОЛУЧЕНИЯ КАТЕГОРИЙ И СТАТИСТИКИ
 
@@ -386,6 +426,7 @@ async def create_project(project: ProjectCreate, request: Request):
             await db.execute(stmt)
 
         await db.commit()
+        await sync_projects(request, [db_project.id])
         await db.refresh(db_project)
 
         # Загружаем проект с связями для ответа
@@ -400,7 +441,7 @@ async def create_project(project: ProjectCreate, request: Request):
         fresh_result = await db.execute(fresh_query)
         fresh_project = fresh_result.scalar_one()
 
-        return project_to_dict(fresh_project)
+        return FastJSONResponse(project_to_dict(fresh_project))
 
 # UPDATE PROJECT
 @router.put("/{project_id}")
@@ -448,6 +489,7 @@ async def update_project(project_id: int, project: ProjectUpdate, request: Reque
                 await db.execute(insert_stmt)
 
         await db.commit()
+        await sync_projects(request, [project_id])
 
         # Заново загружаем проект с обновленными связями
         fresh_query = (
@@ -1,12 +1,21 @@
-from fastapi import APIRouter, HTTPException, Query, Request, Response
+import json
+
+from fastapi import APIRouter, HTTPException, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
 from typing import Optional
 from pydantic import BaseModel
 from datetime import datetime
-import json
+
+from storages.psql.partitions import add_months, month_start
 
 from storages.psql.models.service_request_model import DBServiceRequestModel
+from storages.psql.models.service_request_archive_model import DBServiceRequestArchiveModel
+from services.portfolio_snapshot import sync_service_requests
+from services.serialization import FastJSONResponse, load_only_fields, parse_fields, pick_fields
+from services.pagination import CountMode, fetch_page
+from services.bulk_delete import delete_returning, parse_ids
+from services.export import ExportFormat, export_response
 
 router = APIRouter(prefix="/service-requests", tags=["admin-service-requests"])
 
@@ -40,8 +49,11 @@ class ServiceRequestUpdate(BaseModel):
     developer_id: Optional[int] = None
     notes: Optional[str] = None
 
-def service_request_to_dict(sr):
+def service_request_to_dict(sr, fields: Optional[tuple] = None):
     """Convert service request model to dict"""
+    if fields is not None:
+        return pick_fields(sr, fields, {"requirements": lambda r: r.requirements or {}})
+
     return {
         "id": sr.id,
         "client_name": sr.client_name,
@@ -57,10 +69,79 @@ def service_request_to_dict(sr):
         "priority": sr.priority,
         "developer_id": sr.developer_id,
         "notes": sr.notes,
-        "created_at": sr.created_at.isoformat(),
-        "updated_at": sr.updated_at.isoformat()
+        "created_at": sr.created_at,
+        "updated_at": sr.updated_at
     }
 
+def parse_requirements_filter(raw: Optional[str]) -> Optional[dict]:
+    """?requirements={"design": true} -> dict для requirements @> (400 на не-JSON и не-объект)"""
+    if not raw:
+        return None
+    try:
+        value = json.loads(raw)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="requirements must be a JSON object")
+    if not isinstance(value, dict) or not value:
+        raise HTTPException(status_code=400, detail="requirements must be a non-empty JSON object")
+    return value
+
+def window_start(request: Request, created_after: Optional[datetime], all_time: bool) -> Optional[datetime]:
+    """
+    Нижняя граница created_at для горячих запросов: таблица партиционирована по месяцам,
+    и по умолчанию Postgres читает только партиции за последние admin_recent_months.
+    None - без ограничения.
+    """
+    if all_time:
+        return None
+    if created_after is None:
+        months = request.app.state.settings.service_requests.admin_recent_months
+        if months <= 0:
+            return None
+        # С начала месяца - граница совпадает с границей партиции
+        created_after = datetime.combine(add_months(month_start(), -months), datetime.min.time())
+    return created_after
+
+def window_headers(since: Optional[datetime]) -> dict:
+    """Активное окно в ответе - чтобы было видно, что старые заявки отфильтрованы"""
+    return {"X-Created-After": since.isoformat()} if since is not None else {}
+
+def service_requests_query(
+        request: Request,
+        selected: Optional[tuple],
+        status: Optional[str],
+        priority: Optional[str],
+        project_type: Optional[str],
+        required: Optional[dict],
+        created_after: Optional[datetime],
+        all_time: bool,
+        archived: bool = False
+):
+    """
+    Запрос списка заявок с фильтрами - общий для страницы и выгрузки.
+
+    archived - читать service_requests_archive (там все старше окна, поэтому
+    окно по умолчанию к архиву не применяется). Возвращает (модель, запрос, начало окна).
+    """
+    model = DBServiceRequestArchiveModel if archived else DBServiceRequestModel
+    query = select(model)
+    if selected is not None:
+        query = query.options(load_only_fields(model, selected))
+
+    # Фильтры
+    since = created_after if archived else window_start(request, created_after, all_time)
+    if since is not None:
+        query = query.where(model.created_at >= since)
+    if status:
+        query = query.where(model.status == status)
+    if priority:
+        query = query.where(model.priority == priority)
+    if project_type:
+        query = query.where(model.project_type == project_type)
+    if required:
+        # requirements @> '{...}' - идет по GIN индексу
+        query = query.where(model.requirements.contains(required))
+    return model, query, since
+
 @router.get("")
 async def get_service_requests(
         request: Request,
@@ -71,58 +152,76 @@ async def get_service_requests(
         status: Optional[str] = Query(None),  # Фильтр по статусу
         priority: Optional[str] = Query(None),  # Фильтр по приоритету
         project_type: Optional[str] = Query(None),  # Фильтр по типу проекта
+        requirements: Optional[str] = Query(None, description='JSON object the requirements must contain, e.g. {"design": true}'),
+        fields: Optional[str] = Query(None, description="Comma-separated list of fields"),
+        created_after: Optional[datetime] = Query(None, description="Only requests created after this moment"),
+        all_time: bool = Query(False, description="Include requests older than the recent window"),
+        archived: bool = Query(False, description="Read archived requests (older partitions)"),
+        _count: CountMode = Query("exact"),  # estimated - оценка total по статистике для больших таблиц
 ):
-    async with request.app.state.db_session() as db:
-        query = select(DBServiceRequestModel)
+    selected = parse_fields(fields, ServiceRequestResponse.model_fields)
+    required = parse_requirements_filter(requirements)
 
-        # Фильтры
-        if status:
-            query = query.where(DBServiceRequestModel.status == status)
-        if priority:
-            query = query.where(DBServiceRequestModel.priority == priority)
-        if project_type:
-            query = query.where(DBServiceRequestModel.project_type == project_type)
+    async with request.app.state.db_session() as db:
+        model, query, since = service_requests_query(
+            request, selected, status, priority, project_type, required, created_after, all_time, archived
+        )
 
         # Sorting
-        if hasattr(DBServiceRequestModel, _sort):
+        if hasattr(model, _sort):
             if _order.upper() == "DESC":
-                query = query.order_by(getattr(DBServiceRequestModel, _sort).desc())
+                query = query.order_by(getattr(model, _sort).desc())
             else:
-                query = query.order_by(getattr(DBServiceRequestModel, _sort))
-
-        # Get total count first
-        count_query = select(func.count(DBServiceRequestModel.id))
-        if status:
-            count_query = count_query.where(DBServiceRequestModel.status == status)
-        if priority:
-            count_query = count_query.where(DBServiceRequestModel.priority == priority)
-        if project_type:
-            count_query = count_query.where(DBServiceRequestModel.project_type == project_type)
-
-        count_result = await db.execute(count_query)
-        total = count_result.scalar()
+                query = query.order_by(getattr(model, _sort))
 
-        # Pagination
-        query = query.offset(_start).limit(_end - _start)
-
-        result = await db.execute(query)
-        service_requests = result.scalars().all()
+        # Страница и total одним запросом (или оценка total, см. _count)
+        service_requests, total = await fetch_page(db, query, _start, _end, _count)
 
         # Convert to dicts
-        requests_data = [service_request_to_dict(sr) for sr in service_requests]
+        requests_data = [service_request_to_dict(sr, selected) for sr in service_requests]
 
         # Calculate end index for Content-Range
         actual_end = min(_start + len(requests_data) - 1, total - 1) if requests_data else _start - 1
 
-        return Response(
-            content=json.dumps(requests_data),
+        return FastJSONResponse(
+            content=requests_data,
             headers={
                 "Content-Range": f"items {_start}-{actual_end}/{total}",
-                "Access-Control-Expose-Headers": "Content-Range"
-            },
-            media_type="application/json"
+                **window_headers(since),
+                "Access-Control-Expose-Headers": "Content-Range, X-Created-After"
+            }
         )
 
+# Объявлена до /{request_id}, иначе "export" уйдет туда как id
+@router.get("/export")
+async def export_service_requests(
+        request: Request,
+        format: ExportFormat = Query("ndjson"),
+        status: Optional[str] = Query(None),
+        priority: Optional[str] = Query(None),
+        project_type: Optional[str] = Query(None),
+        requirements: Optional[str] = Query(None, description='JSON object the requirements must contain, e.g. {"design": true}'),
+        fields: Optional[str] = Query(None, description="Comma-separated list of fields"),
+        created_after: Optional[datetime] = Query(None, description="Only requests created after this moment"),
+        all_time: bool = Query(False, description="Include requests older than the recent window"),
+        archived: bool = Query(False, description="Read archived requests (older partitions)"),
+):
+    """Выгрузка заявок (с фильтрами списка) потоком NDJSON/CSV - память не зависит от числа строк"""
+    selected = parse_fields(fields, ServiceRequestResponse.model_fields)
+    required = parse_requirements_filter(requirements)
+    model, query, since = service_requests_query(
+        request, selected, status, priority, project_type, required, created_after, all_time, archived
+    )
+    response = export_response(
+        request.app.state.db_session,
+        query.order_by(model.created_at, model.id),
+        lambda sr: service_request_to_dict(sr, selected),
+        format,
+        "service-requests-archive" if archived else "service-requests"
+    )
+    response.headers.update(window_headers(since))
+    return response
+
 @router.get("/{request_id}")
 async def get_service_request(request_id: int, request: Request):
     async with request.app.state.db_session() as db:
@@ -130,10 +229,15 @@ async def get_service_request(request_id: int, request: Request):
         result = await db.execute(query)
         service_request = result.scalar_one_or_none()
 
+        if not service_request:
+            # Старые заявки могли уехать в архив (id там те же) - показываем оттуда, только чтение
+            query = select(DBServiceRequestArchiveModel).where(DBServiceRequestArchiveModel.id == request_id)
+            service_request = (await db.execute(query)).scalar_one_or_none()
+
         if not service_request:
             raise HTTPException(status_code=404, detail="Service request not found")
 
-        return service_request_to_dict(service_request)
+        return FastJSONResponse(service_request_to_dict(service_request))
 
 @router.put("/{request_id}")
 async def update_service_request(
@@ -155,58 +259,67 @@ async def update_service_request(
             setattr(db_service_request, field, value)
 
         await db.commit()
+        await db.refresh(db_service_request)
+        await sync_service_requests(request)
 
-        return {"message": "Service request deleted"}
+        return FastJSONResponse(service_request_to_dict(db_service_request))
 
 # Дополнительные endpoints для статистики
 @router.get("/stats/overview")
-async def get_requests_stats(request: Request):
-    """Получить общую статистику по заявкам"""
+async def get_requests_stats(
+        request: Request,
+        created_after: Optional[datetime] = Query(None),
+        all_time: bool = Query(False),
+        archived: bool = Query(False),
+):
+    """Получить общую статистику по заявкам (по умолчанию - за последние admin_recent_months)"""
+    model = DBServiceRequestArchiveModel if archived else DBServiceRequestModel
+    since = created_after if archived else window_start(request, created_after, all_time)
+
+    def in_window(query):
+        return query.where(model.created_at >= since) if since is not None else query
+
     async with request.app.state.db_session() as db:
         # Количество по статусам
-        status_query = select(
-            DBServiceRequestModel.status,
-            func.count(DBServiceRequestModel.id).label("count")
-        ).group_by(DBServiceRequestModel.status)
+        status_query = in_window(select(
+            model.status,
+            func.count(model.id).label("count")
+        )).group_by(model.status)
 
         status_result = await db.execute(status_query)
         status_stats = {row.status: row.count for row in status_result}
 
         # Количество по приоритетам
-        priority_query = select(
-            DBServiceRequestModel.priority,
-            func.count(DBServiceRequestModel.id).label("count")
-        ).group_by(DBServiceRequestModel.priority)
+        priority_query = in_window(select(
+            model.priority,
+            func.count(model.id).label("count")
+        )).group_by(model.priority)
 
         priority_result = await db.execute(priority_query)
         priority_stats = {row.priority: row.count for row in priority_result}
 
         # Общее количество
-        total_query = select(func.count(DBServiceRequestModel.id))
+        total_query = in_window(select(func.count(model.id)))
         total_result = await db.execute(total_query)
         total = total_result.scalar()
 
         return {
             "total_requests": total,
             "by_status": status_stats,
-            "by_priority": priority_stats
-        }()
-        await db.refresh(db_service_request)
-        return service_request_to_dict(db_service_request)
+            "by_priority": priority_stats,
+            "created_after": since
+        }
 
 @router.delete("/{request_id}")
 async def delete_service_request(request_id: int, request: Request):
     """Удалить заявку (только для спама/тестовых заявок)"""
     async with request.app.state.db_session() as db:
-        query = select(DBServiceRequestModel).where(DBServiceRequestModel.id == request_id)
-        result = await db.execute(query)
-        db_service_request = result.scalar_one_or_none()
-
-        if not db_service_request:
+        if not await delete_returning(db, DBServiceRequestModel, [request_id]):
             raise HTTPException(status_code=404, detail="Service request not found")
+        await db.commit()
 
-        await db.delete(db_service_request)
-        await db.commit
+    await sync_service_requests(request)
+    return {"message": "Service request deleted"}
 
 # Добавь в конец app/server/routers/admin/service_requests.py:
 
@@ -215,29 +328,18 @@ async def delete_many_service_requests(
         request: Request,
         ids: str = Query(..., description="Comma-separated list of IDs")
 ):
-    """Массовое удаление заявок"""
-    async with request.app.state.db_session() as db:
-        # Парсим IDs
-        try:
-            request_ids = [int(id.strip()) for id in ids.split(',')]
-        except ValueError:
-            raise HTTPException(status_code=400, detail="Invalid IDs format")
-
-        # Получаем заявки
-        query = select(DBServiceRequestModel).where(DBServiceRequestModel.id.in_(request_ids))
-        result = await db.execute(query)
-        service_requests = result.scalars().all()
+    """Массовое удаление заявок (тысячи спам-заявок - одно выражение)"""
+    request_ids = parse_ids(ids)
 
-        if not service_requests:
+    async with request.app.state.db_session() as db:
+        deleted_ids = [row.id for row in await delete_returning(db, DBServiceRequestModel, request_ids)]
+        if not deleted_ids:
             raise HTTPException(status_code=404, detail="No service requests found")
-
-        # Удаляем заявки
-        for service_request in service_requests:
-            await db.delete(service_request)
-
         await db.commit()
 
-        return {
-            "message": f"Deleted {len(service_requests)} service requests",
-            "deleted_ids": [req.id for req in service_requests]
-        }
\ No newline at end of file
+    await sync_service_requests(request)
+
+    return {
+        "message": f"Deleted {len(deleted_ids)} service requests",
+        "deleted_ids": deleted_ids
+    }
\ No newline at end of file
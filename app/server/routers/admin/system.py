@@ -0,0 +1,23 @@
+# app/server/routers/admin/system.py
+from fastapi import APIRouter, Request
+
+router = APIRouter(prefix="/system", tags=["admin-system"])
+
+
+@router.get("/cache")
+async def get_cache_stats(request: Request):
+    """Счетчики кэша публичных ответов: hit / miss / stale / coalesced / not_modified + размер"""
+    return request.app.state.response_cache.stats()
+
+
+@router.get("/pool")
+async def get_pool_stats(request: Request):
+    """Состояние пула соединений: занятые / свободные / overflow + время ожидания checkout"""
+    return request.app.state.engine.pool.metrics()
+
+
+@router.get("/replicas")
+async def get_replica_status(request: Request):
+    """Реплики для чтения: здоровье, отставание и пул; пустой список - все читается с primary"""
+    replica_router = request.app.state.replica_router
+    return replica_router.status() if replica_router is not None else []
@@ -1,12 +1,15 @@
-from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi import APIRouter, HTTPException, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select
 from typing import Optional
 from pydantic import BaseModel
 from datetime import datetime
-import json
 
 from storages.psql.models.technology_model import DBTechnologyModel
+from services.portfolio_snapshot import sync_technologies
+from services.serialization import FastJSONResponse, load_only_fields, parse_fields, pick_fields
+from services.pagination import CountMode, fetch_page
+from services.bulk_delete import delete_returning, parse_ids
 
 router = APIRouter(prefix="/technologies", tags=["admin-technologies"])
 
@@ -35,15 +38,18 @@ class TechnologyUpdate(BaseModel):
     icon_url: Optional[str] = None
     color: Optional[str] = None
 
-def technology_to_dict(tech):
+def technology_to_dict(tech, fields: Optional[tuple] = None):
     """Convert technology model to dict"""
+    if fields is not None:
+        return pick_fields(tech, fields)
+
     return {
         "id": tech.id,
         "name": tech.name,
         "category": tech.category,
         "icon_url": tech.icon_url,
         "color": tech.color,
-        "created_at": tech.created_at.isoformat()
+        "created_at": tech.created_at
     }
 
 @router.get("")
@@ -54,9 +60,15 @@ async def get_technologies(
         _sort: str = Query("name"),  # По умолчанию сортируем по имени
         _order: str = Query("ASC"),
         category: Optional[str] = Query(None),  # Фильтр по категории
+        fields: Optional[str] = Query(None, description="Comma-separated list of fields"),
+        _count: CountMode = Query("exact"),  # estimated - оценка total по статистике для больших таблиц
 ):
+    selected = parse_fields(fields, TechnologyResponse.model_fields)
+
     async with request.app.state.db_session() as db:
         query = select(DBTechnologyModel)
+        if selected is not None:
+            query = query.options(load_only_fields(DBTechnologyModel, selected))
 
         # Фильтр по категории
         if category:
@@ -69,32 +81,21 @@ async def get_technologies(
             else:
                 query = query.order_by(getattr(DBTechnologyModel, _sort))
 
-        # Get total count first
-        count_query = select(func.count(DBTechnologyModel.id))
-        if category:
-            count_query = count_query.where(DBTechnologyModel.category == category)
-        count_result = await db.execute(count_query)
-        total = count_result.scalar()
-
-        # Pagination
-        query = query.offset(_start).limit(_end - _start)
-
-        result = await db.execute(query)
-        technologies = result.scalars().all()
+        # Страница и total одним запросом
+        technologies, total = await fetch_page(db, query, _start, _end, _count)
 
         # Convert to dicts
-        technologies_data = [technology_to_dict(tech) for tech in technologies]
+        technologies_data = [technology_to_dict(tech, selected) for tech in technologies]
 
         # Calculate end index for Content-Range
         actual_end = min(_start + len(technologies_data) - 1, total - 1) if technologies_data else _start - 1
 
-        return Response(
-            content=json.dumps(technologies_data),
+        return FastJSONResponse(
+            content=technologies_data,
             headers={
                 "Content-Range": f"items {_start}-{actual_end}/{total}",
                 "Access-Control-Expose-Headers": "Content-Range"
-            },
-            media_type="application/json"
+            }
         )
 
 @router.get("/{technology_id}")
@@ -107,7 +108,7 @@ async def get_technology(technology_id: int, request: Request):
         if not technology:
             raise HTTPException(status_code=404, detail="Technology not found")
 
-        return technology_to_dict(technology)
+        return FastJSONResponse(technology_to_dict(technology))
 
 @router.post("")
 async def create_technology(technology: TechnologyCreate, request: Request):
@@ -123,9 +124,10 @@ async def create_technology(technology: TechnologyCreate, request: Request):
         db_technology = DBTechnologyModel(**technology.dict())
         db.add(db_technology)
         await db.commit()
+        await sync_technologies(request, [db_technology.id])
         await db.refresh(db_technology)
 
-        return technology_to_dict(db_technology)
+        return FastJSONResponse(technology_to_dict(db_technology))
 
 @router.put("/{technology_id}")
 async def update_technology(
@@ -158,8 +160,9 @@ async def update_technology(
             setattr(db_technology, field, value)
 
         await db.commit()
+        await sync_technologies(request, [technology_id])
         await db.refresh(db_technology)
-        return technology_to_dict(db_technology)
+        return FastJSONResponse(technology_to_dict(db_technology))
 
 @router.delete("/{technology_id}")
 async def delete_technology(technology_id: int, request: Request):
@@ -173,6 +176,7 @@ async def delete_technology(technology_id: int, request: Request):
 
         await db.delete(db_technology)
         await db.commit()
+        await sync_technologies(request, [technology_id])
 
         return {"message": "Technology deleted"}
 
@@ -195,28 +199,17 @@ async def delete_many_technologies(
         ids: str = Query(..., description="Comma-separated list of IDs")
 ):
     """Массовое удаление технологий"""
-    async with request.app.state.db_session() as db:
-        # Парсим IDs
-        try:
-            technology_ids = [int(id.strip()) for id in ids.split(',')]
-        except ValueError:
-            raise HTTPException(status_code=400, detail="Invalid IDs format")
-
-        # Получаем технологии
-        query = select(DBTechnologyModel).where(DBTechnologyModel.id.in_(technology_ids))
-        result = await db.execute(query)
-        technologies = result.scalars().all()
+    technology_ids = parse_ids(ids)
 
-        if not technologies:
+    async with request.app.state.db_session() as db:
+        deleted_ids = [row.id for row in await delete_returning(db, DBTechnologyModel, technology_ids)]
+        if not deleted_ids:
             raise HTTPException(status_code=404, detail="No technologies found")
-
-        # Удаляем технологии
-        for technology in technologies:
-            await db.delete(technology)
-
         await db.commit()
 
-        return {
-            "message": f"Deleted {len(technologies)} technologies",
-            "deleted_ids": [tech.id for tech in technologies]
-        }
\ No newline at end of file
+    await sync_technologies(request, deleted_ids)
+
+    return {
+        "message": f"Deleted {len(deleted_ids)} technologies",
+        "deleted_ids": deleted_ids
+    }
\ No newline at end of file
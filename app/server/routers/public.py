@@ -1,13 +1,18 @@
-from fastapi import APIRouter, Request, HTTPException
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+import base64
+import binascii
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import islice
+
+from fastapi import APIRouter, Query, Request, Response, HTTPException
 from typing import List, Optional
 from pydantic import BaseModel
 
-from storages.psql.models.developer_model import DBDeveloperModel
-from storages.psql.models.project_model import DBProjectModel
-from storages.psql.models.technology_model import DBTechnologyModel
-from storages.psql.models.service_request_model import DBServiceRequestModel
+from services.contact_ingest import insert_service_requests, service_request_row
+from services.response_cache import JSONPayload, cached_json
+from services.portfolio_snapshot import PortfolioSnapshot
+from services.project_search import ranked_search_query
+from services.serialization import parse_fields, pick_fields
 
 router = APIRouter(prefix="/public", tags=["public"])
 
@@ -40,6 +45,7 @@ class PublicProject(BaseModel):
     category: Optional[str] = None
     duration_months: Optional[int] = None
     developers: Optional[List[dict]] = None
+    cover_image_url: Optional[str] = None  # Первая фотка - для карточек в списке
 
     class Config:
         from_attributes = True
@@ -54,6 +60,11 @@ class PublicTechnology(BaseModel):
     class Config:
         from_attributes = True
 
+class PublicProjectSearchHit(BaseModel):
+    project: PublicProject
+    rank: float
+    headline: str  # Фрагменты описания, совпадения обернуты в <mark>
+
 class ServiceRequestCreate(BaseModel):
     client_name: str
     client_email: str
@@ -66,120 +77,240 @@ class ServiceRequestCreate(BaseModel):
     requirements: Optional[dict] = None
 
 class ServiceRequestResponse(BaseModel):
-    id: int
+    id: Optional[int] = None  # None - заявка принята в очередь и будет записана фоном
     message: str
     status: str
 
-def project_to_dict(project):
-    """Convert project model to dict with developers and photos"""
-    image_urls = [photo.photo_url for photo in project.photos] if project.photos else []
+# Выходные структуры: view снапшота -> struct -> bytes, без промежуточных dict
+@dataclass(slots=True)
+class DeveloperCardOut:
+    id: int
+    name: str
+    specialization: str
+    avatar_url: Optional[str]
 
+@dataclass(slots=True)
+class ProjectOut:
+    id: int
+    title: str
+    description: Optional[str]
+    short_description: Optional[str]
+    demo_url: Optional[str]
+    github_url: Optional[str]
+    image_urls: tuple
+    project_type: Optional[str]
+    category: Optional[str]
+    duration_months: Optional[int]
+    developers: list
+    cover_image_url: Optional[str]
+
+@dataclass(slots=True)
+class ProjectSearchHitOut:
+    project: ProjectOut | dict
+    rank: float
+    headline: str
+
+@dataclass(slots=True)
+class DeveloperOut:
+    id: int
+    name: str
+    bio: Optional[str]
+    avatar_url: Optional[str]
+    github_url: Optional[str]
+    linkedin_url: Optional[str]
+    portfolio_url: Optional[str]
+    years_experience: int
+    skills: Optional[list]
+    specialization: str
+    project_count: int
+
+def developer_cards(project, snapshot) -> list:
+    return [
+        DeveloperCardOut(dev.id, dev.name, dev.specialization, dev.avatar_url)
+        for dev in map(snapshot.developers.get, project.developer_ids)
+        if dev is not None
+    ]
+
+def cover_image_url(project) -> Optional[str]:
+    return project.image_urls[0] if project.image_urls else None
+
+def project_out(project, snapshot, fields: Optional[tuple] = None):
+    """
+    Project snapshot view -> public output struct with developers and photos.
+
+    With fields only the requested keys are built (developers are not even looked up
+    unless asked for).
+    """
+    if fields is not None:
+        return pick_fields(project, fields, {
+            "developers": lambda p: developer_cards(p, snapshot),
+            "cover_image_url": cover_image_url,
+        })
+
+    return ProjectOut(
+        id=project.id,
+        title=project.title,
+        description=project.description,
+        short_description=project.short_description,
+        demo_url=project.demo_url,
+        github_url=project.github_url,
+        image_urls=project.image_urls,
+        project_type=project.project_type,
+        category=project.category,
+        duration_months=project.duration_months,
+        developers=developer_cards(project, snapshot),
+        cover_image_url=cover_image_url(project)
+    )
+
+def developer_out(developer, snapshot, fields: Optional[tuple] = None):
+    """Developer snapshot view -> public output struct"""
+    if fields is not None:
+        return pick_fields(developer, fields, {"project_count": lambda d: snapshot.project_count(d.id)})
+
+    return DeveloperOut(
+        id=developer.id,
+        name=developer.name,
+        bio=developer.bio,
+        avatar_url=developer.avatar_url,
+        github_url=developer.github_url,
+        linkedin_url=developer.linkedin_url,
+        portfolio_url=developer.portfolio_url,
+        years_experience=developer.years_experience,
+        skills=developer.skills,
+        specialization=developer.specialization,
+        project_count=snapshot.project_count(developer.id)
+    )
+
+def get_snapshot(request: Request) -> PortfolioSnapshot:
+    return request.app.state.portfolio_snapshot
+
+def encode_cursor(project) -> str:
+    """Непрозрачный курсор по ключу сортировки (created_at, id)"""
+    raw = f"{project.created_at.isoformat()}|{project.id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> tuple:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, project_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(project_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def projects_page(
+        snapshot: PortfolioSnapshot,
+        limit: int,
+        cursor: Optional[str],
+        fields: Optional[tuple] = None,
+        **filters
+) -> JSONPayload:
+    """Страница проектов + X-Next-Cursor, если дальше что-то есть"""
+    after = decode_cursor(cursor) if cursor else None
+    limit = max(limit, 0)
+    # Берем на один больше, чтобы понять, есть ли следующая страница
+    projects = snapshot.find_projects(after=after, limit=limit + 1, **filters)
+
+    headers = {"Access-Control-Expose-Headers": "X-Next-Cursor"}
+    if len(projects) > limit:
+        projects = projects[:limit]
+        if projects:
+            headers["X-Next-Cursor"] = encode_cursor(projects[-1])
+
+    return JSONPayload(
+        content=[project_out(project, snapshot, fields) for project in projects],
+        headers=headers
+    )
+
+def developers_list(
+        snapshot,
+        active_only: bool,
+        limit: int,
+        fields: Optional[tuple] = None,
+        skill: Optional[str] = None
+) -> list:
+    developer_ids = snapshot.developer_order if skill is None else snapshot.developers_by_skill.get(skill, ())
+    developers = (snapshot.developers[dev_id] for dev_id in developer_ids)
+    if active_only:
+        developers = (dev for dev in developers if dev.is_active)
+
+    return [developer_out(dev, snapshot, fields) for dev in islice(developers, max(limit, 0))]
+
+def technologies_list(snapshot, category: Optional[str], limit: int, fields: Optional[tuple] = None) -> list:
+    technologies = (snapshot.technologies[tech_id] for tech_id in snapshot.technology_order)
+    if category:
+        technologies = (tech for tech in technologies if tech.category == category)
+
+    technologies = islice(technologies, max(limit, 0))
+    if fields is not None:
+        return [pick_fields(tech, fields) for tech in technologies]
+    return list(technologies)
+
+def project_categories(snapshot) -> list:
+    return [
+        {"id": category, "name": category.title(), "count": len(project_ids)}
+        for category, project_ids in snapshot.projects_by_category.items()
+    ]
+
+def public_stats(snapshot) -> dict:
     return {
-        "id": project.id,
-        "title": project.title,
-        "description": project.description,
-        "short_description": project.short_description,
-        "demo_url": project.demo_url,
-        "github_url": project.github_url,
-        "image_urls": image_urls,
-        "project_type": project.project_type,
-        "category": project.category,
-        "duration_months": project.duration_months,
-        "developers": [
-            {
-                "id": dev.id,
-                "name": dev.name,
-                "specialization": dev.specialization,
-                "avatar_url": dev.avatar_url
-            }
-            for dev in project.developers
-        ] if project.developers else []
+        **snapshot.stats,
+        "categories": {
+            category: len(project_ids)
+            for category, project_ids in snapshot.projects_by_category.items()
+        }
     }
 
 @router.get("/developers", response_model=List[PublicDeveloper])
 async def get_developers(
         request: Request,
         active_only: bool = True,
-        limit: int = 10
+        limit: int = 10,
+        skill: Optional[str] = Query(None, max_length=100, description="Only developers with this skill"),
+        fields: Optional[str] = Query(None, description="Comma-separated list of fields")
 ):
     """Get list of active developers for public display"""
-    async with request.app.state.db_session() as db:
-        query = select(DBDeveloperModel).options(selectinload(DBDeveloperModel.projects))
-
-        if active_only:
-            query = query.where(DBDeveloperModel.is_active == True)
+    selected = parse_fields(fields, PublicDeveloper.model_fields)
 
-        # Сортировка по order_priority ASC
-        query = query.order_by(DBDeveloperModel.order_priority.asc())
+    async def build():
+        return developers_list(get_snapshot(request), active_only, limit, selected, skill)
 
-        query = query.limit(limit)
-
-        result = await db.execute(query)
-        developers = result.scalars().all()
-
-        response_data = []
-        for dev in developers:
-            dev_data = PublicDeveloper.from_orm(dev)
-            dev_data.project_count = len([p for p in dev.projects if p.status == "active"]) if dev.projects else 0
-            response_data.append(dev_data)
-
-        return response_data
+    return await cached_json(request, ("developers", "projects"), build)
 
 @router.get("/developers/{developer_id}", response_model=PublicDeveloper)
 async def get_developer(developer_id: int, request: Request):
     """Get single developer by ID with their projects"""
-    async with request.app.state.db_session() as db:
-        query = select(DBDeveloperModel).options(selectinload(DBDeveloperModel.projects)).where(
-            DBDeveloperModel.id == developer_id,
-            DBDeveloperModel.is_active == True
-        )
-        result = await db.execute(query)
-        developer = result.scalar_one_or_none()
+    async def build():
+        snapshot = get_snapshot(request)
+        developer = snapshot.developers.get(developer_id)
 
-        if not developer:
+        if not developer or not developer.is_active:
             raise HTTPException(status_code=404, detail="Developer not found")
 
-        dev_data = PublicDeveloper.from_orm(developer)
-        dev_data.project_count = len([p for p in developer.projects if p.status == "active"]) if developer.projects else 0
-        return dev_data
+        return developer_out(developer, snapshot)
+
+    return await cached_json(request, ("developers", "projects"), build)
 
 @router.get("/developers/{developer_id}/projects")
 async def get_developer_projects(
         developer_id: int,
         request: Request,
-        limit: int = 20
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        fields: Optional[str] = Query(None, description="Comma-separated list of fields")
 ):
-    """Get projects for a developer"""
-    async with request.app.state.db_session() as db:
-        dev_query = select(DBDeveloperModel).where(
-            DBDeveloperModel.id == developer_id,
-            DBDeveloperModel.is_active == True
-        )
-        dev_result = await db.execute(dev_query)
-        developer = dev_result.scalar_one_or_none()
+    """Get projects for a developer (cursor pagination via X-Next-Cursor)"""
+    selected = parse_fields(fields, PublicProject.model_fields)
 
-        if not developer:
-            raise HTTPException(status_code=404, detail="Developer not found")
+    async def build():
+        snapshot = get_snapshot(request)
+        developer = snapshot.developers.get(developer_id)
 
-        project_query = (
-            select(DBProjectModel)
-            .options(
-                selectinload(DBProjectModel.developers),
-                selectinload(DBProjectModel.photos)
-            )
-            .join(DBProjectModel.developers)
-            .where(
-                DBDeveloperModel.id == developer_id,
-                DBProjectModel.status == "active"
-            )
-            .order_by(DBProjectModel.created_at.desc())
-            .limit(limit)
-        )
+        if not developer or not developer.is_active:
+            raise HTTPException(status_code=404, detail="Developer not found")
 
-        project_result = await db.execute(project_query)
-        projects = project_result.scalars().all()
+        return projects_page(snapshot, limit, cursor, selected, developer_id=developer_id)
 
-        return [project_to_dict(project) for project in projects]
+    return await cached_json(request, ("projects", "developers"), build)
 
 @router.get("/projects", response_model=List[PublicProject])
 async def get_projects(
@@ -187,160 +318,153 @@ async def get_projects(
         featured_only: bool = False,
         project_type: Optional[str] = None,
         category: Optional[str] = None,
-        limit: int = 12
+        limit: int = 12,
+        cursor: Optional[str] = None,
+        fields: Optional[str] = Query(None, description="Comma-separated list of fields")
 ):
-    async with request.app.state.db_session() as db:
-        query = select(DBProjectModel).options(
-            selectinload(DBProjectModel.developers),
-            selectinload(DBProjectModel.photos)
-        ).where(DBProjectModel.status == "active")
-
-        if featured_only:
-            query = query.where(DBProjectModel.featured == True)
+    """Get active projects, newest first (cursor pagination via X-Next-Cursor)"""
+    selected = parse_fields(fields, PublicProject.model_fields)
+
+    async def build():
+        return projects_page(
+            get_snapshot(request),
+            limit,
+            cursor,
+            selected,
+            featured_only=featured_only,
+            project_type=project_type,
+            category=category
+        )
 
-        if project_type:
-            query = query.where(DBProjectModel.project_type == project_type)
+    return await cached_json(request, ("projects", "developers"), build)
 
-        if category:
-            query = query.where(DBProjectModel.category == category)
+@router.get("/projects/search", response_model=List[PublicProjectSearchHit])
+async def search_projects(
+        request: Request,
+        q: str = Query(..., min_length=1, max_length=200),
+        limit: int = Query(20, ge=1, le=50),
+        fields: Optional[str] = Query(None, description="Comma-separated list of project fields")
+):
+    """Full-text search over active projects, most relevant first"""
+    selected = parse_fields(fields, PublicProject.model_fields)
 
-        query = query.order_by(DBProjectModel.created_at.desc()).limit(limit)
+    async def build():
+        async with request.app.state.db_read_session() as db:
+            rows = (await db.execute(ranked_search_query(q, limit))).all()
 
-        result = await db.execute(query)
-        projects = result.scalars().all()
+        # Сам проект берем из снапшота - как и в остальных публичных ручках
+        snapshot = get_snapshot(request)
+        return [
+            ProjectSearchHitOut(project_out(project, snapshot, selected), row.rank, row.headline)
+            for row in rows
+            if (project := snapshot.projects.get(row.id)) is not None
+        ]
 
-        return [project_to_dict(project) for project in projects]
+    return await cached_json(request, ("projects", "developers"), build)
 
 @router.get("/projects/{project_id}", response_model=PublicProject)
 async def get_project(project_id: int, request: Request):
-    async with request.app.state.db_session() as db:
-        query = select(DBProjectModel).options(
-            selectinload(DBProjectModel.developers),
-            selectinload(DBProjectModel.photos)
-        ).where(
-            DBProjectModel.id == project_id,
-            DBProjectModel.status == "active"
-        )
-        result = await db.execute(query)
-        project = result.scalar_one_or_none()
+    async def build():
+        snapshot = get_snapshot(request)
+        project = snapshot.projects.get(project_id)
 
         if not project:
             raise HTTPException(status_code=404, detail="Project not found")
 
-        return project_to_dict(project)
+        return project_out(project, snapshot)
+
+    return await cached_json(request, ("projects", "developers"), build)
 
 @router.get("/projects/categories/list")
 async def get_project_categories(request: Request):
     """Get list of all project categories with counts"""
-    async with request.app.state.db_session() as db:
-        from sqlalchemy import func
+    async def build():
+        return {"categories": project_categories(get_snapshot(request))}
 
-        query = select(
-            DBProjectModel.category,
-            func.count(DBProjectModel.id).label("count")
-        ).where(
-            DBProjectModel.status == "active",
-            DBProjectModel.category.is_not(None)
-        ).group_by(DBProjectModel.category)
-
-        result = await db.execute(query)
-        categories = result.all()
-
-        return {
-            "categories": [
-                {"id": cat.category, "name": cat.category.title(), "count": cat.count}
-                for cat in categories
-            ]
-        }
+    return await cached_json(request, ("projects",), build)
 
 @router.get("/technologies", response_model=List[PublicTechnology])
 async def get_technologies(
         request: Request,
         category: Optional[str] = None,
-        limit: int = 50
+        limit: int = 50,
+        fields: Optional[str] = Query(None, description="Comma-separated list of fields")
 ):
     """Get list of technologies for public display"""
-    async with request.app.state.db_session() as db:
-        query = select(DBTechnologyModel)
-
-        if category:
-            query = query.where(DBTechnologyModel.category == category)
+    selected = parse_fields(fields, PublicTechnology.model_fields)
 
-        query = query.order_by(DBTechnologyModel.name).limit(limit)
+    async def build():
+        return technologies_list(get_snapshot(request), category, limit, selected)
 
-        result = await db.execute(query)
-        technologies = result.scalars().all()
-
-        return [PublicTechnology.from_orm(tech) for tech in technologies]
+    return await cached_json(request, ("technologies",), build)
 
 @router.get("/technologies/categories")
 async def get_technology_categories(request: Request):
     """Get list of all technology categories"""
-    async with request.app.state.db_session() as db:
-        query = select(DBTechnologyModel.category).distinct().where(
-            DBTechnologyModel.category.is_not(None)
-        )
-        result = await db.execute(query)
-        categories = result.scalars().all()
+    async def build():
+        snapshot = get_snapshot(request)
+        categories = {tech.category for tech in snapshot.technologies.values() if tech.category is not None}
 
-        return {"categories": categories}
+        return {"categories": sorted(categories)}
+
+    return await cached_json(request, ("technologies",), build)
 
 @router.post("/contact", response_model=ServiceRequestResponse)
 async def submit_contact_form(
         service_request: ServiceRequestCreate,
-        request: Request
+        request: Request,
+        response: Response
 ):
     """Submit a service request / contact form"""
-    async with request.app.state.db_session() as db:
-        db_service_request = DBServiceRequestModel(
-            **service_request.dict(),
-            status="new",
-            priority="medium"
+    row = service_request_row(service_request.dict())
+
+    # Write-behind: кладем в очередь и отвечаем 202, в БД заявка попадет пачкой
+    ingestor = request.app.state.contact_ingestor
+    if ingestor is not None and ingestor.submit(row):
+        response.status_code = 202
+        return ServiceRequestResponse(
+            message="Thank you for your request! We'll get back to you soon.",
+            status="queued"
         )
 
-        db.add(db_service_request)
-        await db.commit()
-        await db.refresh(db_service_request)
+    async with request.app.state.db_session() as db:
+        [request_id] = await insert_service_requests(db, [row])
 
         return ServiceRequestResponse(
-            id=db_service_request.id,
+            id=request_id,
             message="Thank you for your request! We'll get back to you soon.",
             status="submitted"
         )
 
 @router.get("/stats")
 async def get_public_stats(request: Request):
-    """Get public statistics for homepage"""
-    async with request.app.state.db_session() as db:
-        from sqlalchemy import func
-
-        dev_query = select(func.count(DBDeveloperModel.id)).where(DBDeveloperModel.is_active == True)
-        dev_result = await db.execute(dev_query)
-        developers_count = dev_result.scalar()
-
-        proj_query = select(func.count(DBProjectModel.id)).where(DBProjectModel.status == "active")
-        proj_result = await db.execute(proj_query)
-        projects_count = proj_result.scalar()
-
-        sr_query = select(func.count(DBServiceRequestModel.id)).where(DBServiceRequestModel.status == "completed")
-        sr_result = await db.execute(sr_query)
-        completed_requests = sr_result.scalar()
-
-        cat_query = select(
-            DBProjectModel.category,
-            func.count(DBProjectModel.id).label("count")
-        ).where(
-            DBProjectModel.status == "active",
-            DBProjectModel.category.is_not(None)
-        ).group_by(DBProjectModel.category)
-        cat_result = await db.execute(cat_query)
-        categories_stats = {row.category: row.count for row in cat_result}
+    """Get public statistics for homepage (precomputed in the portfolio snapshot)"""
+    async def build():
+        return public_stats(get_snapshot(request))
+
+    return await cached_json(request, ("developers", "projects", "technologies", "service_requests"), build)
+
+@router.get("/bundle")
+async def get_homepage_bundle(
+        request: Request,
+        projects_limit: int = 6,
+        developers_limit: int = 10,
+        technologies_limit: int = 50
+):
+    """
+    Everything the landing page needs in one response:
+    stats, featured projects, developers, technologies and project categories
+    """
+    async def build():
+        snapshot = get_snapshot(request)
+        featured = snapshot.find_projects(featured_only=True, limit=max(projects_limit, 0))
 
         return {
-            "developers": developers_count,
-            "projects": projects_count,
-            "completed_projects": completed_requests,
-            "years_experience": 3,
-            "technologies": 15,
-            "categories": categories_stats
-        }
\ No newline at end of file
+            "stats": public_stats(snapshot),
+            "featured_projects": [project_out(project, snapshot) for project in featured],
+            "developers": developers_list(snapshot, True, developers_limit),
+            "technologies": technologies_list(snapshot, None, technologies_limit),
+            "categories": project_categories(snapshot),
+        }
+
+    return await cached_json(request, ("developers", "projects", "technologies", "service_requests"), build)
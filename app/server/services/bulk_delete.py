@@ -0,0 +1,40 @@
+# app/server/services/bulk_delete.py
+"""
+Массовое удаление одним выражением: DELETE ... WHERE id = ANY(:ids) RETURNING ...
+
+Связанные строки (фотки проектов, project_developers) удаляет сама БД через
+ON DELETE CASCADE, поэтому ORM-объекты и их связи не загружаются.
+Массив id уходит одним параметром - форма запроса не зависит от числа id.
+"""
+from fastapi import HTTPException
+from sqlalchemy import Integer, any_, bindparam, delete
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def parse_ids(ids: str) -> list[int]:
+    """'1,2, 3' -> [1, 2, 3] без повторов (400 на мусор)"""
+    try:
+        parsed = [int(id.strip()) for id in ids.split(',') if id.strip()]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid IDs format")
+    if not parsed:
+        raise HTTPException(status_code=400, detail="Invalid IDs format")
+    return list(dict.fromkeys(parsed))
+
+
+def id_in(column, ids: list[int]):
+    """column = ANY(:ids) с массивом в одном параметре (вместо IN со списком параметров)"""
+    return column == any_(bindparam(None, ids, type_=ARRAY(Integer)))
+
+
+async def delete_returning(db: AsyncSession, model, ids: list[int], *returning, by=None) -> list:
+    """
+    DELETE FROM model WHERE <by> = ANY(:ids) RETURNING id, *returning.
+
+    by - колонка для отбора (по умолчанию model.id). Коммит - на вызывающем.
+    """
+    column = by if by is not None else model.id
+    statement = delete(model).where(id_in(column, ids)).returning(model.id, *returning)
+    result = await db.execute(statement, execution_options={"synchronize_session": False})
+    return result.all()
@@ -0,0 +1,146 @@
+# app/server/services/contact_ingest.py
+import asyncio
+import hashlib
+import logging
+import time
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import insert
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from storages.psql.models.service_request_model import DBServiceRequestModel
+
+logger = logging.getLogger(__name__)
+
+
+def service_request_row(data: dict) -> dict:
+    """Данные формы -> строка service_requests (время ставим в момент отправки, а не записи)"""
+    now = datetime.utcnow()
+    return {**data, "status": "new", "priority": "medium", "created_at": now, "updated_at": now}
+
+
+def row_reference(row: dict) -> str:
+    """Не-PII метка заявки для логов: хэш email, по нему заявку можно сопоставить с жалобой клиента"""
+    email = (row.get("client_email") or "").strip().lower()
+    return f"email#{hashlib.sha256(email.encode()).hexdigest()[:12]}"
+
+
+def error_summary(e: Exception) -> str:
+    """Текст ошибки без параметров запроса (в str(DBAPIError) попадают значения полей заявки)"""
+    return repr(e.orig) if isinstance(e, DBAPIError) else repr(e)
+
+
+async def insert_service_requests(db: AsyncSession, rows: list[dict]) -> list[int]:
+    """Многострочный INSERT ... RETURNING id одним запросом"""
+    result = await db.execute(insert(DBServiceRequestModel).returning(DBServiceRequestModel.id), rows)
+    ids = list(result.scalars().all())
+    await db.commit()
+    return ids
+
+
+class ContactIngestor:
+    """
+    Write-behind запись заявок с формы контактов.
+
+    Ручка кладет провалидированную заявку в ограниченную очередь и сразу отвечает,
+    фоновый writer забирает заявки пачками и пишет их одним INSERT ... RETURNING.
+    Если очередь полна или writer остановлен - submit() возвращает False,
+    и ручка пишет заявку напрямую.
+    """
+
+    def __init__(
+            self,
+            db_session: async_sessionmaker[AsyncSession],
+            max_queue: int = 1000,
+            batch_size: int = 100,
+            flush_interval: float = 0.5
+    ):
+        self.db_session = db_session
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: asyncio.Queue[dict] = asyncio.Queue(maxsize=max_queue)
+        self._task: Optional[asyncio.Task] = None
+        self._flushing: Optional[asyncio.Future] = None
+        # Заявки, уже вынутые из очереди, но еще не отданные в _flush
+        self._batch: list[dict] = []
+        self._accepting = False
+
+    def start(self) -> None:
+        self._accepting = True
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Перестает принимать заявки и дописывает все, что осталось в очереди"""
+        self._accepting = False
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        if self._flushing is not None:
+            await self._flushing
+
+        batch, self._batch = self._batch, []
+        await self._flush(self._take_batch(batch))
+        while not self._queue.empty():
+            await self._flush(self._take_batch([]))
+
+    def submit(self, row: dict) -> bool:
+        if not self._accepting:
+            return False
+        try:
+            self._queue.put_nowait(row)
+        except asyncio.QueueFull:
+            logger.warning("⚠️ Contact queue is full, falling back to direct insert")
+            return False
+        return True
+
+    async def _run(self) -> None:
+        while True:
+            self._batch.append(await self._queue.get())
+            # Добираем пачку: до batch_size заявок или flush_interval секунд ожидания
+            deadline = time.monotonic() + self.flush_interval
+            while len(self._batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    self._batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            batch, self._batch = self._take_batch(self._batch), []
+            # shield: остановка не должна обрывать INSERT на середине, stop() его дождется
+            self._flushing = asyncio.ensure_future(self._flush(batch))
+            await asyncio.shield(self._flushing)
+            self._flushing = None
+
+    def _take_batch(self, batch: list[dict]) -> list[dict]:
+        while len(batch) < self.batch_size and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        return batch
+
+    async def _flush(self, batch: list[dict]) -> None:
+        if not batch:
+            return
+        try:
+            async with self.db_session() as db:
+                ids = await insert_service_requests(db, batch)
+            logger.info(f"📨 Saved {len(ids)} service requests (ids {ids[0]}..{ids[-1]})")
+            return
+        except Exception as e:
+            logger.error(f"❌ Batch insert of {len(batch)} service requests failed: {error_summary(e)}")
+
+        # Пачка упала - пишем по одной, чтобы одна кривая заявка не утянула остальные
+        for position, row in enumerate(batch):
+            try:
+                async with self.db_session() as db:
+                    await insert_service_requests(db, [row])
+            except Exception as e:
+                logger.error(
+                    f"❌ Service request {position + 1}/{len(batch)} ({row_reference(row)}) was not saved: "
+                    f"{error_summary(e)}"
+                )
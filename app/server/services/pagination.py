@@ -0,0 +1,102 @@
+# app/server/services/pagination.py
+"""
+Страница админского списка + total за один запрос.
+
+count(*) OVER () считается по всем строкам, прошедшим фильтры, до OFFSET/LIMIT,
+поэтому каждая строка страницы несет общий total. Отдельный COUNT нужен только
+если страница пустая (за концом списка или в таблице нет строк).
+
+Режим estimated (по запросу, ?_count=estimated) для больших таблиц: точный count -
+это проход по всем подходящим строкам, а для пагинации хватает оценки планировщика.
+Без фильтров оценка берется из pg_class.reltuples, с фильтрами - из EXPLAIN запроса.
+"""
+import json
+
+from typing import Literal, Optional
+
+from sqlalchemy import Select, func, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.base import Executable
+from sqlalchemy.sql.elements import ClauseElement
+
+CountMode = Literal["exact", "estimated"]
+
+# Меньше этого оценке не верим - точный count на такой таблице и так дешевый
+ESTIMATE_MIN_ROWS = 100_000
+
+# У партиционированной таблицы своей статистики нет - суммируем по партициям
+_RELTUPLES_QUERY = text(
+    """
+    SELECT sum(greatest(c.reltuples, 0))::bigint
+    FROM pg_class c
+    WHERE c.oid = to_regclass(:table)
+       OR c.oid IN (SELECT inhrelid FROM pg_inherits WHERE inhparent = to_regclass(:table))
+    """
+)
+
+
+class Explain(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) <statement> - параметры биндятся как у самого запроса"""
+    inherit_cache = False
+
+    def __init__(self, statement: Select):
+        self.statement = statement
+
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element: Explain, compiler, **kw) -> str:
+    return f"EXPLAIN (FORMAT JSON) {compiler.process(element.statement, **kw)}"
+
+
+def _trust(estimate: Optional[int]) -> Optional[int]:
+    if estimate is None or estimate < ESTIMATE_MIN_ROWS:
+        return None
+    return estimate
+
+
+async def estimated_count(db: AsyncSession, table: str) -> Optional[int]:
+    """Оценка числа строк таблицы по статистике; None - если оценки нет или таблица маленькая"""
+    return _trust((await db.execute(_RELTUPLES_QUERY, {"table": table})).scalar())
+
+
+async def planned_count(db: AsyncSession, query: Select) -> Optional[int]:
+    """Оценка числа строк запроса с фильтрами (Plan Rows из EXPLAIN); None - как у estimated_count"""
+    raw = (await db.execute(Explain(query.order_by(None)))).scalar()
+    plan = (json.loads(raw) if isinstance(raw, str) else raw)[0]["Plan"]
+    return _trust(int(plan["Plan Rows"]))
+
+
+async def fetch_page(
+        db: AsyncSession,
+        query: Select,
+        start: int,
+        end: int,
+        count: CountMode = "exact"
+) -> tuple[list, int]:
+    """
+    Выполняет query (уже с фильтрами и сортировкой) со срезом [start, end).
+
+    Возвращает (объекты первой колонки, total). В режиме estimated total - оценка,
+    если она есть и не меньше ESTIMATE_MIN_ROWS, иначе точный count.
+    """
+    limit = max(end - start, 0)
+
+    if count == "estimated":
+        if query.whereclause is None:
+            [table] = query.get_final_froms()
+            total = await estimated_count(db, table.name)
+        else:
+            total = await planned_count(db, query)
+        if total is not None:
+            result = await db.execute(query.offset(start).limit(limit))
+            return list(result.scalars().all()), total
+
+    total_column = func.count().over().label("total_count")
+    rows = (await db.execute(query.add_columns(total_column).offset(start).limit(limit))).all()
+    if rows:
+        return [row[0] for row in rows], rows[0].total_count
+
+    # Пустая страница: total не из чего взять - считаем отдельно (это редкий случай)
+    count_query = query.with_only_columns(func.count(), maintain_column_froms=True).order_by(None)
+    return [], (await db.execute(count_query)).scalar()
@@ -0,0 +1,527 @@
+# app/server/services/portfolio_snapshot.py
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import islice
+from typing import Iterable, Optional
+
+from fastapi import Request
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from storages.psql.models.developer_model import DBDeveloperModel
+from storages.psql.models.project_model import DBProjectModel, project_developers
+from storages.psql.models.project_photo_model import DBProjectPhotoModel
+from storages.psql.models.service_request_archive_model import DBServiceRequestArchiveModel
+from storages.psql.models.service_request_model import DBServiceRequestModel
+from storages.psql.models.technology_model import DBTechnologyModel
+from services.response_cache import invalidate_public_cache
+from services.static_export import schedule_static_export
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class ProjectView:
+    id: int
+    title: str
+    description: Optional[str]
+    short_description: Optional[str]
+    demo_url: Optional[str]
+    github_url: Optional[str]
+    image_urls: tuple
+    project_type: Optional[str]
+    category: Optional[str]
+    duration_months: Optional[int]
+    featured: bool
+    created_at: datetime
+    developer_ids: tuple
+
+
+@dataclass(slots=True)
+class DeveloperView:
+    id: int
+    name: str
+    bio: Optional[str]
+    avatar_url: Optional[str]
+    github_url: Optional[str]
+    linkedin_url: Optional[str]
+    portfolio_url: Optional[str]
+    years_experience: int
+    skills: Optional[list]
+    specialization: str
+    is_active: bool
+    order_priority: Optional[int]
+
+
+@dataclass(slots=True)
+class TechnologyView:
+    id: int
+    name: str
+    category: Optional[str]
+    icon_url: Optional[str]
+    color: Optional[str]
+
+
+_PROJECT_COLUMNS = (
+    DBProjectModel.id,
+    DBProjectModel.title,
+    DBProjectModel.description,
+    DBProjectModel.short_description,
+    DBProjectModel.demo_url,
+    DBProjectModel.github_url,
+    DBProjectModel.project_type,
+    DBProjectModel.category,
+    DBProjectModel.duration_months,
+    DBProjectModel.featured,
+    DBProjectModel.created_at,
+)
+
+_DEVELOPER_COLUMNS = (
+    DBDeveloperModel.id,
+    DBDeveloperModel.name,
+    DBDeveloperModel.bio,
+    DBDeveloperModel.avatar_url,
+    DBDeveloperModel.github_url,
+    DBDeveloperModel.linkedin_url,
+    DBDeveloperModel.portfolio_url,
+    DBDeveloperModel.years_experience,
+    DBDeveloperModel.skills,
+    DBDeveloperModel.specialization,
+    DBDeveloperModel.is_active,
+    DBDeveloperModel.order_priority,
+)
+
+_TECHNOLOGY_COLUMNS = (
+    DBTechnologyModel.id,
+    DBTechnologyModel.name,
+    DBTechnologyModel.category,
+    DBTechnologyModel.icon_url,
+    DBTechnologyModel.color,
+)
+
+
+def active_project_counts_query(developer_ids: Optional[Iterable[int]] = None):
+    """
+    developer_id -> число активных проектов, посчитанное в БД.
+
+    Группировка идет по project_developers с join на projects.status,
+    сами строки проектов не читаются.
+    """
+    query = (
+        select(project_developers.c.developer_id, func.count().label("project_count"))
+        .join(DBProjectModel, DBProjectModel.id == project_developers.c.project_id)
+        .where(DBProjectModel.status == "active")
+        .group_by(project_developers.c.developer_id)
+    )
+    if developer_ids is not None:
+        query = query.where(project_developers.c.developer_id.in_(developer_ids))
+    return query
+
+
+def public_stats_query():
+    """Все счетчики главной страницы одним запросом (скалярные подзапросы)"""
+    developers = (
+        select(func.count(DBDeveloperModel.id))
+        .where(DBDeveloperModel.is_active == True)
+        .scalar_subquery()
+    )
+    projects = (
+        select(func.count(DBProjectModel.id))
+        .where(DBProjectModel.status == "active")
+        .scalar_subquery()
+    )
+    # Старые месячные партиции уезжают в архив - завершенные заявки считаем в обеих таблицах
+    completed_projects = (
+        select(func.count(DBServiceRequestModel.id))
+        .where(DBServiceRequestModel.status == "completed")
+        .scalar_subquery()
+    ) + (
+        select(func.count(DBServiceRequestArchiveModel.id))
+        .where(DBServiceRequestArchiveModel.status == "completed")
+        .scalar_subquery()
+    )
+    technologies = select(func.count(DBTechnologyModel.id)).scalar_subquery()
+    # Опыт команды - максимальный опыт среди активных разработчиков
+    years_experience = (
+        select(func.coalesce(func.max(DBDeveloperModel.years_experience), 0))
+        .where(DBDeveloperModel.is_active == True)
+        .scalar_subquery()
+    )
+    return select(
+        developers.label("developers"),
+        projects.label("projects"),
+        completed_projects.label("completed_projects"),
+        years_experience.label("years_experience"),
+        technologies.label("technologies"),
+    )
+
+
+class PortfolioSnapshot:
+    """
+    Публичная часть портфолио целиком в памяти.
+
+    Хранит только активные проекты, всех разработчиков и все технологии плюс
+    готовые индексы (по категории, типу, featured, разработчик -> проекты).
+    Индексы - кортежи id, которые целиком заменяются при пересборке, поэтому
+    читатели никогда не видят полуобновленное состояние.
+    """
+
+    def __init__(self, db_session: async_sessionmaker[AsyncSession]):
+        self.db_session = db_session
+        self.loaded_at: Optional[datetime] = None
+
+        self.projects: dict[int, ProjectView] = {}
+        self.developers: dict[int, DeveloperView] = {}
+        self.technologies: dict[int, TechnologyView] = {}
+
+        self.project_order: tuple = ()
+        self.projects_by_category: dict[str, tuple] = {}
+        self.projects_by_type: dict[str, tuple] = {}
+        self.featured_projects: tuple = ()
+        self.developer_projects: dict[int, tuple] = {}
+        self.project_counts: dict[int, int] = {}
+        self.stats: dict = {}
+        self.developer_order: tuple = ()
+        self.developers_by_skill: dict[str, tuple] = {}
+        self.technology_order: tuple = ()
+
+        # Админские ручки могут прилететь параллельно - обновления идут по очереди
+        self._lock = asyncio.Lock()
+
+    # Загрузка
+
+    async def load(self) -> None:
+        """Полная загрузка публичных данных"""
+        async with self._lock:
+            async with self.db_session() as db:
+                projects = await self._fetch_projects(db, None)
+                developers = await self._fetch_developers(db, None)
+                technologies = await self._fetch_technologies(db, None)
+                project_counts = await self._fetch_project_counts(db, None)
+                stats = await self._fetch_stats(db)
+
+            self.projects = projects
+            self.project_counts = project_counts
+            self.stats = stats
+            self.developers = developers
+            self.technologies = technologies
+            self._reindex_projects()
+            self._reindex_developers()
+            self._reindex_technologies()
+            self.loaded_at = datetime.utcnow()
+
+        logger.info(
+            f"📸 Portfolio snapshot loaded: {len(self.projects)} projects, "
+            f"{len(self.developers)} developers, {len(self.technologies)} technologies"
+        )
+
+    async def refresh_projects(self, project_ids: Iterable[int]) -> None:
+        """Перечитывает только указанные проекты (удаленные и неактивные выпадают)"""
+        project_ids = set(project_ids)
+        if not project_ids:
+            return
+        async with self._lock:
+            async with self.db_session() as db:
+                fresh = await self._fetch_projects(db, project_ids)
+                # Счетчики меняются у старых и новых участников измененных проектов
+                affected_developers = {
+                    developer_id
+                    for project in (*fresh.values(), *(self.projects[pid] for pid in project_ids if pid in self.projects))
+                    for developer_id in project.developer_ids
+                }
+                counts = await self._fetch_project_counts(db, affected_developers)
+
+            projects = dict(self.projects)
+            for project_id in project_ids:
+                projects.pop(project_id, None)
+            projects.update(fresh)
+            self.projects = projects
+            self._update_project_counts(affected_developers, counts)
+            self._reindex_projects()
+
+    async def refresh_developers(self, developer_ids: Iterable[int]) -> None:
+        """Перечитывает указанных разработчиков и проекты, в которых они участвуют"""
+        developer_ids = set(developer_ids)
+        if not developer_ids:
+            return
+        async with self._lock:
+            # Под локом: параллельный refresh_projects переиндексирует developer_projects
+            affected_projects = {
+                project_id
+                for developer_id in developer_ids
+                for project_id in self.developer_projects.get(developer_id, ())
+            }
+            async with self.db_session() as db:
+                fresh = await self._fetch_developers(db, developer_ids)
+                counts = await self._fetch_project_counts(db, developer_ids)
+
+            developers = dict(self.developers)
+            for developer_id in developer_ids:
+                developers.pop(developer_id, None)
+            developers.update(fresh)
+            self.developers = developers
+            self._update_project_counts(developer_ids, counts)
+            self._reindex_developers()
+
+        # Удаление разработчика убирает его связи с проектами
+        await self.refresh_projects(affected_projects)
+
+    async def refresh_technologies(self, technology_ids: Iterable[int]) -> None:
+        technology_ids = set(technology_ids)
+        if not technology_ids:
+            return
+        async with self._lock:
+            async with self.db_session() as db:
+                fresh = await self._fetch_technologies(db, technology_ids)
+
+            technologies = dict(self.technologies)
+            for technology_id in technology_ids:
+                technologies.pop(technology_id, None)
+            technologies.update(fresh)
+            self.technologies = technologies
+            self._reindex_technologies()
+
+    async def refresh_stats(self) -> None:
+        """Пересчитывает счетчики главной (один запрос)"""
+        async with self.db_session() as db:
+            self.stats = await self._fetch_stats(db)
+
+    # Запросы
+
+    async def _fetch_stats(self, db: AsyncSession) -> dict:
+        row = (await db.execute(public_stats_query())).one()
+        return dict(row._mapping)
+
+    async def _fetch_projects(self, db: AsyncSession, project_ids: Optional[set]) -> dict[int, ProjectView]:
+        query = select(*_PROJECT_COLUMNS).where(DBProjectModel.status == "active")
+        if project_ids is not None:
+            query = query.where(DBProjectModel.id.in_(project_ids))
+        # Порядок совпадает с индексом ix_projects_status_created_at_id
+        query = query.order_by(DBProjectModel.created_at.desc(), DBProjectModel.id.desc())
+        rows = (await db.execute(query)).all()
+        if not rows:
+            return {}
+        ids = [row.id for row in rows]
+
+        photos: dict[int, list] = {}
+        photo_query = (
+            select(DBProjectPhotoModel.project_id, DBProjectPhotoModel.photo_url)
+            .where(DBProjectPhotoModel.project_id.in_(ids))
+            .order_by(DBProjectPhotoModel.project_id, DBProjectPhotoModel.order_index)
+        )
+        for project_id, photo_url in await db.execute(photo_query):
+            photos.setdefault(project_id, []).append(photo_url)
+
+        links: dict[int, list] = {}
+        link_query = (
+            select(project_developers.c.project_id, project_developers.c.developer_id)
+            .where(project_developers.c.project_id.in_(ids))
+        )
+        for project_id, developer_id in await db.execute(link_query):
+            links.setdefault(project_id, []).append(developer_id)
+
+        return {
+            row.id: ProjectView(
+                id=row.id,
+                title=row.title,
+                description=row.description,
+                short_description=row.short_description,
+                demo_url=row.demo_url,
+                github_url=row.github_url,
+                image_urls=tuple(photos.get(row.id, ())),
+                project_type=row.project_type,
+                category=row.category,
+                duration_months=row.duration_months,
+                featured=row.featured,
+                created_at=row.created_at,
+                developer_ids=tuple(links.get(row.id, ())),
+            )
+            for row in rows
+        }
+
+    async def _fetch_developers(self, db: AsyncSession, developer_ids: Optional[set]) -> dict[int, DeveloperView]:
+        query = select(*_DEVELOPER_COLUMNS)
+        if developer_ids is not None:
+            query = query.where(DBDeveloperModel.id.in_(developer_ids))
+        rows = (await db.execute(query)).all()
+        return {row.id: DeveloperView(**row._mapping) for row in rows}
+
+    async def _fetch_project_counts(self, db: AsyncSession, developer_ids: Optional[set]) -> dict[int, int]:
+        if developer_ids is not None and not developer_ids:
+            return {}
+        rows = await db.execute(active_project_counts_query(developer_ids))
+        return {developer_id: project_count for developer_id, project_count in rows}
+
+    async def _fetch_technologies(self, db: AsyncSession, technology_ids: Optional[set]) -> dict[int, TechnologyView]:
+        query = select(*_TECHNOLOGY_COLUMNS)
+        if technology_ids is not None:
+            query = query.where(DBTechnologyModel.id.in_(technology_ids))
+        rows = (await db.execute(query)).all()
+        return {row.id: TechnologyView(**row._mapping) for row in rows}
+
+    # Индексы
+
+    def _update_project_counts(self, developer_ids: Iterable[int], counts: dict[int, int]) -> None:
+        project_counts = dict(self.project_counts)
+        for developer_id in developer_ids:
+            project_counts.pop(developer_id, None)
+        project_counts.update(counts)
+        self.project_counts = project_counts
+
+    def _reindex_projects(self) -> None:
+        # Новые сверху, id как тай-брейкер для стабильного порядка
+        ordered = sorted(self.projects.values(), key=lambda p: (p.created_at, p.id), reverse=True)
+
+        by_category: dict[str, list] = {}
+        by_type: dict[str, list] = {}
+        by_developer: dict[int, list] = {}
+        featured = []
+        for project in ordered:
+            if project.category is not None:
+                by_category.setdefault(project.category, []).append(project.id)
+            if project.project_type is not None:
+                by_type.setdefault(project.project_type, []).append(project.id)
+            if project.featured:
+                featured.append(project.id)
+            for developer_id in project.developer_ids:
+                by_developer.setdefault(developer_id, []).append(project.id)
+
+        self.project_order = tuple(project.id for project in ordered)
+        self.projects_by_category = {key: tuple(ids) for key, ids in by_category.items()}
+        self.projects_by_type = {key: tuple(ids) for key, ids in by_type.items()}
+        self.featured_projects = tuple(featured)
+        self.developer_projects = {key: tuple(ids) for key, ids in by_developer.items()}
+
+    def _reindex_developers(self) -> None:
+        # NULL order_priority - в конце, как у ORDER BY order_priority ASC в Postgres
+        ordered = sorted(
+            self.developers.values(),
+            key=lambda d: (d.order_priority is None, d.order_priority or 0, d.id)
+        )
+        self.developer_order = tuple(developer.id for developer in ordered)
+
+        # Навык -> разработчики в порядке developer_order (тот же смысл, что skills @> '["..."]')
+        by_skill: dict[str, list] = {}
+        for developer in ordered:
+            for skill in set(developer.skills or ()):
+                by_skill.setdefault(skill, []).append(developer.id)
+        self.developers_by_skill = {skill: tuple(ids) for skill, ids in by_skill.items()}
+
+    def _reindex_technologies(self) -> None:
+        ordered = sorted(self.technologies.values(), key=lambda t: t.name)
+        self.technology_order = tuple(technology.id for technology in ordered)
+
+    # Чтение
+
+    def project_count(self, developer_id: int) -> int:
+        return self.project_counts.get(developer_id, 0)
+
+    def _position_after(self, ids: tuple, after: tuple) -> int:
+        """Бинарный поиск первого проекта строго после ключа (created_at, id) в порядке убывания"""
+        low, high = 0, len(ids)
+        while low < high:
+            middle = (low + high) // 2
+            project = self.projects[ids[middle]]
+            if (project.created_at, project.id) < after:
+                high = middle
+            else:
+                low = middle + 1
+        return low
+
+    def find_projects(
+            self,
+            featured_only: bool = False,
+            project_type: Optional[str] = None,
+            category: Optional[str] = None,
+            developer_id: Optional[int] = None,
+            after: Optional[tuple] = None,
+            limit: Optional[int] = None,
+    ) -> list[ProjectView]:
+        """
+        Отфильтрованные активные проекты, новые сверху.
+
+        after - ключ (created_at, id) последнего проекта предыдущей страницы:
+        позиция находится бинарным поиском, так что дальние страницы не дороже первой.
+        """
+        # Начинаем с самого узкого индекса, остальные условия проверяем по месту
+        candidates = [self.project_order]
+        if category is not None:
+            candidates.append(self.projects_by_category.get(category, ()))
+        if project_type is not None:
+            candidates.append(self.projects_by_type.get(project_type, ()))
+        if featured_only:
+            candidates.append(self.featured_projects)
+        if developer_id is not None:
+            candidates.append(self.developer_projects.get(developer_id, ()))
+        ids = min(candidates, key=len)
+        start = self._position_after(ids, after) if after is not None else 0
+
+        result = []
+        for project_id in islice(ids, start, None):
+            if limit is not None and len(result) >= limit:
+                break
+            project = self.projects[project_id]
+            if category is not None and project.category != category:
+                continue
+            if project_type is not None and project.project_type != project_type:
+                continue
+            if featured_only and not project.featured:
+                continue
+            if developer_id is not None and developer_id not in project.developer_ids:
+                continue
+            result.append(project)
+        return result
+
+
+async def sync_projects(request: Request, project_ids: Iterable[int]) -> None:
+    """Обновляет снапшот и кэш после изменения проектов в админке"""
+    snapshot: Optional[PortfolioSnapshot] = getattr(request.app.state, "portfolio_snapshot", None)
+    if snapshot is not None:
+        await snapshot.refresh_projects(project_ids)
+        await snapshot.refresh_stats()
+    invalidate_public_cache(request, "projects")
+    schedule_static_export(request)
+
+
+async def sync_developers(request: Request, developer_ids: Iterable[int]) -> None:
+    """Обновляет снапшот и кэш после изменения разработчиков в админке"""
+    snapshot: Optional[PortfolioSnapshot] = getattr(request.app.state, "portfolio_snapshot", None)
+    if snapshot is not None:
+        await snapshot.refresh_developers(developer_ids)
+        await snapshot.refresh_stats()
+    invalidate_public_cache(request, "developers", "projects")
+    schedule_static_export(request)
+
+
+async def sync_technologies(request: Request, technology_ids: Iterable[int]) -> None:
+    """Обновляет снапшот и кэш после изменения технологий в админке"""
+    snapshot: Optional[PortfolioSnapshot] = getattr(request.app.state, "portfolio_snapshot", None)
+    if snapshot is not None:
+        await snapshot.refresh_technologies(technology_ids)
+        await snapshot.refresh_stats()
+    invalidate_public_cache(request, "technologies")
+    schedule_static_export(request)
+
+
+async def sync_service_requests(request: Request) -> None:
+    """Заявки влияют только на счетчик завершенных проектов в статистике"""
+    snapshot: Optional[PortfolioSnapshot] = getattr(request.app.state, "portfolio_snapshot", None)
+    if snapshot is not None:
+        await snapshot.refresh_stats()
+    invalidate_public_cache(request, "service_requests")
+    schedule_static_export(request)
+
+
+async def run_periodic_reload(snapshot: PortfolioSnapshot, cache, interval_seconds: int, publisher=None) -> None:
+    """Страховочная полная перезагрузка (на случай правок мимо админки)"""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await snapshot.load()
+            cache.invalidate("projects", "developers", "technologies")
+            if publisher is not None:
+                publisher.schedule()
+        except Exception as e:
+            logger.error(f"❌ Portfolio snapshot reload failed: {e}")
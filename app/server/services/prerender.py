@@ -0,0 +1,132 @@
+# app/server/services/prerender.py
+"""
+Пререндер HTML для страниц проекта (/project/{id}) и разработчика (/developer/{slug}).
+
+Берем index.html собранного SPA и подставляем в него title/description/og-теги,
+простую семантическую разметку внутрь #root (ее видят краулеры и первый экран,
+React при старте ее заменяет) и JSON с теми же данными, что отдает API, -
+фронт берет его вместо первого запроса.
+"""
+import json
+import re
+from html import escape
+from typing import Optional
+
+PRERENDER_SCRIPT_ID = "prerender-data"
+
+_TITLE_RE = re.compile(r"<title>.*?</title>", re.S)
+_DESCRIPTION_RE = re.compile(r'<meta\s+name="description"\s+content="[^"]*"\s*/?>', re.S)
+_ROOT_RE = re.compile(r'<div id="root">\s*</div>')
+
+
+def developer_slug(name: str) -> str:
+    """Тот же slug, что строит фронт: name.toLowerCase() -> пробелы в '-' -> только [a-z0-9-]"""
+    return re.sub(r"[^a-z0-9-]", "", re.sub(r"\s+", "-", name.lower()))
+
+
+def _embed_json(data: dict) -> str:
+    # </script> внутри строк не должен закрыть тег раньше времени
+    payload = json.dumps(data, ensure_ascii=False, separators=(",", ":")).replace("<", "\\u003c")
+    return f'<script id="{PRERENDER_SCRIPT_ID}" type="application/json">{payload}</script>'
+
+
+def render_page(
+        shell: str,
+        title: str,
+        description: Optional[str],
+        body: str,
+        data: dict,
+        image_url: Optional[str] = None
+) -> str:
+    """Подставляет мета-теги, разметку и данные в index.html SPA"""
+    description = (description or "").strip()
+    head = [
+        f'<meta name="description" content="{escape(description)}" />',
+        f'<meta property="og:title" content="{escape(title)}" />',
+        f'<meta property="og:description" content="{escape(description)}" />',
+    ]
+    if image_url:
+        head.append(f'<meta property="og:image" content="{escape(image_url)}" />')
+
+    html = _TITLE_RE.sub(lambda _: f"<title>{escape(title)}</title>", shell, count=1)
+    html = _DESCRIPTION_RE.sub("", html, count=1)
+    html = html.replace("</head>", "".join(head) + "</head>", 1)
+    return _ROOT_RE.sub(lambda _: f'<div id="root">{body}</div>{_embed_json(data)}', html, count=1)
+
+
+def render_project_page(shell: str, project: dict) -> str:
+    images = "".join(
+        f'<img src="{escape(url)}" alt="{escape(project["title"])}" loading="lazy" />'
+        for url in project.get("image_urls") or []
+    )
+    developers = "".join(f"<li>{escape(dev['name'])}</li>" for dev in project.get("developers") or [])
+    body = (
+        f"<article><h1>{escape(project['title'])}</h1>"
+        f"<p>{escape(project.get('short_description') or '')}</p>"
+        f"<div>{escape(project.get('description') or '')}</div>"
+        f"{images}"
+        f"{f'<ul>{developers}</ul>' if developers else ''}"
+        f"</article>"
+    )
+    return render_page(
+        shell,
+        title=f"{project['title']} - Sligart Studio",
+        description=project.get("short_description") or project.get("description"),
+        body=body,
+        data={"type": "project", "id": project["id"], "project": project},
+        image_url=project.get("cover_image_url")
+    )
+
+
+def render_developer_page(shell: str, developer: dict, projects: list) -> str:
+    skills = "".join(f"<li>{escape(skill)}</li>" for skill in developer.get("skills") or [])
+    project_items = "".join(
+        f'<li><a href="/project/{project["id"]}">{escape(project["title"])}</a></li>' for project in projects
+    )
+    body = (
+        f"<article><h1>{escape(developer['name'])}</h1>"
+        f"<p>{escape(developer['specialization'])}</p>"
+        f"<div>{escape(developer.get('bio') or '')}</div>"
+        f"{f'<ul>{skills}</ul>' if skills else ''}"
+        f"{f'<ul>{project_items}</ul>' if project_items else ''}"
+        f"</article>"
+    )
+    return render_page(
+        shell,
+        title=f"{developer['name']} - {developer['specialization']} - Sligart Studio",
+        description=developer.get("bio"),
+        body=body,
+        data={
+            "type": "developer",
+            "slug": developer_slug(developer["name"]),
+            "developer": developer,
+            "projects": projects,
+        },
+        image_url=developer.get("avatar_url")
+    )
+
+
+def render_site_pages(shell: str, files: dict[str, bytes]) -> dict[str, bytes]:
+    """
+    Отрендеренные ответы API (path -> JSON) -> HTML-страницы (путь в каталоге site -> HTML).
+
+    Данные берутся из тех же ответов, что отдают get_project/get_developer.
+    """
+    pages = {}
+    for path, body in files.items():
+        match = re.fullmatch(r"/api/public/projects/(\d+)", path)
+        if match:
+            html = render_project_page(shell, json.loads(body))
+            pages[f"site/project/{match.group(1)}/index.html"] = html.encode()
+            continue
+
+        match = re.fullmatch(r"/api/public/developers/(\d+)", path)
+        if match:
+            developer = json.loads(body)
+            slug = developer_slug(developer["name"])
+            if not slug:
+                continue
+            projects_body = files.get(f"{path}/projects")
+            projects = json.loads(projects_body) if projects_body else []
+            pages[f"site/developer/{slug}/index.html"] = render_developer_page(shell, developer, projects).encode()
+    return pages
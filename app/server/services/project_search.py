@@ -0,0 +1,55 @@
+# app/server/services/project_search.py
+from sqlalchemy import func, literal_column, select
+from sqlalchemy.dialects.postgresql import REGCONFIG
+
+from storages.psql.models.project_model import DBProjectModel, SEARCH_CONFIG
+
+# Подсветка совпадений для выдачи: пара фрагментов вокруг найденных слов
+HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxFragments=2, MaxWords=25, MinWords=8"
+
+
+def search_config():
+    """
+    Конфигурация FTS константой regconfig.
+
+    Общая для роутера и check_indexes: проверяется то же выражение, что выполняется.
+    """
+    return literal_column(f"'{SEARCH_CONFIG}'::regconfig", REGCONFIG)
+
+
+def search_tsquery(q: str):
+    """Пользовательский ввод -> tsquery (websearch_to_tsquery не падает на кривом синтаксисе)"""
+    return func.websearch_to_tsquery(search_config(), q)
+
+
+def search_condition(q: str):
+    """WHERE search_vector @@ tsquery - использует GIN индекс ix_projects_search_vector"""
+    return DBProjectModel.search_vector.op("@@")(search_tsquery(q))
+
+
+def ranked_search_query(q: str, limit: int, status: str = "active"):
+    """
+    id, rank и headline лучших совпадений, самые релевантные сверху.
+
+    Сначала через индекс отбираются и ранжируются top-N, и только для них
+    считается ts_headline (он парсит весь текст документа и стоит дорого).
+    """
+    tsquery = search_tsquery(q)
+    rank = func.ts_rank_cd(DBProjectModel.search_vector, tsquery)
+
+    top = (
+        select(DBProjectModel.id, rank.label("rank"))
+        .where(DBProjectModel.status == status, search_condition(q))
+        .order_by(rank.desc(), DBProjectModel.id.desc())
+        .limit(limit)
+        .subquery()
+    )
+
+    document = func.concat_ws(" ", DBProjectModel.short_description, DBProjectModel.description)
+    headline = func.ts_headline(search_config(), document, tsquery, HEADLINE_OPTIONS)
+
+    return (
+        select(top.c.id, top.c.rank, headline.label("headline"))
+        .join(DBProjectModel, DBProjectModel.id == top.c.id)
+        .order_by(top.c.rank.desc(), top.c.id.desc())
+    )
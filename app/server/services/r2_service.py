@@ -198,6 +198,30 @@ class R2Service:
             print(f"Failed to delete file: {e}")
             return False
 
+    async def delete_files(self, file_urls: list[str]) -> int:
+        """
+        Удаляет пачку файлов из R2 через DeleteObjects (до 1000 ключей за запрос).
+        Возвращает число удаленных; ошибки логируются и не прерывают остальные пачки.
+        """
+        prefix = f"{self.public_url}/"
+        keys = [url.replace(prefix, "", 1) for url in file_urls if url and url.startswith(prefix)]
+        deleted = 0
+        for start in range(0, len(keys), 1000):
+            batch = keys[start:start + 1000]
+            try:
+                response = self.client.delete_objects(
+                    Bucket=self.bucket_name,
+                    Delete={"Objects": [{"Key": key} for key in batch], "Quiet": True}
+                )
+            except Exception as e:
+                print(f"Failed to delete {len(batch)} files: {e}")
+                continue
+            errors = response.get("Errors", [])
+            for error in errors:
+                print(f"Failed to delete file {error.get('Key')}: {error.get('Message')}")
+            deleted += len(batch) - len(errors)
+        return deleted
+
     # Алиасы для обратной совместимости
     async def delete_avatar(self, avatar_url: str) -> bool:
         return await self.delete_file(avatar_url)
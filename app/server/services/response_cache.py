@@ -0,0 +1,382 @@
+# app/server/services/response_cache.py
+import asyncio
+import gzip
+import hashlib
+import logging
+import secrets
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Iterable, Optional
+from urllib.parse import urlencode
+
+import brotli
+from fastapi import HTTPException, Request, Response
+
+from services.serialization import dumps
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class CacheEntry:
+    body: bytes
+    etag: str
+    tags: frozenset
+    expires_at: float
+    headers: Optional[dict] = None
+    # Сжатые варианты тела ("br", "gzip"), создаются по первому запросу с такой кодировкой
+    variants: dict = field(default_factory=dict)
+    # False - ответ собран при старых версиях тегов и в кэш не попал
+    cacheable: bool = True
+
+
+@dataclass(slots=True)
+class JSONPayload:
+    """Результат build() с дополнительными заголовками, которые кэшируются вместе с телом"""
+    content: Any
+    headers: dict
+
+
+class ResponseCache:
+    """
+    Ограниченный по размеру in-memory кэш сериализованных ответов (TTL + LRU).
+
+    Ключ - путь + отсортированные query-параметры. Каждая запись помечается тегами
+    сущностей ("projects", "developers", ...), админские ручки сбрасывают записи по тегу.
+
+    Для каждого тега хранится версия контента, которая растет при каждом сбросе.
+    ETag считается из ключа и версий тегов, поэтому его можно проверить до запроса в БД.
+
+    Сжатые варианты хранятся рядом с телом записи и учитываются в max_bytes.
+    Тела меньше compress_min_bytes не жмутся, brotli_quality=None отключает brotli.
+
+    После ttl_seconds запись еще stale_seconds отдается как устаревшая, пока ее
+    пересчитывает фоновая задача. Сброс тега удаляет записи сразу - устаревшим
+    считается только контент, который мог измениться мимо админки.
+    Пересчет одного ключа идет в одной задаче, параллельные запросы ждут ее (single-flight).
+    """
+
+    def __init__(
+            self,
+            max_entries: int = 1024,
+            max_bytes: int = 32 * 1024 * 1024,
+            ttl_seconds: float = 300.0,
+            stale_seconds: float = 300.0,
+            compress_min_bytes: int = 1024,
+            gzip_level: int = 6,
+            brotli_quality: Optional[int] = 5
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self.compress_min_bytes = compress_min_bytes
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._tag_index: dict[str, set[str]] = {}
+        self._versions: dict[str, int] = {}
+        self._size = 0
+        # ETag -> задача, которая сейчас строит этот ответ
+        self._inflight: dict[str, asyncio.Task] = {}
+        self.counters = {"hit": 0, "miss": 0, "stale": 0, "coalesced": 0, "not_modified": 0}
+        # Версии живут в памяти процесса - эпоха не дает совпасть ETag после рестарта
+        self._epoch = secrets.token_hex(4)
+
+    @staticmethod
+    def make_key(request: Request) -> str:
+        """Путь + query-параметры в каноническом порядке"""
+        query = urlencode(sorted(request.query_params.multi_items()))
+        return f"{request.url.path}?{query}"
+
+    def etag_for(self, key: str, tags: Iterable[str]) -> str:
+        """Сильный ETag для ключа при текущих версиях тегов"""
+        versions = ",".join(f"{tag}:{self._versions.get(tag, 0)}" for tag in sorted(tags))
+        digest = hashlib.blake2b(f"{self._epoch}|{key}|{versions}".encode(), digest_size=12).hexdigest()
+        return f'"{digest}"'
+
+    def get(self, key: str) -> tuple[Optional[CacheEntry], bool]:
+        """Запись и флаг "устарела" (TTL вышел, но еще можно отдать, пока идет пересчет)"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None, False
+        now = time.monotonic()
+        if entry.expires_at + self.stale_seconds <= now:
+            self._remove(key)
+            return None, False
+        self._entries.move_to_end(key)
+        return entry, entry.expires_at <= now
+
+    async def fill(
+            self,
+            key: str,
+            tags: frozenset,
+            etag: str,
+            build: Callable[[], Awaitable[Any]]
+    ) -> CacheEntry:
+        """Строит (или дожидается уже идущей сборки) запись для ключа при версиях тегов из etag"""
+        task = self._inflight.get(etag)
+        if task is None:
+            task = self.refresh(key, tags, etag, build)
+        else:
+            self.counters["coalesced"] += 1
+        # shield: отмена одного клиента не должна отменять сборку для остальных
+        return await asyncio.shield(task)
+
+    def refresh(
+            self,
+            key: str,
+            tags: frozenset,
+            etag: str,
+            build: Callable[[], Awaitable[Any]]
+    ) -> asyncio.Task:
+        """Запускает сборку записи в фоне, если она еще не идет"""
+        task = self._inflight.get(etag)
+        if task is None:
+            task = asyncio.create_task(self._build(key, tags, etag, build))
+            self._inflight[etag] = task
+            task.add_done_callback(lambda done: self._build_done(etag, done))
+        return task
+
+    async def _build(
+            self,
+            key: str,
+            tags: frozenset,
+            etag: str,
+            build: Callable[[], Awaitable[Any]]
+    ) -> CacheEntry:
+        data = await build()
+        extra_headers = None
+        if isinstance(data, JSONPayload):
+            data, extra_headers = data.content, data.headers
+        body = dumps(data)
+
+        # Пока строили ответ, админка могла сбросить теги - такой ответ отдаем, но не кэшируем
+        if self.etag_for(key, tags) != etag:
+            return CacheEntry(body=body, etag=etag, tags=tags, expires_at=0.0, headers=extra_headers, cacheable=False)
+        return self.set(key, body, tags, etag=etag, headers=extra_headers)
+
+    def _build_done(self, etag: str, task: asyncio.Task) -> None:
+        if self._inflight.get(etag) is task:
+            del self._inflight[etag]
+        # Ошибку фонового пересчета (его никто не ждет) хотя бы логируем
+        if not task.cancelled() and task.exception() is not None:
+            exc = task.exception()
+            if not isinstance(exc, HTTPException):
+                logger.warning(f"⚠️ Failed to build cached response for ETag {etag}: {exc!r}")
+
+    def stats(self) -> dict:
+        return {
+            **self.counters,
+            "entries": len(self._entries),
+            "bytes": self._size,
+            "max_bytes": self.max_bytes,
+            "inflight": len(self._inflight),
+        }
+
+    def set(
+            self,
+            key: str,
+            body: bytes,
+            tags: Iterable[str],
+            etag: Optional[str] = None,
+            headers: Optional[dict] = None
+    ) -> CacheEntry:
+        if key in self._entries:
+            self._remove(key)
+
+        tags = frozenset(tags)
+        entry = CacheEntry(
+            body=body,
+            etag=etag or self.etag_for(key, tags),
+            tags=tags,
+            expires_at=time.monotonic() + self.ttl_seconds,
+            headers=headers
+        )
+        self._entries[key] = entry
+        self._size += len(body)
+        for tag in entry.tags:
+            self._tag_index.setdefault(tag, set()).add(key)
+
+        self._evict()
+        return entry
+
+    @property
+    def encodings(self) -> tuple:
+        """Поддерживаемые кодировки в порядке предпочтения"""
+        return ("br", "gzip") if self.brotli_quality is not None else ("gzip",)
+
+    def compress(self, body: bytes, encoding: str) -> bytes:
+        if encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        # mtime=0 - одинаковый вывод для одинакового тела
+        return gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+
+    def variant(self, key: str, entry: CacheEntry, encoding: Optional[str]) -> tuple[bytes, Optional[str]]:
+        """
+        Тело записи в запрошенной кодировке -> (body, Content-Encoding или None).
+
+        Вариант сжимается один раз и живет, пока жива запись (сброс тега удаляет
+        запись вместе со всеми вариантами).
+        """
+        if encoding is None or len(entry.body) < self.compress_min_bytes:
+            return entry.body, None
+
+        body = entry.variants.get(encoding)
+        if body is None:
+            body = self.compress(entry.body, encoding)
+            # Запись могли вытеснить или заменить, пока мы жали - тогда вариант не храним
+            if self._entries.get(key) is entry:
+                entry.variants[encoding] = body
+                self._size += len(body)
+                self._evict()
+        return body, encoding
+
+    def _evict(self) -> None:
+        # Выкидываем самые старые записи, пока не влезем в лимиты
+        while self._entries and (len(self._entries) > self.max_entries or self._size > self.max_bytes):
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+
+    def invalidate(self, *tags: str) -> int:
+        """Удаляет все записи, помеченные любым из тегов. Возвращает число удаленных записей"""
+        keys = set()
+        for tag in tags:
+            self._versions[tag] = self._versions.get(tag, 0) + 1
+            keys |= self._tag_index.pop(tag, set())
+        for key in keys:
+            self._remove(key)
+        return len(keys)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._tag_index.clear()
+        self._size = 0
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._size -= len(entry.body) + sum(len(body) for body in entry.variants.values())
+        for tag in entry.tags:
+            keys = self._tag_index.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tag_index[tag]
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Проверяет заголовок If-None-Match (список тегов, W/-префикс, "*")"""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def negotiate_encoding(accept_encoding: Optional[str], supported: Iterable[str]) -> Optional[str]:
+    """
+    Выбирает кодировку по Accept-Encoding: первую из supported с ненулевым q.
+
+    "*" разрешает любую кодировку, не указанную явно. None - отдаем как есть.
+    """
+    if not accept_encoding:
+        return None
+
+    weights = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name.strip().lower()] = q
+
+    wildcard = weights.get("*", 0.0)
+    candidates = [(weights.get(name, wildcard), -i, name) for i, name in enumerate(supported)]
+    q, _, name = max(candidates, default=(0.0, 0, None))
+    return name if q > 0 else None
+
+
+def cache_control_header(request: Request) -> str:
+    settings = request.app.state.settings.cache
+    return (
+        f"public, max-age={settings.public_max_age}, "
+        f"stale-while-revalidate={settings.public_stale_while_revalidate}"
+    )
+
+
+async def cached_json(
+        request: Request,
+        tags: Iterable[str],
+        build: Callable[[], Awaitable[Any]]
+) -> Response:
+    """
+    Отдает JSON из кэша, а при промахе вызывает build() и кэширует результат.
+
+    Параллельные промахи по одному ключу ждут одну сборку. Устаревшая запись
+    отдается сразу, а пересчитывается в фоне.
+    Если клиент прислал актуальный If-None-Match - сразу 304, без build() и без БД.
+    Исключения из build() (например 404) не кэшируются.
+    Тело отдается в лучшей кодировке из Accept-Encoding, сжатый вариант тоже кэшируется.
+    """
+    cache: ResponseCache = request.app.state.response_cache
+    key = cache.make_key(request)
+    tags = frozenset(tags)
+    etag = cache.etag_for(key, tags)
+    encoding = negotiate_encoding(request.headers.get("accept-encoding"), cache.encodings)
+    headers = {
+        "ETag": etag,
+        "Cache-Control": cache_control_header(request),
+        "Vary": "Accept-Encoding",
+    }
+
+    if_none_match = request.headers.get("if-none-match")
+    if etag_matches(if_none_match, etag):
+        cache.counters["not_modified"] += 1
+        return Response(status_code=304, headers=headers)
+    if encoding is not None and etag_matches(if_none_match, encoded_etag(etag, encoding)):
+        # 304 несет тот же валидатор, что и 200, - у клиента сохранен сжатый вариант
+        cache.counters["not_modified"] += 1
+        return Response(status_code=304, headers={**headers, "ETag": encoded_etag(etag, encoding)})
+
+    entry, stale = cache.get(key)
+    if entry is None:
+        cache.counters["miss"] += 1
+        entry = await cache.fill(key, tags, etag, build)
+        if not entry.cacheable:
+            # Контент поменялся во время сборки - отдаем без ETag и кэш-заголовков
+            return Response(content=entry.body, media_type="application/json", headers=entry.headers)
+    elif stale:
+        cache.counters["stale"] += 1
+        cache.refresh(key, tags, etag, build)
+    else:
+        cache.counters["hit"] += 1
+
+    if entry.headers:
+        headers.update(entry.headers)
+    body, content_encoding = cache.variant(key, entry, encoding)
+    if content_encoding is not None:
+        # У каждого варианта свой ETag - сжатое и несжатое тело разные байты
+        headers["ETag"] = encoded_etag(etag, content_encoding)
+        headers["Content-Encoding"] = content_encoding
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def encoded_etag(etag: str, encoding: Optional[str]) -> str:
+    """ETag сжатого варианта: "abc" -> "abc-gzip" """
+    return f'{etag[:-1]}-{encoding}"' if encoding else etag
+
+
+def invalidate_public_cache(request: Request, *tags: str) -> None:
+    """Сбрасывает публичные ответы, зависящие от измененных сущностей"""
+    cache: Optional[ResponseCache] = getattr(request.app.state, "response_cache", None)
+    if cache is not None:
+        cache.invalidate(*tags)
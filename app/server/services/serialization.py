@@ -0,0 +1,51 @@
+# app/server/services/serialization.py
+from typing import Any, Callable, Iterable, Optional
+
+from fastapi import HTTPException, Response
+from pydantic_core import to_json
+from sqlalchemy.orm import load_only
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Сериализует ответ сразу в bytes (Rust-энкодер pydantic-core).
+
+    Понимает dict/list, dataclass (в том числе slots), pydantic-модели и datetime,
+    поэтому ни jsonable_encoder, ни ручной .isoformat() не нужны.
+    """
+    return to_json(content)
+
+
+class FastJSONResponse(Response):
+    """JSONResponse без jsonable_encoder и повторной валидации по response_model"""
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def parse_fields(fields: Optional[str], allowed: Iterable[str]) -> Optional[tuple]:
+    """
+    ?fields=title,short_description -> ("id", "title", "short_description").
+
+    None - отдаем все поля. id добавляется всегда, неизвестные поля -> 400.
+    """
+    if not fields:
+        return None
+    requested = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = set(requested) - set(allowed)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    return tuple(dict.fromkeys(["id", *requested]))
+
+
+def pick_fields(obj: Any, fields: Iterable[str], computed: Optional[dict[str, Callable[[Any], Any]]] = None) -> dict:
+    """Только запрошенные поля объекта; computed - поля, которые считаются не из атрибута"""
+    computed = computed or {}
+    return {name: computed[name](obj) if name in computed else getattr(obj, name) for name in fields}
+
+
+def load_only_fields(model, fields: Iterable[str]):
+    """load_only() по тем запрошенным полям, которые являются колонками модели"""
+    columns = model.__table__.columns
+    return load_only(*(getattr(model, name) for name in fields if name in columns))
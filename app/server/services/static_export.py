@@ -0,0 +1,224 @@
+# app/server/services/static_export.py
+"""
+Статический экспорт публичного API: JSON-файлы, которые Caddy отдает с диска.
+
+Каждая публикация рендерит ответы публичных ручек (через само приложение, без сети)
+в новый каталог версии, рядом кладет .gz/.br варианты и атомарно переключает
+симлинк current на эту версию. Caddy отдает current/{path}.json на GET без query.
+
+Если доступен index.html собранного SPA, рядом пишутся пререндеренные страницы
+проектов и разработчиков (current/site/...), которые Caddy отдает раньше SPA fallback.
+
+Запуск вручную (из app/server или в контейнере server):
+    python -m services.static_export
+"""
+import asyncio
+import gzip
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Optional
+
+import brotli
+import httpx
+from fastapi import FastAPI, Request
+
+from services.prerender import render_site_pages
+
+logger = logging.getLogger(__name__)
+
+
+def public_paths(snapshot) -> list[str]:
+    """Все публичные GET-ответы без query-параметров, которые есть смысл отдавать статикой"""
+    paths = [
+        "/api/public/projects",
+        "/api/public/projects/categories/list",
+        "/api/public/developers",
+        "/api/public/technologies",
+        "/api/public/technologies/categories",
+        "/api/public/stats",
+        "/api/public/bundle",
+    ]
+    paths += [f"/api/public/projects/{project_id}" for project_id in snapshot.project_order]
+    for developer_id in snapshot.developer_order:
+        if snapshot.developers[developer_id].is_active:
+            paths += [f"/api/public/developers/{developer_id}", f"/api/public/developers/{developer_id}/projects"]
+    return paths
+
+
+class StaticPublisher:
+    """
+    Публикует статический экспорт в directory:
+
+        directory/versions/<version>/api/public/projects.json (+ .gz, .br)
+        directory/versions/<version>/site/project/<id>/index.html (+ .gz, .br)
+        directory/versions/<version>/manifest.json
+        directory/current -> versions/<version>
+
+    Хранится keep_versions последних версий - Caddy, который уже открыл файл
+    старой версии, спокойно его дочитает.
+
+    Публикация инкрементальная: файлы, чей контент не изменился с прошлой версии
+    (по хэшу из manifest.json), не пишутся и не жмутся заново, а хардлинкуются.
+    """
+
+    def __init__(
+            self,
+            app: FastAPI,
+            directory: str,
+            keep_versions: int = 3,
+            debounce_seconds: float = 1.0,
+            gzip_level: int = 9,
+            brotli_quality: Optional[int] = 11,
+            spa_index: Optional[str] = None
+    ):
+        self.app = app
+        self.directory = Path(directory)
+        self.spa_index = Path(spa_index) if spa_index else None
+        self.keep_versions = keep_versions
+        self.debounce_seconds = debounce_seconds
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self._task: Optional[asyncio.Task] = None
+        self._dirty = False
+
+    def schedule(self) -> None:
+        """Отложенная публикация: пачка правок в админке дает одну публикацию"""
+        self._dirty = True
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def _run(self) -> None:
+        while self._dirty:
+            await asyncio.sleep(self.debounce_seconds)
+            self._dirty = False
+            try:
+                await self.publish()
+            except Exception as e:
+                logger.error(f"❌ Static export failed: {e}")
+
+    async def render(self) -> dict[str, bytes]:
+        """path -> тело ответа; рендерим через ASGI самого приложения, чтобы ответы совпадали байт в байт"""
+        snapshot = self.app.state.portfolio_snapshot
+        files = {}
+        transport = httpx.ASGITransport(app=self.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://static-export") as client:
+            for path in public_paths(snapshot):
+                response = await client.get(path, headers={"Accept-Encoding": "identity"})
+                if response.status_code == 200:
+                    files[path] = response.content
+                else:
+                    logger.warning(f"⚠️ Static export skipped {path}: HTTP {response.status_code}")
+        return files
+
+    def render_pages(self, files: dict[str, bytes]) -> dict[str, bytes]:
+        """Пререндеренные HTML-страницы; без собранного SPA - пропускаем"""
+        if self.spa_index is None or not self.spa_index.is_file():
+            return {}
+        return render_site_pages(self.spa_index.read_text(encoding="utf-8"), files)
+
+    async def publish(self) -> Path:
+        started = time.perf_counter()
+        files = await self.render()
+        outputs = {f"{path.lstrip('/')}.json": body for path, body in files.items()}
+        outputs.update(self.render_pages(files))
+        version_dir, written = await asyncio.to_thread(self._write_version, outputs)
+        logger.info(
+            f"📦 Static export {version_dir.name}: {len(outputs)} files ({written} changed) "
+            f"in {(time.perf_counter() - started) * 1000:.0f}ms"
+        )
+        return version_dir
+
+    def _variants(self, name: str) -> list[str]:
+        return [name, f"{name}.gz"] + ([f"{name}.br"] if self.brotli_quality is not None else [])
+
+    def _write_version(self, outputs: dict[str, bytes]) -> tuple[Path, int]:
+        versions_dir = self.directory / "versions"
+        version_dir = versions_dir / str(time.time_ns())
+        current = self.directory / "current"
+        version_dir.mkdir(parents=True)
+
+        previous_dir = current.resolve() if current.exists() else None
+        previous = {}
+        if previous_dir is not None and (previous_dir / "manifest.json").is_file():
+            previous = json.loads((previous_dir / "manifest.json").read_text())
+
+        manifest = {}
+        written = 0
+        for name, body in outputs.items():
+            digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+            manifest[name] = digest
+            target = version_dir / name
+            target.parent.mkdir(parents=True, exist_ok=True)
+
+            if previous.get(name) == digest and self._link_previous(previous_dir, version_dir, name):
+                continue
+
+            written += 1
+            target.write_bytes(body)
+            # Caddy file_server { precompressed br gzip } сам выберет вариант по Accept-Encoding
+            target.with_name(target.name + ".gz").write_bytes(gzip.compress(body, self.gzip_level, mtime=0))
+            if self.brotli_quality is not None:
+                target.with_name(target.name + ".br").write_bytes(brotli.compress(body, quality=self.brotli_quality))
+
+        (version_dir / "manifest.json").write_text(json.dumps(manifest))
+
+        # Атомарное переключение: новый симлинк рядом + rename поверх старого
+        tmp_link = self.directory / f".current-{version_dir.name}"
+        tmp_link.symlink_to(version_dir.relative_to(self.directory))
+        os.replace(tmp_link, current)
+
+        for old in sorted(versions_dir.iterdir(), key=lambda p: p.name)[:-self.keep_versions]:
+            shutil.rmtree(old, ignore_errors=True)
+        return version_dir, written
+
+    def _link_previous(self, previous_dir: Path, version_dir: Path, name: str) -> bool:
+        """Хардлинки файла и его сжатых вариантов из прошлой версии; False - придется писать заново"""
+        created = []
+        try:
+            for variant in self._variants(name):
+                os.link(previous_dir / variant, version_dir / variant)
+                created.append(version_dir / variant)
+        except OSError:
+            for path in created:
+                path.unlink(missing_ok=True)
+            return False
+        return True
+
+
+def schedule_static_export(request: Request) -> None:
+    """Перепубликовать статический экспорт после изменений в админке (если он включен)"""
+    publisher: Optional[StaticPublisher] = getattr(request.app.state, "static_publisher", None)
+    if publisher is not None:
+        publisher.schedule()
+
+
+async def _main() -> None:
+    from main import app
+
+    # Lifespan поднимает пул, снапшот и кэш - рендерим в них и сразу закрываем
+    async with app.router.lifespan_context(app):
+        settings = app.state.settings.static_export
+        publisher = StaticPublisher(
+            app,
+            settings.directory,
+            keep_versions=settings.keep_versions,
+            spa_index=settings.spa_index,
+        )
+        await publisher.publish()
+
+
+if __name__ == "__main__":
+    asyncio.run(_main())
@@ -18,6 +18,16 @@ class PostgresSettings(BaseSettings):
         frozen = True
 
 
+class ReplicaSettings(BaseSettings):
+    # Реплики для чтения: "host1:5432,host2" (пользователь, пароль и база - как у primary)
+    hosts: str = ""
+    max_lag_seconds: float = 5.0  # Отстает сильнее - чтения уходят на primary
+    health_check_interval_seconds: float = 5.0
+
+    class Config:
+        frozen = True
+
+
 class CloudflareR2Settings(BaseSettings):
     endpoint_url: str  # https://xxx.r2.cloudflarestorage.com
     access_key_id: str
@@ -29,10 +39,112 @@ class CloudflareR2Settings(BaseSettings):
         frozen = True
 
 
+class PoolSettings(BaseSettings):
+    # Сумма size + max_overflow по всем процессам должна влезать в max_connections Postgres
+    size: int = 20
+    max_overflow: int = 10
+    timeout_seconds: float = 10.0  # Сколько ждать свободное соединение, потом ошибка
+    recycle_seconds: int = 1800
+    pre_ping: bool = True
+    warmup_connections: int = 5  # Сколько соединений открыть заранее при старте
+    prepared_statement_cache_size: int = 100
+
+    class Config:
+        frozen = True
+
+
+class SqlStatsSettings(BaseSettings):
+    enabled: bool = True  # Server-Timing + лог числа SQL на каждый запрос
+    n_plus_one_threshold: int = 10  # Одна форма запроса чаще этого за запрос - предупреждение N+1
+    slow_request_ms: float = 200.0  # Запросы с таким временем в БД логируются как warning
+
+    class Config:
+        frozen = True
+
+
+class CacheSettings(BaseSettings):
+    public_ttl_seconds: int = 300  # Страховка на случай правок мимо админки
+    public_stale_seconds: int = 300  # Сколько еще отдаем устаревшую запись, пока она пересчитывается
+    public_max_entries: int = 1024
+    public_max_bytes: int = 32 * 1024 * 1024
+    public_max_age: int = 30  # Cache-Control для браузеров и Caddy
+    public_stale_while_revalidate: int = 300
+    # Сжатие кэшированных ответов: каждый вариант жмется один раз на версию контента
+    compress_min_bytes: int = 1024  # Мелкие ответы не жмем - выигрыша почти нет
+    gzip_level: int = 6
+    brotli_enabled: bool = True
+    brotli_quality: int = 5
+
+    class Config:
+        frozen = True
+
+
+class SnapshotSettings(BaseSettings):
+    reload_interval_seconds: int = 900  # Полная перезагрузка снапшота портфолио
+
+    class Config:
+        frozen = True
+
+
+class ContactSettings(BaseSettings):
+    # Заявки с формы пишутся пачками в фоне; при падении процесса неотписанная очередь теряется
+    write_behind: bool = False
+    queue_size: int = 1000  # Переполнение -> прямая запись в БД
+    batch_size: int = 100
+    flush_interval_seconds: float = 0.5
+
+    class Config:
+        frozen = True
+
+
+class ServiceRequestSettings(BaseSettings):
+    # service_requests разбита на месячные партиции по created_at
+    partitions_ahead_months: int = 3  # Сколько будущих месяцев держать созданными заранее
+    archive_after_months: int = 24  # Старше - в service_requests_archive; 0 - не архивировать
+    maintenance_interval_seconds: int = 6 * 3600
+    admin_recent_months: int = 6  # Админский список и статистика по умолчанию - только за этот период
+
+    class Config:
+        frozen = True
+
+
+class RateLimitSettings(BaseSettings):
+    enabled: bool = True
+    max_keys: int = 10000  # Сколько пар (маршрут, IP) помним одновременно
+    login_burst: int = 5
+    login_per_minute: int = 10
+    contact_burst: int = 3
+    contact_per_minute: int = 5
+
+    class Config:
+        frozen = True
+
+
+class StaticExportSettings(BaseSettings):
+    # Публичные ответы пишутся JSON-файлами, которые Caddy отдает без Python
+    enabled: bool = False
+    directory: str = "/app/static_export"
+    keep_versions: int = 3
+    debounce_seconds: float = 1.0  # Пачка правок в админке -> одна публикация
+    spa_index: str = "/app/frontend/index.html"  # Шаблон для пререндера страниц (build публичного фронта)
+
+    class Config:
+        frozen = True
+
+
 class Settings(BaseSettings):
     model_config = SettingsConfigDict()
     psql: PostgresSettings = PostgresSettings(_env_prefix="PSQL_")
+    psql_replica: ReplicaSettings = ReplicaSettings(_env_prefix="PSQL_REPLICA_")
     r2: CloudflareR2Settings = CloudflareR2Settings(_env_prefix="R2_")
+    pool: PoolSettings = PoolSettings(_env_prefix="DB_POOL_")
+    sql_stats: SqlStatsSettings = SqlStatsSettings(_env_prefix="SQL_STATS_")
+    cache: CacheSettings = CacheSettings(_env_prefix="CACHE_")
+    snapshot: SnapshotSettings = SnapshotSettings(_env_prefix="SNAPSHOT_")
+    contact: ContactSettings = ContactSettings(_env_prefix="CONTACT_")
+    service_requests: ServiceRequestSettings = ServiceRequestSettings(_env_prefix="SERVICE_REQUESTS_")
+    rate_limit: RateLimitSettings = RateLimitSettings(_env_prefix="RATE_LIMIT_")
+    static_export: StaticExportSettings = StaticExportSettings(_env_prefix="STATIC_EXPORT_")
     secret_key: SecretStr = SecretStr("your-super-secret-key-change-in-production")
     algorithm: str = "HS256"
     access_token_expire_hours: int = 24
@@ -48,4 +160,11 @@ class Settings(BaseSettings):
             host=self.psql.host,
             port=self.psql.port,
             database=self.psql.db,
-        )
\ No newline at end of file
+        )
+
+    def replica_dsns(self) -> list[URL]:
+        dsns = []
+        for item in filter(None, (host.strip() for host in self.psql_replica.hosts.split(","))):
+            host, _, port = item.partition(":")
+            dsns.append(self.psql_dsn().set(host=host, port=int(port) if port else self.psql.port))
+        return dsns
@@ -2,6 +2,7 @@ from .base import Base, close_db, create_db_session_pool
 from .models import (
     DBProjectModel,
     DBServiceRequestModel,
+    DBServiceRequestArchiveModel,
     DBTechnologyModel,
     DBDeveloperModel,
     DBUserModel,
@@ -14,6 +15,7 @@ __all__ = (  # noqa: RUF022
     "create_db_session_pool",
     "DBProjectModel",
     "DBServiceRequestModel",
+    "DBServiceRequestArchiveModel",
     "DBTechnologyModel",
     "DBDeveloperModel",
     "DBUserModel",
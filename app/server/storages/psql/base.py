@@ -1,11 +1,17 @@
 from __future__ import annotations
 
+import asyncio
 import contextlib
 from typing import TYPE_CHECKING
 
+from sqlalchemy import URL
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
 
+from storages.psql.instrumentation import instrument_engine
+from storages.psql.pool import InstrumentedAsyncPool
+from storages.psql.replicas import Replica
+
 if TYPE_CHECKING:
     from app.server.settings import Settings
 
@@ -18,12 +24,52 @@ class Base(DeclarativeBase):
         return f"{self.__tablename__}({values})"
 
 
+def _create_engine(settings: Settings, dsn: URL) -> AsyncEngine:
+    pool = settings.pool
+    dsn = dsn.update_query_dict({"prepared_statement_cache_size": str(pool.prepared_statement_cache_size)})
+    engine = create_async_engine(
+        dsn,
+        poolclass=InstrumentedAsyncPool,
+        pool_size=pool.size,
+        max_overflow=pool.max_overflow,
+        pool_timeout=pool.timeout_seconds,
+        pool_recycle=pool.recycle_seconds,
+        pool_pre_ping=pool.pre_ping,
+    )
+    # Счетчики SQL на запрос (SqlStatsMiddleware); без активного сбора - почти бесплатно
+    instrument_engine(engine)
+    return engine
+
+
 async def create_db_session_pool(settings: Settings) -> tuple[AsyncEngine, async_sessionmaker[AsyncSession]]:
-    engine: AsyncEngine = create_async_engine(settings.psql_dsn(), max_overflow=10, pool_size=100)
+    engine = _create_engine(settings, settings.psql_dsn())
     sessionmaker = async_sessionmaker(engine, expire_on_commit=False)
     return engine, sessionmaker
 
 
+def create_replica_session_pools(settings: Settings) -> list[Replica]:
+    """Движки реплик для чтения (PSQL_REPLICA_HOSTS); соединения открываются лениво"""
+    replicas = []
+    for dsn in settings.replica_dsns():
+        engine = _create_engine(settings, dsn)
+        replicas.append(Replica(
+            name=f"{dsn.host}:{dsn.port}",
+            engine=engine,
+            sessionmaker=async_sessionmaker(engine, expire_on_commit=False),
+        ))
+    return replicas
+
+
+async def warm_up_pool(engine: AsyncEngine, connections: int) -> int:
+    """Открывает connections соединений разом и возвращает их в пул - первые запросы не ждут connect"""
+    connections = min(connections, engine.pool.size())
+    if connections <= 0:
+        return 0
+    opened = await asyncio.gather(*(engine.connect().start() for _ in range(connections)))
+    await asyncio.gather(*(connection.close() for connection in opened))
+    return len(opened)
+
+
 async def close_db(engine: AsyncEngine) -> None:
     with contextlib.suppress(Exception):
         await engine.dispose()
@@ -0,0 +1,163 @@
+# app/server/storages/psql/db_scripts/check_indexes.py
+"""
+Проверка, что горячие запросы действительно могут идти по индексам.
+
+Для каждой формы запроса (такой же, какую строят роутеры и снапшот) делаем
+EXPLAIN и ищем в плане ожидаемый индекс. Seq scan на время проверки выключен:
+на маленьких таблицах планировщик честно выбирает его, а нам важно, что индекс
+подходит под форму запроса, а не что он выгоден прямо сейчас.
+
+Дополнительно ищем INVALID индексы - их оставляет упавший CREATE INDEX CONCURRENTLY.
+
+Запуск (из app/server или в контейнере server):
+    python -m storages.psql.db_scripts.check_indexes
+"""
+import asyncio
+import json
+import logging
+import sys
+
+from sqlalchemy import literal_column, select, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from services.project_search import search_condition
+from settings import Settings
+from storages.psql.base import close_db, create_db_session_pool
+from storages.psql.models.developer_model import DBDeveloperModel
+from storages.psql.models.project_model import DBProjectModel, project_developers
+from storages.psql.models.project_photo_model import DBProjectPhotoModel
+from storages.psql.models.service_request_model import DBServiceRequestModel
+
+logger = logging.getLogger(__name__)
+
+# (описание, запрос, индекс, который должен быть в плане).
+# JSONB-константы - через literal_column: literal_binds не умеет рендерить JSONB-параметры
+QUERY_SHAPES = [
+    (
+        "public projects list (keyset)",
+        select(DBProjectModel.id)
+        .where(DBProjectModel.status == "active")
+        .order_by(DBProjectModel.created_at.desc(), DBProjectModel.id.desc())
+        .limit(20),
+        "ix_projects_status_created_at_id",
+    ),
+    (
+        "featured projects",
+        select(DBProjectModel.id).where(DBProjectModel.status == "active", DBProjectModel.featured == True),
+        "ix_projects_status_featured",
+    ),
+    (
+        "projects by category",
+        select(DBProjectModel.id).where(DBProjectModel.category == "web"),
+        "ix_projects_category",
+    ),
+    (
+        "projects full-text search",
+        select(DBProjectModel.id).where(search_condition("react")),
+        "ix_projects_search_vector",
+    ),
+    (
+        "admin service requests list",
+        select(DBServiceRequestModel.id)
+        .where(DBServiceRequestModel.status == "new", DBServiceRequestModel.priority == "high")
+        .order_by(DBServiceRequestModel.created_at.desc())
+        .limit(25),
+        "ix_service_requests_status_priority_created_at",
+    ),
+    (
+        "project photos in order",
+        select(DBProjectPhotoModel.photo_url)
+        .where(DBProjectPhotoModel.project_id.in_([1, 2, 3]))
+        .order_by(DBProjectPhotoModel.project_id, DBProjectPhotoModel.order_index),
+        "ix_project_photos_project_id_order_index",
+    ),
+    (
+        "projects of a developer",
+        select(project_developers.c.project_id).where(project_developers.c.developer_id == 1),
+        "ix_project_developers_developer_id",
+    ),
+    (
+        "developers by skill",
+        select(DBDeveloperModel.id).where(DBDeveloperModel.skills.contains(literal_column("""'["React"]'::jsonb"""))),
+        "ix_developers_skills",
+    ),
+    (
+        "admin service requests by requirements",
+        select(DBServiceRequestModel.id).where(DBServiceRequestModel.requirements.contains(
+            literal_column("""'{"design": true}'::jsonb""")
+        )),
+        "ix_service_requests_requirements",
+    ),
+]
+
+INVALID_INDEXES_QUERY = text(
+    """
+    SELECT c.relname
+    FROM pg_index i
+    JOIN pg_class c ON c.oid = i.indexrelid
+    WHERE NOT i.indisvalid
+    """
+)
+
+# Индексы партиций (service_requests_yYYYYmMM_..._idx) -> индекс на родительской таблице
+PARENT_INDEXES_QUERY = text(
+    """
+    SELECT parent.relname
+    FROM pg_inherits i
+    JOIN pg_class child ON child.oid = i.inhrelid
+    JOIN pg_class parent ON parent.oid = i.inhparent
+    WHERE child.relkind = 'i' AND child.relname = ANY(:names)
+    """
+)
+
+
+def _plan_indexes(plan: dict) -> set[str]:
+    """Все индексы, которые встречаются в узлах плана"""
+    names = {plan["Index Name"]} if "Index Name" in plan else set()
+    for child in plan.get("Plans", []):
+        names |= _plan_indexes(child)
+    return names
+
+
+async def check_query_shapes(connection: AsyncConnection) -> list[str]:
+    """Формы запросов, для которых ожидаемый индекс не попал в план"""
+    problems = []
+    dialect = postgresql.dialect()
+    for description, query, index_name in QUERY_SHAPES:
+        sql = str(query.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+        # SET LOCAL действует только до конца транзакции (autobegin), rollback ее закрывает
+        await connection.execute(text("SET LOCAL enable_seqscan = off"))
+        raw = (await connection.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"))).scalar_one()
+        await connection.rollback()
+
+        plan = (json.loads(raw) if isinstance(raw, str) else raw)[0]["Plan"]
+        used = _plan_indexes(plan)
+        if used:
+            used |= set((await connection.execute(PARENT_INDEXES_QUERY, {"names": list(used)})).scalars())
+        if index_name in used:
+            logger.info(f"✅ {description}: {index_name}")
+        else:
+            logger.error(f"❌ {description}: expected {index_name}, plan uses {sorted(used) or 'no indexes'}")
+            problems.append(description)
+    return problems
+
+
+async def main() -> int:
+    settings = Settings()
+    engine, _ = await create_db_session_pool(settings)
+    try:
+        async with engine.connect() as connection:
+            problems = await check_query_shapes(connection)
+            invalid = list((await connection.execute(INVALID_INDEXES_QUERY)).scalars())
+    finally:
+        await close_db(engine)
+
+    for name in invalid:
+        logger.error(f"❌ Index {name} is INVALID (failed CREATE INDEX CONCURRENTLY?) - drop it and rerun the migration")
+    return 1 if problems or invalid else 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    sys.exit(asyncio.run(main()))
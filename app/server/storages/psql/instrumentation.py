@@ -0,0 +1,88 @@
+# app/server/storages/psql/instrumentation.py
+"""
+Статистика SQL в рамках одного запроса: сколько выражений, сколько времени в БД,
+самое медленное и сколько раз повторялась каждая "форма" запроса (для поиска N+1).
+
+События движка пишут в QueryStats текущего контекста (contextvar). Вне запроса
+(снапшот, фоновые задачи) статистика не собирается - обработчики сразу выходят.
+"""
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+# asyncpg-диалект дописывает к плейсхолдерам приведение типа: $1::INTEGER,
+# $2::TIMESTAMP WITHOUT TIME ZONE, $3::NUMERIC(10, 2), $4::INTEGER[]
+_CAST = r"(?:::\w+(?: WITH(?:OUT)? TIME ZONE)?(?:\(\d+(?:\s*,\s*\d+)*\))?(?:\[\])*)?"
+_PARAM = rf"(?:\$\d+|%\(\w+\)s|\?){_CAST}"
+# Списки параметров разной длины (IN ($1, $2, ...)) - это одна и та же форма запроса
+_PARAM_LIST_RE = re.compile(rf"\(\s*{_PARAM}(?:\s*,\s*{_PARAM})*\s*\)")
+_PARAM_RE = re.compile(rf"(?:\$\d+|%\(\w+\)s){_CAST}")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    shape = _PARAM_LIST_RE.sub("(?)", statement)
+    shape = _PARAM_RE.sub("?", shape)
+    return _SPACE_RE.sub(" ", shape).strip()
+
+
+@dataclass(slots=True)
+class QueryStats:
+    count: int = 0
+    total_ms: float = 0.0
+    slowest_ms: float = 0.0
+    slowest_statement: Optional[str] = None
+    shapes: Counter = field(default_factory=Counter)
+
+    def add(self, statement: str, elapsed_ms: float) -> None:
+        self.count += 1
+        self.total_ms += elapsed_ms
+        if elapsed_ms > self.slowest_ms:
+            self.slowest_ms, self.slowest_statement = elapsed_ms, statement
+        self.shapes[statement_shape(statement)] += 1
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Формы, выполненные больше threshold раз, - кандидаты в N+1"""
+        return [(shape, count) for shape, count in self.shapes.most_common() if count > threshold]
+
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("sql_query_stats", default=None)
+
+
+def start_query_stats() -> QueryStats:
+    """Начинает сбор для текущего контекста (задачи, порожденные дальше, пишут туда же)"""
+    stats = QueryStats()
+    _current_stats.set(stats)
+    return stats
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_stats.get() is not None:
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats.get()
+    started = conn.info.get("query_started")
+    if stats is None or not started:
+        return
+    stats.add(statement, (time.perf_counter() - started.pop()) * 1000)
+
+
+def _handle_error(exception_context):
+    # Упавшее выражение не доходит до after_cursor_execute - снимаем его отметку времени
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_started"):
+        conn.info["query_started"].pop()
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine.sync_engine, "handle_error", _handle_error)
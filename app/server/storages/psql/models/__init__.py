@@ -1,6 +1,7 @@
 from .developer_model import DBDeveloperModel
 from .technology_model import DBTechnologyModel
 from .service_request_model import DBServiceRequestModel
+from .service_request_archive_model import DBServiceRequestArchiveModel
 from .project_model import DBProjectModel
 from .user_model import DBUserModel
 from .project_photo_model import DBProjectPhotoModel
@@ -10,6 +11,7 @@ __all__ = (
     "DBDeveloperModel",
     "DBTechnologyModel",
     "DBServiceRequestModel",
+    "DBServiceRequestArchiveModel",
     "DBProjectModel",
     "DBUserModel",
     "DBProjectPhotoModel",
@@ -1,11 +1,16 @@
 # app/server/storages/psql/models/developer_model.py
 from datetime import datetime
-from sqlalchemy import DateTime, Integer, String, Text, Boolean, JSON
+from sqlalchemy import DateTime, Integer, String, Text, Boolean, Index
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from storages.psql.base import Base
 
 class DBDeveloperModel(Base):
     __tablename__ = "developers"
+    __table_args__ = (
+        # Фильтр по навыку: skills @> '["React"]'
+        Index("ix_developers_skills", "skills", postgresql_using="gin", postgresql_ops={"skills": "jsonb_path_ops"}),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     name: Mapped[str] = mapped_column(String(100), nullable=False)
@@ -17,7 +22,7 @@ class DBDeveloperModel(Base):
     portfolio_url: Mapped[str] = mapped_column(String(255), nullable=True)
     years_experience: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
     hourly_rate: Mapped[int] = mapped_column(Integer, nullable=True)
-    skills: Mapped[list] = mapped_column(JSON, nullable=True)
+    skills: Mapped[list] = mapped_column(JSONB, nullable=True)
     specialization: Mapped[str] = mapped_column(String(100), nullable=False, default="Full-Stack Developer")
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
     order_priority: Mapped[int] = mapped_column(Integer, default=0, nullable=True)  # Новое поле: порядок (меньше — выше)
@@ -1,20 +1,43 @@
 # ОБНОВИ app/server/storages/psql/models/project_model.py
 
 from datetime import datetime
-from sqlalchemy import DateTime, Integer, String, Text, Boolean, ForeignKey, Table, Column
+from sqlalchemy import DateTime, Integer, String, Text, Boolean, ForeignKey, Table, Column, Index, Computed
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from storages.psql.base import Base
 
+# Конфигурация полнотекстового поиска (контент сайта на английском)
+SEARCH_CONFIG = "english"
+
+# Заголовок весит больше всего, потом короткое описание, потом полное
+SEARCH_VECTOR_EXPRESSION = (
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(short_description, '')), 'B') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(description, '')), 'C')"
+)
+
 # Промежуточная таблица для связи many-to-many между проектами и разработчиками
 project_developers = Table(
     'project_developers',
     Base.metadata,
-    Column('project_id', Integer, ForeignKey('projects.id'), primary_key=True),
-    Column('developer_id', Integer, ForeignKey('developers.id'), primary_key=True)
+    Column('project_id', Integer, ForeignKey('projects.id', ondelete='CASCADE'), primary_key=True),
+    Column('developer_id', Integer, ForeignKey('developers.id', ondelete='CASCADE'), primary_key=True),
+    # PK (project_id, developer_id) не помогает искать проекты разработчика
+    Index('ix_project_developers_developer_id', 'developer_id'),
 )
 
 class DBProjectModel(Base):
     __tablename__ = "projects"
+    __table_args__ = (
+        # Keyset-пагинация публичного списка: WHERE status = ... ORDER BY created_at DESC, id DESC
+        Index("ix_projects_status_created_at_id", "status", "created_at", "id"),
+        # Избранные среди активных: WHERE status = ... AND featured
+        Index("ix_projects_status_featured", "status", "featured"),
+        # Фильтр по категории в админке и публичном списке
+        Index("ix_projects_category", "category"),
+        # Полнотекстовый поиск: search_vector @@ websearch_to_tsquery(...)
+        Index("ix_projects_search_vector", "search_vector", postgresql_using="gin"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     title: Mapped[str] = mapped_column(String(200), nullable=False)
@@ -35,6 +58,14 @@ class DBProjectModel(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
+    # Генерируется самим Postgres, в обычных выборках не нужен - поэтому deferred
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed(SEARCH_VECTOR_EXPRESSION, persisted=True),
+        nullable=True,
+        deferred=True
+    )
+
     # Связь many-to-many с разработчиками
     developers: Mapped[list["DBDeveloperModel"]] = relationship(
         "DBDeveloperModel",
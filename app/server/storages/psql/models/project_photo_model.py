@@ -1,12 +1,16 @@
 # СОЗДАЙ НОВЫЙ ФАЙЛ: app/server/storages/psql/models/project_photo_model.py
 
 from datetime import datetime
-from sqlalchemy import DateTime, Integer, String, ForeignKey
+from sqlalchemy import DateTime, Integer, String, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from storages.psql.base import Base
 
 class DBProjectPhotoModel(Base):
     __tablename__ = "project_photos"
+    __table_args__ = (
+        # Фотки проекта по порядку: WHERE project_id IN (...) ORDER BY project_id, order_index
+        Index("ix_project_photos_project_id_order_index", "project_id", "order_index"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     project_id: Mapped[int] = mapped_column(Integer, ForeignKey('projects.id', ondelete='CASCADE'), nullable=False)
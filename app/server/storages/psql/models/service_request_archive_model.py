@@ -0,0 +1,28 @@
+from datetime import datetime
+from sqlalchemy import DateTime, Integer, String, Text, func
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+from storages.psql.base import Base
+
+class DBServiceRequestArchiveModel(Base):
+    """Заявки из отсоединенных старых партиций (пишет storages.psql.partitions, только чтение)"""
+    __tablename__ = "service_requests_archive"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    client_name: Mapped[str] = mapped_column(String(100), nullable=False)
+    client_email: Mapped[str] = mapped_column(String(255), nullable=False)
+    client_phone: Mapped[str] = mapped_column(String(50), nullable=True)
+    company_name: Mapped[str] = mapped_column(String(100), nullable=True)
+    project_type: Mapped[str] = mapped_column(String(50), nullable=False)
+    budget_range: Mapped[str] = mapped_column(String(50), nullable=True)
+    timeline: Mapped[str] = mapped_column(String(100), nullable=True)
+    description: Mapped[str] = mapped_column(Text, nullable=False)
+    requirements: Mapped[dict] = mapped_column(JSONB, nullable=True)
+    status: Mapped[str] = mapped_column(String(50), nullable=False)
+    priority: Mapped[str] = mapped_column(String(20), nullable=False)
+    # Без FK: разработчика могли удалить уже после архивации
+    developer_id: Mapped[int] = mapped_column(Integer, nullable=True)
+    notes: Mapped[str] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, primary_key=True)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    archived_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), nullable=False)
@@ -1,10 +1,26 @@
 from datetime import datetime
-from sqlalchemy import DateTime, Integer, String, Text, JSON, ForeignKey
+from sqlalchemy import DateTime, Integer, String, Text, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 from storages.psql.base import Base
 
 class DBServiceRequestModel(Base):
     __tablename__ = "service_requests"
+    __table_args__ = (
+        # Админский список: фильтры по статусу/приоритету, новые сверху
+        Index("ix_service_requests_status_priority_created_at", "status", "priority", "created_at"),
+        # Фильтр по требованиям: requirements @> '{"key": value}'
+        Index(
+            "ix_service_requests_requirements",
+            "requirements",
+            postgresql_using="gin",
+            postgresql_ops={"requirements": "jsonb_path_ops"}
+        ),
+        # Без фильтров админка сортирует по created_at
+        Index("ix_service_requests_created_at", "created_at"),
+        # Месячные партиции service_requests_yYYYYmMM создает storages.psql.partitions
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     client_name: Mapped[str] = mapped_column(String(100), nullable=False)
@@ -15,12 +31,13 @@ class DBServiceRequestModel(Base):
     budget_range: Mapped[str] = mapped_column(String(50), nullable=True)
     timeline: Mapped[str] = mapped_column(String(100), nullable=True)
     description: Mapped[str] = mapped_column(Text, nullable=False)
-    requirements: Mapped[dict] = mapped_column(JSON, nullable=True)
+    requirements: Mapped[dict] = mapped_column(JSONB, nullable=True)
     status: Mapped[str] = mapped_column(String(50), default="new", nullable=False)
     priority: Mapped[str] = mapped_column(String(20), default="medium", nullable=False)
-    developer_id: Mapped[int] = mapped_column(Integer, ForeignKey('developers.id'), nullable=True)
+    developer_id: Mapped[int] = mapped_column(Integer, ForeignKey('developers.id', ondelete='SET NULL'), nullable=True)
     notes: Mapped[str] = mapped_column(Text, nullable=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    # Ключ партиционирования обязан входить в PK
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, primary_key=True)
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
     def __repr__(self) -> str:
@@ -0,0 +1,211 @@
+# app/server/storages/psql/partitions.py
+"""
+Обслуживание месячных партиций service_requests (RANGE по created_at).
+
+- ensure_partitions: создает партиции на текущий и months_ahead следующих месяцев.
+  Если обслуживание отстало, заявки без своей партиции попадают в DEFAULT-партицию
+  (service_requests_default) - для их месяцев партиции тоже создаются, а строки
+  переезжают в них из DEFAULT;
+- archive_partitions: партиции старше archive_after_months отсоединяются
+  (DETACH ... CONCURRENTLY, без блокировки записи), их строки переезжают
+  в service_requests_archive, а сама партиция удаляется.
+
+Каждый шаг идемпотентен: если архивация упала после DETACH, отсоединенная
+таблица будет доархивирована при следующем запуске.
+
+Запуск вручную (из app/server или в контейнере server):
+    python -m storages.psql.partitions
+"""
+import asyncio
+import logging
+import re
+from datetime import date, datetime
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+PARENT_TABLE = "service_requests"
+ARCHIVE_TABLE = "service_requests_archive"
+DEFAULT_PARTITION = f"{PARENT_TABLE}_default"
+PARTITION_NAME_RE = re.compile(rf"^{PARENT_TABLE}_y(\d{{4}})m(\d{{2}})$")
+
+COLUMNS = (
+    "id, client_name, client_email, client_phone, company_name, project_type, budget_range, timeline, "
+    "description, requirements, status, priority, developer_id, notes, created_at, updated_at"
+)
+
+_PARTITION_TABLES_QUERY = text(
+    """
+    SELECT c.relname, c.relispartition
+    FROM pg_class c
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    WHERE n.nspname = current_schema() AND c.relkind = 'r' AND c.relname ~ :pattern
+    """
+)
+
+
+_DEFAULT_MONTHS_QUERY = text(
+    f"SELECT DISTINCT date_trunc('month', created_at)::date AS month FROM {DEFAULT_PARTITION}"
+)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def month_start(moment: Optional[datetime] = None) -> date:
+    moment = moment or datetime.utcnow()
+    return date(moment.year, moment.month, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{PARENT_TABLE}_y{month.year:04d}m{month.month:02d}"
+
+
+def partition_month(name: str) -> Optional[date]:
+    match = PARTITION_NAME_RE.match(name)
+    return date(int(match.group(1)), int(match.group(2)), 1) if match else None
+
+
+def is_partition_table(name: str) -> bool:
+    """Таблицы, которые ведет этот модуль, а не модели (alembic их не трогает)"""
+    return name == DEFAULT_PARTITION or PARTITION_NAME_RE.match(name) is not None
+
+
+def partition_statements(month: date) -> list[str]:
+    """
+    Создание партиции месяца с переносом его строк из DEFAULT-партиции.
+
+    CREATE ... PARTITION OF упал бы, если в DEFAULT уже есть строки этого месяца,
+    поэтому таблица создается отдельно, строки переезжают в нее и только потом
+    она присоединяется. DEFAULT блокируется первым, чтобы новые строки месяца
+    не успели в нее попасть между переносом и ATTACH. Выполнять в одной транзакции.
+    """
+    name = partition_name(month)
+    start, end = month.isoformat(), add_months(month, 1).isoformat()
+    return [
+        f"LOCK TABLE {DEFAULT_PARTITION} IN ACCESS EXCLUSIVE MODE",
+        f"CREATE TABLE {name} (LIKE {PARENT_TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)",
+        f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} "
+        f"WHERE created_at >= '{start}' AND created_at < '{end}' RETURNING {COLUMNS}) "
+        f"INSERT INTO {name} ({COLUMNS}) SELECT {COLUMNS} FROM moved",
+        f"ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {name} FOR VALUES FROM ('{start}') TO ('{end}')",
+    ]
+
+
+async def _default_partition_months(engine: AsyncEngine) -> set[date]:
+    """Месяцы, строки которых лежат в DEFAULT-партиции (обслуживание отстало)"""
+    async with engine.connect() as connection:
+        return {row.month for row in await connection.execute(_DEFAULT_MONTHS_QUERY)}
+
+
+async def _partition_tables(engine: AsyncEngine) -> dict[str, bool]:
+    """Имя таблицы-партиции -> присоединена ли она сейчас к service_requests"""
+    async with engine.connect() as connection:
+        rows = await connection.execute(_PARTITION_TABLES_QUERY, {"pattern": PARTITION_NAME_RE.pattern})
+        return {row.relname: row.relispartition for row in rows}
+
+
+async def ensure_partitions(engine: AsyncEngine, months_ahead: int = 3) -> list[str]:
+    """
+    Создает недостающие партиции с текущего месяца по +months_ahead и для месяцев,
+    застрявших в DEFAULT-партиции; возвращает созданные
+    """
+    existing = await _partition_tables(engine)
+    current = month_start()
+    months = {add_months(current, offset) for offset in range(months_ahead + 1)}
+    months |= await _default_partition_months(engine)
+
+    created = []
+    for month in sorted(months):
+        name = partition_name(month)
+        if name in existing:
+            continue
+        # Каждый месяц - своя транзакция: блокировка DEFAULT держится недолго
+        async with engine.begin() as connection:
+            for statement in partition_statements(month):
+                await connection.execute(text(statement))
+        created.append(name)
+    if created:
+        logger.info(f"🗂️ Created service_requests partitions: {', '.join(created)}")
+    return created
+
+
+async def archive_partitions(engine: AsyncEngine, archive_after_months: int) -> list[str]:
+    """Переносит в архив партиции, целиком старше archive_after_months месяцев; 0 - архивация выключена"""
+    if archive_after_months <= 0:
+        return []
+    cutoff = add_months(month_start(), -archive_after_months)
+    tables = await _partition_tables(engine)
+    old = sorted(name for name in tables if partition_month(name) < cutoff)
+
+    archived = []
+    for name in old:
+        try:
+            if tables[name]:
+                # CONCURRENTLY нельзя внутри транзакции
+                autocommit = engine.execution_options(isolation_level="AUTOCOMMIT")
+                async with autocommit.connect() as connection:
+                    try:
+                        await connection.execute(
+                            text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name} CONCURRENTLY")
+                        )
+                    except DBAPIError as e:
+                        # Прошлый DETACH CONCURRENTLY прервали на середине - доводим его
+                        if "pending detach" not in str(e):
+                            raise
+                        await connection.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name} FINALIZE"))
+
+            async with engine.begin() as connection:
+                await connection.execute(text(
+                    f"INSERT INTO {ARCHIVE_TABLE} ({COLUMNS}) SELECT {COLUMNS} FROM {name} "
+                    f"ON CONFLICT DO NOTHING"
+                ))
+                await connection.execute(text(f"DROP TABLE {name}"))
+        except Exception as e:
+            logger.error(f"❌ Failed to archive partition {name}: {e}")
+            continue
+        archived.append(name)
+
+    if archived:
+        logger.info(f"🗄️ Archived service_requests partitions: {', '.join(archived)}")
+    return archived
+
+
+async def run_partition_maintenance(
+        engine: AsyncEngine,
+        months_ahead: int,
+        archive_after_months: int,
+        interval_seconds: float
+) -> None:
+    """Фоновая задача: раз в interval_seconds создает будущие партиции и архивирует старые"""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await ensure_partitions(engine, months_ahead)
+            await archive_partitions(engine, archive_after_months)
+        except Exception as e:
+            logger.error(f"❌ Partition maintenance failed: {e}")
+
+
+async def _main() -> None:
+    from settings import Settings
+    from storages.psql.base import close_db, create_db_session_pool
+
+    settings = Settings()
+    engine, _ = await create_db_session_pool(settings)
+    try:
+        await ensure_partitions(engine, settings.service_requests.partitions_ahead_months)
+        await archive_partitions(engine, settings.service_requests.archive_after_months)
+    finally:
+        await close_db(engine)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    asyncio.run(_main())
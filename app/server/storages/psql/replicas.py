@@ -0,0 +1,131 @@
+import asyncio
+import itertools
+import logging
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+logger = logging.getLogger(__name__)
+
+# Состояние реплики: в recovery ли сервер, есть ли WAL receiver и отставание в секундах.
+# 0 - только если receiver стримит и все принятое WAL проиграно (на простаивающем мастере
+# replay_timestamp старый, но это не отставание). Иначе - возраст последней проигранной
+# транзакции: у отвалившегося receiver он растет, а не застывает на 0.
+# Без pg_read_all_stats status в pg_stat_wal_receiver - NULL, и отставание всегда считается
+# по времени: на простаивающем мастере реплика уйдет в unhealthy (чтения - на primary).
+REPLICA_STATUS_QUERY = text(
+    """
+    SELECT
+        pg_is_in_recovery() AS in_recovery,
+        receiver.pid AS receiver_pid,
+        CASE
+            WHEN receiver.status = 'streaming' AND pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+            ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+        END AS lag_seconds
+    FROM (SELECT 1) AS one
+    LEFT JOIN pg_stat_wal_receiver AS receiver ON true
+    """
+)
+
+
+def replica_problem(
+        in_recovery: bool,
+        receiver_pid: Optional[int],
+        lag_seconds: Optional[float],
+        max_lag_seconds: float
+) -> Optional[str]:
+    """Почему с реплики нельзя читать; None - реплика здорова"""
+    if not in_recovery:
+        return "not in recovery (is it a primary?)"
+    if receiver_pid is None:
+        return "WAL receiver is not running"
+    if lag_seconds is None:
+        return "no transactions replayed yet"
+    if lag_seconds > max_lag_seconds:
+        return f"lag {lag_seconds:.1f}s"
+    return None
+
+
+@dataclass(slots=True)
+class Replica:
+    name: str
+    engine: AsyncEngine
+    sessionmaker: async_sessionmaker[AsyncSession]
+    healthy: bool = False
+    lag_seconds: Optional[float] = None
+    error: Optional[str] = None
+
+
+class ReadSessionRouter:
+    """
+    Сессии только для чтения: здоровые реплики по кругу, иначе primary.
+
+    Вызывается так же, как sessionmaker: `async with router() as db: ...`.
+    Реплика считается здоровой, если отвечает, находится в recovery с работающим
+    WAL receiver и отстает не больше max_lag_seconds; пока первая проверка
+    не прошла, все чтения идут в primary.
+    """
+
+    def __init__(
+            self,
+            primary: async_sessionmaker[AsyncSession],
+            replicas: list[Replica],
+            max_lag_seconds: float = 5.0
+    ):
+        self.primary = primary
+        self.replicas = replicas
+        self.max_lag_seconds = max_lag_seconds
+        self._round_robin = itertools.cycle(range(len(replicas))) if replicas else None
+
+    def __call__(self) -> AsyncSession:
+        return self.sessionmaker()()
+
+    def sessionmaker(self) -> async_sessionmaker[AsyncSession]:
+        if self._round_robin is not None:
+            for _ in range(len(self.replicas)):
+                replica = self.replicas[next(self._round_robin)]
+                if replica.healthy:
+                    return replica.sessionmaker
+        return self.primary
+
+    async def check(self) -> None:
+        await asyncio.gather(*(self._check_replica(replica) for replica in self.replicas))
+
+    async def _check_replica(self, replica: Replica) -> None:
+        try:
+            async with replica.engine.connect() as connection:
+                row = (await connection.execute(REPLICA_STATUS_QUERY)).one()
+        except Exception as e:
+            if replica.healthy or replica.error is None:
+                logger.warning(f"⚠️ Replica {replica.name} is down, reads go to primary: {e}")
+            replica.healthy, replica.lag_seconds, replica.error = False, None, str(e)
+            return
+
+        lag = float(row.lag_seconds) if row.lag_seconds is not None else None
+        problem = replica_problem(row.in_recovery, row.receiver_pid, lag, self.max_lag_seconds)
+        healthy = problem is None
+        if healthy != replica.healthy:
+            if healthy:
+                logger.info(f"🔁 Replica {replica.name} is back: lag {lag:.1f}s")
+            else:
+                logger.warning(f"⚠️ Replica {replica.name} is unhealthy, reads go to primary: {problem}")
+        replica.healthy, replica.lag_seconds, replica.error = healthy, lag, problem
+
+    async def run_health_checks(self, interval_seconds: float) -> None:
+        while True:
+            await self.check()
+            await asyncio.sleep(interval_seconds)
+
+    def status(self) -> list[dict]:
+        return [
+            {
+                "name": replica.name,
+                "healthy": replica.healthy,
+                "lag_seconds": replica.lag_seconds,
+                "error": replica.error,
+                "pool": replica.engine.pool.metrics() if hasattr(replica.engine.pool, "metrics") else None,
+            }
+            for replica in self.replicas
+        ]
@@ -0,0 +1,116 @@
+# app/server/tests/conftest.py
+import os
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+# Settings собирает вложенные настройки при импорте - без БД и R2 хватает заглушек
+for name, value in {
+    "PSQL_HOST": "localhost", "PSQL_PORT": "5432", "PSQL_USER": "test", "PSQL_PASSWORD": "test", "PSQL_DB": "test",
+    "R2_ENDPOINT_URL": "https://r2.example", "R2_ACCESS_KEY_ID": "test", "R2_SECRET_ACCESS_KEY": "test",
+    "R2_BUCKET_NAME": "test", "R2_PUBLIC_URL": "https://cdn.example",
+}.items():
+    os.environ.setdefault(name, value)
+
+from routers import public  # noqa: E402
+from services.portfolio_snapshot import DeveloperView, PortfolioSnapshot, ProjectView  # noqa: E402
+from services.response_cache import ResponseCache  # noqa: E402
+from settings import CacheSettings  # noqa: E402
+
+BASE_TIME = datetime(2025, 1, 1, 12, 0, 0, 123456)
+
+
+class FakeClock:
+    """Подменяет time.monotonic - TTL и пополнение ведер проверяются без sleep"""
+
+    def __init__(self, start: float = 1000.0):
+        self.now = start
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    fake = FakeClock()
+    monkeypatch.setattr("time.monotonic", fake)
+    return fake
+
+
+def make_project(project_id: int, created_at: datetime, category: str = "web", featured: bool = False) -> ProjectView:
+    return ProjectView(
+        id=project_id,
+        title=f"Project {project_id}",
+        description=None,
+        short_description=f"short {project_id}",
+        demo_url=None,
+        github_url=None,
+        image_urls=(f"https://cdn.example/{project_id}.jpg",),
+        project_type="saas",
+        category=category,
+        duration_months=None,
+        featured=featured,
+        created_at=created_at,
+        developer_ids=(),
+    )
+
+
+def make_developer(developer_id: int, order_priority=None, skills=None) -> DeveloperView:
+    return DeveloperView(
+        id=developer_id,
+        name=f"Developer {developer_id}",
+        bio=None,
+        avatar_url=None,
+        github_url=None,
+        linkedin_url=None,
+        portfolio_url=None,
+        years_experience=3,
+        skills=skills,
+        specialization="backend",
+        is_active=True,
+        order_priority=order_priority,
+    )
+
+
+@pytest.fixture
+def snapshot() -> PortfolioSnapshot:
+    """
+    20 активных проектов без БД: категории чередуются, а проекты попарно
+    создаются в одну и ту же секунду - порядок внутри пары решает id.
+    """
+    snapshot = PortfolioSnapshot(db_session=None)
+    snapshot.projects = {
+        project_id: make_project(
+            project_id,
+            BASE_TIME + timedelta(seconds=project_id // 2),
+            category="web" if project_id % 3 else "mobile",
+            featured=project_id % 4 == 0,
+        )
+        for project_id in range(1, 21)
+    }
+    snapshot._reindex_projects()
+    snapshot._reindex_developers()
+    snapshot._reindex_technologies()
+    return snapshot
+
+
+@pytest.fixture
+def public_app(snapshot) -> FastAPI:
+    """Публичный роутер со снапшотом и кэшем, без БД и lifespan"""
+    app = FastAPI()
+    app.include_router(public.router, prefix="/api")
+    app.state.settings = SimpleNamespace(cache=CacheSettings())
+    app.state.response_cache = ResponseCache(compress_min_bytes=256)
+    app.state.portfolio_snapshot = snapshot
+    return app
+
+
+@pytest.fixture
+def public_client(public_app) -> TestClient:
+    return TestClient(public_app)
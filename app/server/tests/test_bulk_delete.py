@@ -0,0 +1,77 @@
+# app/server/tests/test_bulk_delete.py
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import asyncpg
+
+from services.bulk_delete import delete_returning, id_in, parse_ids
+from storages.psql.models.project_model import DBProjectModel
+from storages.psql.models.project_photo_model import DBProjectPhotoModel
+
+
+def asyncpg_sql(statement) -> str:
+    return statement.compile(dialect=asyncpg.dialect()).string
+
+
+def test_parse_ids_strips_blanks_and_duplicates():
+    assert parse_ids("3, 1,,3 ,2,") == [3, 1, 2]
+
+
+@pytest.mark.parametrize("ids", ["", " , ", "1,two", "1.5"])
+def test_parse_ids_rejects_garbage(ids):
+    with pytest.raises(HTTPException) as error:
+        parse_ids(ids)
+
+    assert error.value.status_code == 400
+
+
+def test_id_in_binds_the_whole_list_as_one_array():
+    short = select(DBProjectModel.id).where(id_in(DBProjectModel.id, [1]))
+    long = select(DBProjectModel.id).where(id_in(DBProjectModel.id, [1, 2, 3]))
+
+    # Одна и та же форма запроса при любом числе id
+    assert asyncpg_sql(short) == asyncpg_sql(long)
+    assert "projects.id = ANY ($1::INTEGER[])" in asyncpg_sql(long)
+    assert list(long.compile().params.values()) == [[1, 2, 3]]
+
+
+class FakeResult:
+    def all(self):
+        return [(1, "Shop")]
+
+
+class FakeSession:
+    def __init__(self):
+        self.executed = []
+
+    async def execute(self, statement, params=None, execution_options=None):
+        self.executed.append((statement, execution_options))
+        return FakeResult()
+
+
+def test_delete_returning_is_a_single_statement():
+    db = FakeSession()
+
+    rows = asyncio.run(delete_returning(db, DBProjectModel, [1, 2], DBProjectModel.title))
+
+    assert rows == [(1, "Shop")]
+    [(statement, options)] = db.executed
+    assert options == {"synchronize_session": False}
+    assert asyncpg_sql(statement) == (
+        "DELETE FROM projects WHERE projects.id = ANY ($1::INTEGER[]) RETURNING projects.id, projects.title"
+    )
+
+
+def test_delete_returning_can_filter_by_another_column():
+    db = FakeSession()
+
+    asyncio.run(delete_returning(
+        db, DBProjectPhotoModel, [5], DBProjectPhotoModel.photo_url, by=DBProjectPhotoModel.project_id
+    ))
+
+    [(statement, _)] = db.executed
+    sql = asyncpg_sql(statement)
+    assert "WHERE project_photos.project_id = ANY ($1::INTEGER[])" in sql
+    assert sql.endswith("RETURNING project_photos.id, project_photos.photo_url")
@@ -0,0 +1,151 @@
+# app/server/tests/test_contact_ingest.py
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
+import pytest
+
+from routers import public
+from services import contact_ingest
+from services.contact_ingest import ContactIngestor, row_reference, service_request_row
+
+FORM = {
+    "client_name": "Jane Roe",
+    "client_email": "jane@example.com",
+    "project_type": "web",
+    "description": "Landing page",
+}
+
+
+@asynccontextmanager
+async def no_db():
+    yield None
+
+
+@pytest.fixture
+def inserts(monkeypatch) -> list:
+    """Вместо INSERT запоминает пачки; строка с description="bad" роняет запрос"""
+    batches = []
+
+    async def insert_service_requests(db, rows):
+        if any(row["description"] == "bad" for row in rows):
+            raise ValueError("constraint violation")
+        batches.append([row["client_name"] for row in rows])
+        start = sum(len(batch) for batch in batches)
+        return list(range(start - len(rows) + 1, start + 1))
+
+    monkeypatch.setattr(contact_ingest, "insert_service_requests", insert_service_requests)
+    monkeypatch.setattr(public, "insert_service_requests", insert_service_requests)
+    return batches
+
+
+def form(name: str, description: str = "Landing page") -> dict:
+    return service_request_row({**FORM, "client_name": name, "description": description})
+
+
+def test_service_request_row_stamps_defaults():
+    row = service_request_row(FORM)
+
+    assert row["status"] == "new"
+    assert row["priority"] == "medium"
+    assert row["created_at"] == row["updated_at"]
+
+
+def test_row_reference_hides_email():
+    reference = row_reference(FORM)
+
+    assert reference.startswith("email#")
+    assert "jane" not in reference
+    assert reference == row_reference({"client_email": " JANE@example.com "})
+
+
+def test_submit_is_refused_until_started_and_when_full():
+    async def run():
+        ingestor = ContactIngestor(no_db, max_queue=1)
+        assert not ingestor.submit(form("a"))
+
+        ingestor._accepting = True
+        assert ingestor.submit(form("a"))
+        assert not ingestor.submit(form("b"))
+
+    asyncio.run(run())
+
+
+def test_writer_flushes_full_batches_and_partial_ones_on_timeout(inserts):
+    async def run():
+        ingestor = ContactIngestor(no_db, batch_size=2, flush_interval=0.05)
+        ingestor.start()
+        for name in "abc":
+            assert ingestor.submit(form(name))
+        await asyncio.sleep(0.2)
+        await ingestor.stop()
+
+    asyncio.run(run())
+
+    assert inserts == [["a", "b"], ["c"]]
+
+
+def test_stop_drains_the_queue(inserts):
+    async def run():
+        ingestor = ContactIngestor(no_db, batch_size=2, flush_interval=10)
+        ingestor.start()
+        for name in "abcde":
+            ingestor.submit(form(name))
+        await ingestor.stop()
+        assert not ingestor.submit(form("late"))
+
+    asyncio.run(run())
+
+    assert [name for batch in inserts for name in batch] == list("abcde")
+
+
+def test_failed_batch_falls_back_to_single_rows_without_pii(inserts, caplog):
+    async def run():
+        ingestor = ContactIngestor(no_db, batch_size=3)
+        await ingestor._flush([form("a"), form("b", description="bad"), form("c")])
+
+    with caplog.at_level(logging.ERROR, logger="services.contact_ingest"):
+        asyncio.run(run())
+
+    assert inserts == [["a"], ["c"]]
+    [batch_error, row_error] = [record.getMessage() for record in caplog.records]
+    assert "Batch insert of 3 service requests failed" in batch_error
+    assert f"2/3 ({row_reference(FORM)})" in row_error
+    assert "jane@example.com" not in caplog.text
+    assert "Jane" not in caplog.text
+
+
+# Ручка
+
+class QueueingIngestor:
+    def __init__(self):
+        self.rows = []
+
+    def submit(self, row: dict) -> bool:
+        self.rows.append(row)
+        return True
+
+
+def test_contact_form_is_queued_when_ingestor_accepts(public_client, public_app):
+    public_app.state.contact_ingestor = ingestor = QueueingIngestor()
+
+    response = public_client.post("/api/public/contact", json=FORM)
+
+    assert response.status_code == 202
+    assert response.json()["status"] == "queued"
+    assert ingestor.rows[0]["client_email"] == "jane@example.com"
+
+
+def test_contact_form_is_written_directly_without_ingestor(public_client, public_app, inserts):
+    public_app.state.contact_ingestor = None
+    public_app.state.db_session = no_db
+
+    response = public_client.post("/api/public/contact", json=FORM)
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "id": 1,
+        "message": "Thank you for your request! We'll get back to you soon.",
+        "status": "submitted",
+    }
+    assert inserts == [["Jane Roe"]]
@@ -0,0 +1,97 @@
+# app/server/tests/test_cursor_pagination.py
+import pytest
+from fastapi import HTTPException
+
+from routers.public import decode_cursor, encode_cursor
+from tests.conftest import BASE_TIME, make_project
+
+IDENTITY = {"Accept-Encoding": "identity"}
+
+
+def expected_order(snapshot, **filters) -> list:
+    """Эталон: полный список через сортировку, без индексов снапшота"""
+    projects = [
+        project for project in snapshot.projects.values()
+        if all(getattr(project, key) == value for key, value in filters.items())
+    ]
+    return [project.id for project in sorted(projects, key=lambda p: (p.created_at, p.id), reverse=True)]
+
+
+def walk_pages(client, limit: int, **params) -> list[list]:
+    """Проходит все страницы по X-Next-Cursor, возвращает id по страницам"""
+    pages, cursor = [], None
+    while True:
+        query = {**params, "limit": limit}
+        if cursor:
+            query["cursor"] = cursor
+        response = client.get("/api/public/projects", params=query, headers=IDENTITY)
+        assert response.status_code == 200
+        pages.append([project["id"] for project in response.json()])
+        cursor = response.headers.get("x-next-cursor")
+        if cursor is None:
+            return pages
+        assert len(pages) <= 50, "pagination does not terminate"
+
+
+# Курсор
+
+def test_cursor_round_trip_keeps_microseconds():
+    project = make_project(7, BASE_TIME)
+    cursor = encode_cursor(project)
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (BASE_TIME, 7)
+
+
+@pytest.mark.parametrize("cursor", ["not-base64!!", "bm8tc2VwYXJhdG9y", "bm90LWEtZGF0ZXw3"])
+def test_invalid_cursor_is_rejected(cursor):
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(cursor)
+    assert error.value.status_code == 400
+
+
+def test_invalid_cursor_returns_400(public_client):
+    response = public_client.get("/api/public/projects", params={"cursor": "garbage"}, headers=IDENTITY)
+    assert response.status_code == 400
+
+
+# Постраничный обход
+
+def test_pages_cover_all_projects_without_gaps_or_duplicates(public_client, snapshot):
+    pages = walk_pages(public_client, limit=3)
+
+    assert [project_id for page in pages for project_id in page] == expected_order(snapshot)
+    assert all(len(page) == 3 for page in pages[:-1])
+
+
+def test_filtered_pages_follow_filter_order(public_client, snapshot):
+    pages = walk_pages(public_client, limit=3, category="web")
+
+    assert [project_id for page in pages for project_id in page] == expected_order(snapshot, category="web")
+
+
+def test_featured_pages(public_client, snapshot):
+    pages = walk_pages(public_client, limit=2, featured_only="true")
+
+    assert [project_id for page in pages for project_id in page] == expected_order(snapshot, featured=True)
+
+
+def test_last_full_page_has_no_next_cursor(public_client):
+    response = public_client.get("/api/public/projects", params={"limit": 20}, headers=IDENTITY)
+
+    assert len(response.json()) == 20
+    assert "x-next-cursor" not in response.headers
+
+
+def test_find_projects_after_tied_timestamp_uses_id(snapshot):
+    # 10 и 11 созданы в одну секунду: после 11 идет 10, после 10 - уже 9
+    tied = snapshot.projects[11].created_at
+    assert snapshot.projects[10].created_at == tied
+
+    assert [p.id for p in snapshot.find_projects(after=(tied, 11), limit=2)] == [10, 9]
+    assert [p.id for p in snapshot.find_projects(after=(tied, 10), limit=2)] == [9, 8]
+
+
+def test_find_projects_after_last_project_is_empty(snapshot):
+    last = snapshot.projects[1]
+    assert snapshot.find_projects(after=(last.created_at, last.id)) == []
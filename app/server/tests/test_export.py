@@ -0,0 +1,116 @@
+# app/server/tests/test_export.py
+import asyncio
+import csv
+import io
+import json
+import logging
+from contextlib import asynccontextmanager
+from datetime import datetime
+
+import pytest
+from sqlalchemy import select
+
+from services.export import encode_csv, encode_ndjson, export_response, stream_batches
+from storages.psql.models.project_model import DBProjectModel
+
+QUERY = select(DBProjectModel)
+
+ROWS = [
+    {"id": 1, "title": "Shop", "tags": ["a", "b"], "created_at": datetime(2025, 1, 2, 3, 4, 5), "notes": None},
+    {"id": 2, "title": 'Quote " and, comma', "tags": [], "created_at": datetime(2025, 1, 3), "notes": "x"},
+]
+
+
+async def from_batches(*batches):
+    for batch in batches:
+        yield batch
+
+
+async def collect(chunks) -> list:
+    return [chunk async for chunk in chunks]
+
+
+def test_ndjson_is_one_chunk_per_batch():
+    chunks = asyncio.run(collect(encode_ndjson(from_batches(ROWS[:1], ROWS[1:]))))
+
+    assert len(chunks) == 2
+    lines = b"".join(chunks).decode().splitlines()
+    assert [json.loads(line)["id"] for line in lines] == [1, 2]
+    assert json.loads(lines[0])["created_at"] == "2025-01-02T03:04:05"
+
+
+def test_csv_writes_header_once_and_json_cells():
+    chunks = asyncio.run(collect(encode_csv(from_batches(ROWS[:1], ROWS[1:]))))
+
+    assert len(chunks) == 2
+    assert chunks[1].startswith(b"2,")
+    header, first, second = list(csv.reader(io.StringIO(b"".join(chunks).decode())))
+    assert header == ["id", "title", "tags", "created_at", "notes"]
+    assert first == ["1", "Shop", '["a","b"]', "2025-01-02T03:04:05", ""]
+    assert second[1] == 'Quote " and, comma'
+
+
+def test_csv_of_nothing_is_empty():
+    assert b"".join(asyncio.run(collect(encode_csv(from_batches([]))))) == b""
+
+
+class FakeStreamResult:
+    def __init__(self, objects: list, batch_size: int):
+        self.objects = objects
+        self.batch_size = batch_size
+
+    def scalars(self):
+        return self
+
+    async def partitions(self):
+        for start in range(0, len(self.objects), self.batch_size):
+            yield self.objects[start:start + self.batch_size]
+
+
+def stream_session(objects: list, executed: list, fail: bool = False):
+    """db_session с серверным курсором поверх списка"""
+    class Session:
+        async def stream(self, query):
+            executed.append(query)
+            if fail:
+                raise RuntimeError("connection lost")
+            return FakeStreamResult(objects, query.get_execution_options()["yield_per"])
+
+    @asynccontextmanager
+    async def session():
+        yield Session()
+
+    return session
+
+
+def test_stream_batches_reads_with_yield_per():
+    executed = []
+    session = stream_session(list(range(5)), executed)
+
+    batches = asyncio.run(collect(stream_batches(session, QUERY, lambda obj: {"id": obj}, batch_size=2)))
+
+    assert batches == [[{"id": 0}, {"id": 1}], [{"id": 2}, {"id": 3}], [{"id": 4}]]
+    assert executed[0].get_execution_options()["yield_per"] == 2
+
+
+def test_export_response_streams_attachment():
+    session = stream_session([1, 2, 3], [])
+
+    response = export_response(session, QUERY, lambda obj: {"id": obj}, "csv", "projects", batch_size=2)
+    body = b"".join(asyncio.run(collect(response.body_iterator)))
+
+    assert response.media_type == "text/csv; charset=utf-8"
+    disposition = response.headers["content-disposition"]
+    assert disposition.startswith('attachment; filename="projects-') and disposition.endswith('.csv"')
+    assert body.decode().splitlines() == ["id", "1", "2", "3"]
+
+
+def test_failed_export_is_logged_and_aborted(caplog):
+    session = stream_session([], [], fail=True)
+    response = export_response(session, QUERY, lambda obj: {"id": obj}, "ndjson", "projects")
+
+    with caplog.at_level(logging.ERROR, logger="services.export"), pytest.raises(RuntimeError):
+        asyncio.run(collect(response.body_iterator))
+
+    assert response.media_type == "application/x-ndjson"
+    assert "Export of projects failed: connection lost" in caplog.text
@@ -0,0 +1,63 @@
+# app/server/tests/test_instrumentation.py
+from datetime import datetime
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import asyncpg
+
+from main import create_app
+from middleware.sql_stats_middleware import SqlStatsMiddleware
+from storages.psql.models.project_model import DBProjectModel
+from storages.psql.instrumentation import QueryStats, statement_shape
+
+
+def asyncpg_sql(statement) -> str:
+    """SQL в том виде, в каком его видят события движка (IN-списки раскрыты, с приведениями типов)"""
+    return statement.compile(dialect=asyncpg.dialect(), compile_kwargs={"render_postcompile": True}).string
+
+
+def projects_by_ids(ids: list[int]) -> str:
+    return asyncpg_sql(
+        select(DBProjectModel.id)
+        .where(DBProjectModel.id.in_(ids), DBProjectModel.created_at < datetime(2025, 1, 1))
+        .limit(10)
+    )
+
+
+def test_in_lists_of_different_sizes_share_a_shape():
+    long_list, short_list = projects_by_ids([1, 2, 3]), projects_by_ids([4])
+
+    assert "::INTEGER" in long_list and "::TIMESTAMP WITHOUT TIME ZONE" in long_list
+    assert statement_shape(long_list) == statement_shape(short_list)
+    shape = statement_shape(long_list)
+    assert "IN (?)" in shape
+    assert "$" not in shape and "::" not in shape
+
+
+def test_shape_collapses_pyformat_and_whitespace():
+    assert statement_shape("SELECT *\n  FROM t WHERE a = %(a)s AND b IN (%(b_1)s, %(b_2)s)") == (
+        "SELECT * FROM t WHERE a = ? AND b IN (?)"
+    )
+
+
+def test_query_stats_track_slowest_and_repeated_shapes():
+    stats = QueryStats()
+    for ids, elapsed in (([1], 2.0), ([1, 2], 5.0), ([1, 2, 3], 1.0)):
+        stats.add(projects_by_ids(ids), elapsed)
+    stats.add("SELECT 1", 0.5)
+
+    assert stats.count == 4
+    assert stats.total_ms == 8.5
+    assert stats.slowest_ms == 5.0 and stats.slowest_statement == projects_by_ids([1, 2])
+    assert stats.repeated(2) == [(statement_shape(projects_by_ids([1])), 3)]
+    assert stats.repeated(3) == []
+
+
+def test_app_uses_sql_stats_settings():
+    app = create_app()
+    [middleware] = [m for m in app.user_middleware if m.cls is SqlStatsMiddleware]
+    sql_stats = app.state.settings.sql_stats
+
+    assert middleware.kwargs == {
+        "n_plus_one_threshold": sql_stats.n_plus_one_threshold,
+        "slow_request_ms": sql_stats.slow_request_ms,
+    }
@@ -0,0 +1,62 @@
+# app/server/tests/test_jsonb_filters.py
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.dialects import postgresql
+
+from routers.admin.developers import developers_query
+from routers.admin.service_requests import parse_requirements_filter, service_requests_query
+from tests.conftest import make_developer
+
+IDENTITY = {"Accept-Encoding": "identity"}
+
+
+def compile_sql(query) -> str:
+    return str(query.compile(dialect=postgresql.dialect()))
+
+
+# ?requirements=
+
+def test_parse_requirements_filter():
+    assert parse_requirements_filter(None) is None
+    assert parse_requirements_filter("") is None
+    assert parse_requirements_filter('{"design": true, "pages": 5}') == {"design": True, "pages": 5}
+
+
+@pytest.mark.parametrize("raw", ["{design}", "[1, 2]", '"design"', "{}"])
+def test_parse_requirements_filter_rejects_non_objects(raw):
+    with pytest.raises(HTTPException) as error:
+        parse_requirements_filter(raw)
+    assert error.value.status_code == 400
+
+
+def test_requirements_filter_is_a_containment_query():
+    request = SimpleNamespace(app=SimpleNamespace(state=SimpleNamespace(
+        settings=SimpleNamespace(service_requests=SimpleNamespace(admin_recent_months=0))
+    )))
+    _, query, _ = service_requests_query(request, None, None, None, None, {"design": True}, None, False)
+
+    assert "service_requests.requirements @> %(requirements_1)s" in compile_sql(query)
+
+
+# Навыки разработчиков
+
+def test_admin_skill_filter_is_a_containment_query():
+    sql = compile_sql(developers_query(None, "React"))
+
+    assert "developers.skills @> %(skills_1)s" in sql
+
+
+def test_public_skill_filter_uses_snapshot_index(public_client, snapshot):
+    snapshot.developers = {
+        1: make_developer(1, order_priority=2, skills=["React", "Go"]),
+        2: make_developer(2, order_priority=1, skills=["React"]),
+        3: make_developer(3, order_priority=0, skills=["Go"]),
+    }
+    snapshot._reindex_developers()
+
+    developers = public_client.get("/api/public/developers", params={"skill": "React"}, headers=IDENTITY).json()
+
+    assert [developer["id"] for developer in developers] == [2, 1]
+    assert public_client.get("/api/public/developers", params={"skill": "Rust"}, headers=IDENTITY).json() == []
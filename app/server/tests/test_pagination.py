@@ -0,0 +1,112 @@
+# app/server/tests/test_pagination.py
+import asyncio
+import json
+from collections import namedtuple
+
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from services.pagination import ESTIMATE_MIN_ROWS, Explain, _RELTUPLES_QUERY, _trust, fetch_page
+from storages.psql.models.project_model import DBProjectModel
+
+Row = namedtuple("Row", ["obj", "total_count"])
+
+
+class FakeResult:
+    def __init__(self, value):
+        self.value = value
+
+    def scalar(self):
+        return self.value
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return self.value
+
+
+class FakeSession:
+    """Отвечает на запросы fetch_page по их виду и запоминает, что выполнялось"""
+
+    def __init__(self, rows=(), reltuples=None, plan_rows=None, count=0):
+        self.rows = list(rows)
+        self.reltuples = reltuples
+        self.plan_rows = plan_rows
+        self.count = count
+        self.executed = []
+
+    async def execute(self, statement, params=None):
+        if statement is _RELTUPLES_QUERY:
+            self.executed.append(("reltuples", params["table"]))
+            return FakeResult(self.reltuples)
+        if isinstance(statement, Explain):
+            self.executed.append(("explain", statement))
+            return FakeResult(json.dumps([{"Plan": {"Plan Rows": self.plan_rows}}]))
+        names = [column.name for column in statement.selected_columns]
+        if "total_count" in names:
+            self.executed.append(("page_with_total", statement))
+            return FakeResult([Row(row, self.count) for row in self.rows])
+        if names == ["id"]:
+            self.executed.append(("page", statement))
+            return FakeResult(self.rows)
+        self.executed.append(("count", statement))
+        return FakeResult(self.count)
+
+
+def compile_sql(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+QUERY = select(DBProjectModel.id).order_by(DBProjectModel.id)
+FILTERED = QUERY.where(DBProjectModel.status == "active")
+
+
+def test_trust_ignores_missing_and_small_estimates():
+    assert _trust(None) is None
+    assert _trust(ESTIMATE_MIN_ROWS - 1) is None
+    assert _trust(ESTIMATE_MIN_ROWS) == ESTIMATE_MIN_ROWS
+
+
+def test_exact_mode_reads_total_from_the_window_column():
+    db = FakeSession(rows=[1, 2], count=42)
+
+    assert asyncio.run(fetch_page(db, QUERY, 10, 12)) == ([1, 2], 42)
+    [(kind, statement)] = db.executed
+    assert kind == "page_with_total"
+    assert "count(*) OVER () AS total_count" in compile_sql(statement)
+    assert "LIMIT 2 OFFSET 10" in compile_sql(statement)
+
+
+def test_empty_page_falls_back_to_separate_count():
+    db = FakeSession(rows=[], count=7)
+
+    assert asyncio.run(fetch_page(db, QUERY, 100, 110)) == ([], 7)
+    assert [kind for kind, _ in db.executed] == ["page_with_total", "count"]
+    assert "ORDER BY" not in compile_sql(db.executed[1][1])
+
+
+def test_estimated_mode_uses_reltuples_without_filters():
+    db = FakeSession(rows=[1, 2], reltuples=ESTIMATE_MIN_ROWS * 3)
+
+    assert asyncio.run(fetch_page(db, QUERY, 0, 2, count="estimated")) == ([1, 2], ESTIMATE_MIN_ROWS * 3)
+    assert [kind for kind, _ in db.executed] == ["reltuples", "page"]
+    assert db.executed[0][1] == "projects"
+
+
+def test_estimated_mode_explains_filtered_queries():
+    db = FakeSession(rows=[1], plan_rows=ESTIMATE_MIN_ROWS * 2)
+
+    assert asyncio.run(fetch_page(db, FILTERED, 0, 1, count="estimated")) == ([1], ESTIMATE_MIN_ROWS * 2)
+    assert [kind for kind, _ in db.executed] == ["explain", "page"]
+    sql = compile_sql(db.executed[0][1])
+    assert sql.startswith("EXPLAIN (FORMAT JSON) SELECT projects.id")
+    assert "projects.status = 'active'" in sql
+    assert "ORDER BY" not in sql
+
+
+def test_estimated_mode_counts_exactly_when_estimate_is_small():
+    db = FakeSession(rows=[1], plan_rows=10, count=10)
+
+    assert asyncio.run(fetch_page(db, FILTERED, 0, 1, count="estimated")) == ([1], 10)
+    assert [kind for kind, _ in db.executed] == ["explain", "page_with_total"]
@@ -0,0 +1,114 @@
+# app/server/tests/test_partitions.py
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import date, datetime
+from types import SimpleNamespace
+
+import pytest
+
+from storages.psql import partitions
+from storages.psql.partitions import (
+    DEFAULT_PARTITION,
+    add_months,
+    ensure_partitions,
+    is_partition_table,
+    month_start,
+    partition_month,
+    partition_name,
+    partition_statements,
+)
+
+
+@pytest.mark.parametrize("month, months, expected", [
+    (date(2025, 1, 1), 1, date(2025, 2, 1)),
+    (date(2025, 11, 1), 3, date(2026, 2, 1)),
+    (date(2025, 1, 1), -1, date(2024, 12, 1)),
+    (date(2025, 3, 1), -27, date(2022, 12, 1)),
+])
+def test_add_months_crosses_year_boundaries(month, months, expected):
+    assert add_months(month, months) == expected
+
+
+def test_month_start_truncates_to_first_day():
+    assert month_start(datetime(2025, 2, 28, 23, 59)) == date(2025, 2, 1)
+
+
+def test_partition_names_round_trip():
+    assert partition_name(date(2025, 3, 1)) == "service_requests_y2025m03"
+    assert partition_month("service_requests_y2025m03") == date(2025, 3, 1)
+    assert partition_month("service_requests_archive") is None
+
+
+def test_default_partition_is_managed_by_maintenance():
+    assert is_partition_table(DEFAULT_PARTITION)
+    assert is_partition_table("service_requests_y2025m03")
+    assert not is_partition_table("service_requests")
+    assert not is_partition_table("service_requests_archive")
+
+
+def test_partition_is_filled_from_default_before_attach():
+    lock, create, move, attach = partition_statements(date(2025, 12, 1))
+
+    assert lock == f"LOCK TABLE {DEFAULT_PARTITION} IN ACCESS EXCLUSIVE MODE"
+    assert create.startswith("CREATE TABLE service_requests_y2025m12 (LIKE service_requests")
+    assert f"DELETE FROM {DEFAULT_PARTITION} WHERE created_at >= '2025-12-01' AND created_at < '2026-01-01'" in move
+    assert "INSERT INTO service_requests_y2025m12" in move
+    assert attach == (
+        "ALTER TABLE service_requests ATTACH PARTITION service_requests_y2025m12 "
+        "FOR VALUES FROM ('2025-12-01') TO ('2026-01-01')"
+    )
+
+
+class FakeEngine:
+    """Отвечает на служебные SELECT модуля и запоминает DDL по транзакциям"""
+
+    def __init__(self, tables: dict[str, bool], default_months: set[date]):
+        self.tables = tables
+        self.default_months = default_months
+        self.transactions = []
+
+    def _connection(self, statements: list):
+        engine = self
+
+        class Connection:
+            async def execute(self, statement, params=None):
+                if statement is partitions._PARTITION_TABLES_QUERY:
+                    return [SimpleNamespace(relname=name, relispartition=attached)
+                            for name, attached in engine.tables.items()]
+                if statement is partitions._DEFAULT_MONTHS_QUERY:
+                    return [SimpleNamespace(month=month) for month in engine.default_months]
+                statements.append(str(statement))
+
+        return Connection()
+
+    @asynccontextmanager
+    async def connect(self):
+        yield self._connection([])
+
+    @asynccontextmanager
+    async def begin(self):
+        statements = []
+        self.transactions.append(statements)
+        yield self._connection(statements)
+
+
+def test_ensure_partitions_creates_missing_and_stranded_months(monkeypatch):
+    monkeypatch.setattr(partitions, "month_start", lambda: date(2025, 11, 1))
+    engine = FakeEngine(
+        tables={"service_requests_y2025m11": True, "service_requests_y2025m12": True},
+        default_months={date(2025, 6, 1)},
+    )
+
+    created = asyncio.run(ensure_partitions(engine, months_ahead=2))
+
+    assert created == ["service_requests_y2025m06", "service_requests_y2026m01"]
+    # Каждая партиция - отдельная транзакция со всеми шагами переноса
+    assert engine.transactions == [partition_statements(date(2025, 6, 1)), partition_statements(date(2026, 1, 1))]
+
+
+def test_ensure_partitions_is_idempotent(monkeypatch):
+    monkeypatch.setattr(partitions, "month_start", lambda: date(2025, 11, 1))
+    engine = FakeEngine(tables={"service_requests_y2025m11": True}, default_months=set())
+
+    assert asyncio.run(ensure_partitions(engine, months_ahead=0)) == []
+    assert engine.transactions == []
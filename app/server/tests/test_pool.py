@@ -0,0 +1,86 @@
+# app/server/tests/test_pool.py
+import asyncio
+
+import pytest
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.util import greenlet_spawn
+
+from settings import Settings
+from storages.psql.base import create_db_session_pool, warm_up_pool
+from storages.psql.pool import InstrumentedAsyncPool
+
+
+class FakeConnection:
+    """DBAPI-соединение, которому пул делает только rollback при возврате и close"""
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def test_pool_counts_checkouts_waits_and_timeouts():
+    pool = InstrumentedAsyncPool(FakeConnection, pool_size=1, max_overflow=0, timeout=0.01)
+
+    async def run():
+        connection = await greenlet_spawn(pool.connect)
+        assert pool.metrics()["checked_out"] == 1
+
+        with pytest.raises(PoolTimeoutError):
+            await greenlet_spawn(pool.connect)
+        await greenlet_spawn(connection.close)
+
+    asyncio.run(run())
+    metrics = pool.metrics()
+
+    assert metrics["checkouts"] == 2
+    assert metrics["timeouts"] == 1
+    assert metrics["checked_out"] == 0 and metrics["idle"] == 1
+    # Второй checkout честно прождал pool_timeout
+    assert metrics["wait_max_ms"] >= 10
+
+
+def test_engine_is_built_from_pool_settings():
+    settings = Settings()
+
+    async def run():
+        engine, _ = await create_db_session_pool(settings)
+        await engine.dispose()
+        return engine
+
+    engine = asyncio.run(run())
+
+    assert isinstance(engine.pool, InstrumentedAsyncPool)
+    assert engine.pool.size() == settings.pool.size
+    assert engine.pool._max_overflow == settings.pool.max_overflow
+    assert engine.pool._timeout == settings.pool.timeout_seconds
+    assert engine.url.query["prepared_statement_cache_size"] == str(settings.pool.prepared_statement_cache_size)
+
+
+class FakeEngine:
+    def __init__(self, size: int):
+        self.pool = InstrumentedAsyncPool(FakeConnection, pool_size=size)
+        self.opened = 0
+        self.closed = 0
+
+    def connect(self):
+        engine = self
+
+        class Connection:
+            async def start(self):
+                engine.opened += 1
+                return self
+
+            async def close(self):
+                engine.closed += 1
+
+        return Connection()
+
+
+def test_warm_up_opens_at_most_pool_size_connections():
+    engine = FakeEngine(size=3)
+
+    assert asyncio.run(warm_up_pool(engine, 5)) == 3
+    assert engine.opened == engine.closed == 3
+    assert asyncio.run(warm_up_pool(engine, 0)) == 0
@@ -0,0 +1,115 @@
+# app/server/tests/test_portfolio_snapshot.py
+import asyncio
+from contextlib import asynccontextmanager
+
+from services.portfolio_snapshot import PortfolioSnapshot
+from tests.conftest import BASE_TIME, make_developer, make_project
+
+
+@asynccontextmanager
+async def no_db():
+    yield None
+
+
+# Индексы
+
+def test_project_order_is_newest_first_with_id_tiebreak(snapshot):
+    keys = [(snapshot.projects[pid].created_at, pid) for pid in snapshot.project_order]
+    assert keys == sorted(keys, reverse=True)
+    assert snapshot.project_order[:3] == (20, 19, 18)
+
+
+def test_indexes_match_project_fields(snapshot):
+    assert set(snapshot.projects_by_category["mobile"]) == {pid for pid in range(1, 21) if pid % 3 == 0}
+    assert set(snapshot.featured_projects) == {4, 8, 12, 16, 20}
+    assert snapshot.projects_by_type["saas"] == snapshot.project_order
+
+
+def test_find_projects_combines_filters(snapshot):
+    found = snapshot.find_projects(featured_only=True, category="mobile")
+    assert [project.id for project in found] == [12]
+
+    assert [project.id for project in snapshot.find_projects(category="web", limit=3)] == [20, 19, 17]
+    assert snapshot.find_projects(category="missing") == []
+
+
+def test_developer_order_puts_null_priority_last():
+    snapshot = PortfolioSnapshot(db_session=None)
+    snapshot.developers = {
+        1: make_developer(1, order_priority=None),
+        2: make_developer(2, order_priority=5),
+        3: make_developer(3, order_priority=0),
+        4: make_developer(4, order_priority=None),
+    }
+    snapshot._reindex_developers()
+
+    assert snapshot.developer_order == (3, 2, 1, 4)
+
+
+def test_developers_by_skill_keeps_developer_order():
+    snapshot = PortfolioSnapshot(db_session=None)
+    snapshot.developers = {
+        1: make_developer(1, order_priority=2, skills=["python", "python"]),
+        2: make_developer(2, order_priority=1, skills=["python", "go"]),
+    }
+    snapshot._reindex_developers()
+
+    assert snapshot.developers_by_skill == {"python": (2, 1), "go": (2,)}
+
+
+# Точечное обновление
+
+def test_refresh_projects_replaces_only_given_projects(snapshot, monkeypatch):
+    snapshot.db_session = no_db
+    snapshot.project_counts = {7: 1, 8: 4}
+    snapshot.projects[5].developer_ids = (7,)
+    fresh = make_project(21, BASE_TIME.replace(year=2026), featured=True)
+    fresh.developer_ids = (8,)
+
+    async def fetch_projects(db, project_ids):
+        # 5 стал неактивным, 21 появился
+        return {21: fresh} if 21 in project_ids else {}
+
+    async def fetch_project_counts(db, developer_ids):
+        assert developer_ids == {7, 8}
+        return {8: 5}
+
+    monkeypatch.setattr(snapshot, "_fetch_projects", fetch_projects)
+    monkeypatch.setattr(snapshot, "_fetch_project_counts", fetch_project_counts)
+    asyncio.run(snapshot.refresh_projects({5, 21}))
+
+    assert 5 not in snapshot.projects
+    assert snapshot.project_order[0] == 21
+    assert snapshot.featured_projects[0] == 21
+    assert 5 not in snapshot.project_order
+    assert snapshot.developer_projects == {8: (21,)}
+    assert snapshot.project_counts == {8: 5}
+
+
+def test_refresh_developers_rereads_their_projects(snapshot, monkeypatch):
+    snapshot.db_session = no_db
+    snapshot.projects[3].developer_ids = (7,)
+    snapshot.developers = {7: make_developer(7)}
+    snapshot._reindex_projects()
+    snapshot._reindex_developers()
+    refreshed = []
+
+    async def fetch_developers(db, developer_ids):
+        return {}  # Разработчика удалили
+
+    async def fetch_project_counts(db, developer_ids):
+        return {}
+
+    async def fetch_projects(db, project_ids):
+        refreshed.append(set(project_ids))
+        return {3: make_project(3, snapshot.projects[3].created_at)}
+
+    monkeypatch.setattr(snapshot, "_fetch_developers", fetch_developers)
+    monkeypatch.setattr(snapshot, "_fetch_project_counts", fetch_project_counts)
+    monkeypatch.setattr(snapshot, "_fetch_projects", fetch_projects)
+    asyncio.run(snapshot.refresh_developers({7}))
+
+    assert snapshot.developers == {}
+    assert refreshed == [{3}]
+    assert snapshot.projects[3].developer_ids == ()
+    assert snapshot.developer_projects == {}
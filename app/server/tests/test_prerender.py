@@ -0,0 +1,92 @@
+# app/server/tests/test_prerender.py
+import asyncio
+import json
+import re
+
+from services.prerender import PRERENDER_SCRIPT_ID, developer_slug, render_project_page, render_site_pages
+from services.static_export import StaticPublisher
+from tests.conftest import make_developer
+
+SHELL = (
+    '<!doctype html><html><head><title>Sligart Studio</title>'
+    '<meta name="description" content="Default" /></head>'
+    '<body><div id="root"></div><script src="/app.js"></script></body></html>'
+)
+
+PROJECT = {
+    "id": 7,
+    "title": "Shop <b>",
+    "short_description": "Online store",
+    "description": "Payments </script><script>alert(1)</script>",
+    "image_urls": ["https://cdn.example/7.jpg"],
+    "cover_image_url": "https://cdn.example/7.jpg",
+    "developers": [{"id": 1, "name": "Ann Lee"}],
+}
+
+
+def embedded_data(html: str) -> dict:
+    match = re.search(rf'<script id="{PRERENDER_SCRIPT_ID}" type="application/json">(.*?)</script>', html, re.S)
+    return json.loads(match.group(1))
+
+
+def test_developer_slug_matches_frontend():
+    assert developer_slug("Ann  Lee") == "ann-lee"
+    assert developer_slug("José O'Neil") == "jos-oneil"
+    assert developer_slug("!!!") == ""
+
+
+def test_project_page_replaces_meta_and_root():
+    html = render_project_page(SHELL, PROJECT)
+
+    assert html.count("<title>") == 1
+    assert "<title>Shop &lt;b&gt; - Sligart Studio</title>" in html
+    assert 'content="Default"' not in html
+    assert '<meta property="og:image" content="https://cdn.example/7.jpg" />' in html
+    assert '<div id="root"><article><h1>Shop &lt;b&gt;</h1>' in html
+    assert "<li>Ann Lee</li>" in html
+    assert html.endswith('<script src="/app.js"></script></body></html>')
+
+
+def test_embedded_json_cannot_close_the_script_tag():
+    html = render_project_page(SHELL, PROJECT)
+
+    # Единственный </script> до app.js - закрывающий тег самого блока данных
+    assert html.count("</script>") == 2
+    assert embedded_data(html) == {"type": "project", "id": 7, "project": PROJECT}
+
+
+def test_site_pages_are_built_from_api_responses():
+    files = {
+        "/api/public/projects/7": json.dumps(PROJECT).encode(),
+        "/api/public/developers/1": json.dumps({"id": 1, "name": "Ann Lee", "specialization": "backend"}).encode(),
+        "/api/public/developers/1/projects": json.dumps([{"id": 7, "title": "Shop"}]).encode(),
+        "/api/public/developers/2": json.dumps({"id": 2, "name": "!!!", "specialization": "qa"}).encode(),
+        "/api/public/stats": b"{}",
+    }
+
+    pages = render_site_pages(SHELL, files)
+
+    assert set(pages) == {"site/project/7/index.html", "site/developer/ann-lee/index.html"}
+    developer_page = pages["site/developer/ann-lee/index.html"].decode()
+    assert '<a href="/project/7">Shop</a>' in developer_page
+    assert embedded_data(developer_page)["slug"] == "ann-lee"
+
+
+def test_publisher_writes_pages_when_spa_is_built(public_app, snapshot, tmp_path):
+    snapshot.developers = {1: make_developer(1)}
+    snapshot._reindex_developers()
+    spa_index = tmp_path / "index.html"
+    spa_index.write_text(SHELL, encoding="utf-8")
+    publisher = StaticPublisher(public_app, str(tmp_path / "export"), brotli_quality=None, spa_index=str(spa_index))
+
+    version_dir = asyncio.run(publisher.publish())
+
+    assert (version_dir / "site/project/20/index.html").is_file()
+    assert (version_dir / "site/project/20/index.html.gz").is_file()
+    assert (version_dir / "site/developer/developer-1/index.html").is_file()
+
+
+def test_publisher_skips_pages_without_spa(public_app, tmp_path):
+    publisher = StaticPublisher(public_app, str(tmp_path), spa_index=str(tmp_path / "missing.html"))
+
+    assert publisher.render_pages({"/api/public/projects/7": json.dumps(PROJECT).encode()}) == {}
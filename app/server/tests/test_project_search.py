@@ -0,0 +1,88 @@
+# app/server/tests/test_project_search.py
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+from sqlalchemy.dialects import postgresql
+
+from services.project_search import ranked_search_query, search_condition
+from storages.psql.db_scripts.check_indexes import QUERY_SHAPES
+
+IDENTITY = {"Accept-Encoding": "identity"}
+
+
+def compile_sql(query) -> str:
+    return str(query.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def all(self):
+        return self.rows
+
+
+def read_session(rows, executed: list):
+    """db_read_session, который вместо БД возвращает заранее заданные строки"""
+    class Session:
+        async def execute(self, query):
+            executed.append(query)
+            return FakeResult(rows)
+
+    @asynccontextmanager
+    async def session():
+        yield Session()
+
+    return session
+
+
+# SQL
+
+def test_search_uses_regconfig_constant():
+    sql = compile_sql(ranked_search_query("react native", 5))
+
+    assert "websearch_to_tsquery('english'::regconfig, 'react native')" in sql
+    assert "ts_headline('english'::regconfig," in sql
+    assert "'english'," not in sql
+
+
+def test_headline_is_computed_only_for_top_hits():
+    sql = compile_sql(ranked_search_query("react", 5))
+    top_start = sql.index("(SELECT")
+    top_end = sql.index(") AS anon_1")
+
+    # LIMIT внутри подзапроса, ts_headline - снаружи
+    assert "LIMIT 5" in sql[top_start:top_end]
+    assert "ts_headline" not in sql[top_start:top_end]
+    assert "projects.status = 'active'" in sql[top_start:top_end]
+
+
+def test_check_indexes_validates_the_router_expression():
+    [search_shape] = [query for description, query, _ in QUERY_SHAPES if description == "projects full-text search"]
+
+    assert compile_sql(search_condition("react")) in compile_sql(search_shape)
+
+
+# Ручка
+
+def test_search_returns_snapshot_projects_in_rank_order(public_client, public_app):
+    executed = []
+    public_app.state.db_read_session = read_session([
+        SimpleNamespace(id=7, rank=0.9, headline="<mark>react</mark> app"),
+        SimpleNamespace(id=999, rank=0.5, headline="gone"),  # Уже не активен - в снапшоте нет
+        SimpleNamespace(id=3, rank=0.1, headline="react"),
+    ], executed)
+
+    hits = public_client.get("/api/public/projects/search", params={"q": "react", "fields": "title"}, headers=IDENTITY)
+
+    assert hits.status_code == 200
+    assert hits.json() == [
+        {"project": {"id": 7, "title": "Project 7"}, "rank": 0.9, "headline": "<mark>react</mark> app"},
+        {"project": {"id": 3, "title": "Project 3"}, "rank": 0.1, "headline": "react"},
+    ]
+    assert len(executed) == 1
+
+
+def test_search_validates_query(public_client):
+    assert public_client.get("/api/public/projects/search", params={"q": ""}).status_code == 422
+    assert public_client.get("/api/public/projects/search", params={"q": "x", "limit": 51}).status_code == 422
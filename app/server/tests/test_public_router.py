@@ -0,0 +1,99 @@
+# app/server/tests/test_public_router.py
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from services.portfolio_snapshot import active_project_counts_query, public_stats_query
+from tests.conftest import make_developer
+
+IDENTITY = {"Accept-Encoding": "identity"}
+
+
+def compile_sql(query) -> str:
+    return str(query.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+@pytest.fixture
+def team(snapshot):
+    """Два разработчика: у первого счетчик из БД, у второго активных проектов нет"""
+    snapshot.developers = {1: make_developer(1, order_priority=1), 2: make_developer(2, order_priority=2)}
+    snapshot.project_counts = {1: 3}
+    snapshot._reindex_developers()
+    return snapshot
+
+
+# project_count
+
+def test_project_counts_are_grouped_in_sql():
+    sql = compile_sql(active_project_counts_query([1, 2]))
+
+    assert "count(*)" in sql
+    assert "GROUP BY project_developers.developer_id" in sql
+    assert "projects.status = 'active'" in sql
+    assert "project_developers.developer_id IN (1, 2)" in sql
+    # Сами строки проектов не читаются - только join для фильтра по статусу
+    assert "projects.title" not in sql
+
+
+def test_developers_report_project_count(public_client, team):
+    developers = public_client.get("/api/public/developers", headers=IDENTITY).json()
+
+    assert [(developer["id"], developer["project_count"]) for developer in developers] == [(1, 3), (2, 0)]
+
+
+def test_developer_detail_reports_project_count(public_client, team):
+    developer = public_client.get("/api/public/developers/1", headers=IDENTITY).json()
+
+    assert developer["project_count"] == 3
+
+
+# Статистика
+
+def test_public_stats_is_a_single_select():
+    query = public_stats_query()
+    sql = compile_sql(query)
+
+    assert [column.name for column in query.selected_columns] == [
+        "developers", "projects", "completed_projects", "years_experience", "technologies"
+    ]
+    # Все счетчики - скалярные подзапросы одного SELECT без FROM
+    assert not query.get_final_froms()
+    assert "service_requests.status = 'completed'" in sql
+
+
+def test_completed_projects_include_archived_requests():
+    sql = compile_sql(public_stats_query())
+
+    # Архивированные партиции не должны уменьшать счетчик на главной
+    assert "service_requests_archive.status = 'completed'" in sql
+    assert ") + (SELECT count(service_requests_archive.id)" in sql
+
+
+def test_stats_endpoint_serves_snapshot_counters(public_client, snapshot):
+    snapshot.stats = {"developers": 2, "projects": 20, "completed_projects": 5, "years_experience": 7, "technologies": 9}
+
+    stats = public_client.get("/api/public/stats", headers=IDENTITY).json()
+
+    assert stats == {**snapshot.stats, "categories": {"web": 14, "mobile": 6}}
+
+
+# Бандл главной
+
+def test_bundle_has_everything_the_landing_page_needs(public_client, team):
+    team.stats = {"developers": 2}
+
+    bundle = public_client.get("/api/public/bundle", params={"projects_limit": 2}, headers=IDENTITY).json()
+
+    assert set(bundle) == {"stats", "featured_projects", "developers", "technologies", "categories"}
+    assert [project["id"] for project in bundle["featured_projects"]] == [20, 16]
+    assert [developer["id"] for developer in bundle["developers"]] == [1, 2]
+    assert bundle["stats"]["developers"] == 2
+    assert bundle["technologies"] == []
+
+
+def test_bundle_matches_individual_endpoints(public_client, team):
+    bundle = public_client.get("/api/public/bundle", headers=IDENTITY).json()
+
+    assert bundle["developers"] == public_client.get("/api/public/developers", headers=IDENTITY).json()
+    assert bundle["stats"] == public_client.get("/api/public/stats", headers=IDENTITY).json()
+    categories = public_client.get("/api/public/projects/categories/list", headers=IDENTITY).json()
+    assert bundle["categories"] == categories["categories"]
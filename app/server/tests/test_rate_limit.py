@@ -0,0 +1,116 @@
+# app/server/tests/test_rate_limit.py
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from main import create_app
+from middleware.rate_limit_middleware import RateLimitMiddleware, TokenBuckets
+
+KEY = (("POST", "/api/auth/login"), "10.0.0.1")
+
+
+# Ведра
+
+def test_burst_then_refill(clock):
+    buckets = TokenBuckets()
+
+    assert [buckets.take(KEY, 3, 1) for _ in range(3)] == [0, 0, 0]
+    assert buckets.take(KEY, 3, 1) == pytest.approx(1.0)
+
+    clock.advance(0.5)
+    assert buckets.take(KEY, 3, 1) == pytest.approx(0.5)
+
+    clock.advance(0.5)
+    assert buckets.take(KEY, 3, 1) == 0
+
+
+def test_refill_is_capped_by_capacity(clock):
+    buckets = TokenBuckets()
+    for _ in range(3):
+        buckets.take(KEY, 3, 1)
+
+    clock.advance(3600)
+    assert [buckets.take(KEY, 3, 1) for _ in range(3)] == [0, 0, 0]
+    assert buckets.take(KEY, 3, 1) > 0
+
+
+def test_max_keys_evicts_least_recently_used_bucket(clock):
+    buckets = TokenBuckets(max_keys=2)
+    first, second, third = ("route", "a"), ("route", "b"), ("route", "c")
+
+    buckets.take(first, 1, 1)
+    buckets.take(second, 1, 1)
+    buckets.take(first, 1, 1)  # first становится самым свежим
+    buckets.take(third, 1, 1)
+
+    assert len(buckets._buckets) == 2
+    assert second not in buckets._buckets
+    # Пустое ведро first пережило вытеснение
+    assert buckets.take(first, 1, 1) > 0
+
+
+# Middleware
+
+@pytest.fixture
+def limited_client(clock) -> TestClient:
+    app = FastAPI()
+
+    @app.post("/api/public/contact")
+    async def contact():
+        return {"ok": True}
+
+    @app.get("/api/public/projects")
+    async def projects():
+        return []
+
+    app.add_middleware(RateLimitMiddleware, rules={("POST", "/api/public/contact"): (2, 60)})
+    return TestClient(app)
+
+
+def test_returns_429_with_retry_after(limited_client):
+    headers = {"X-Real-IP": "10.0.0.1"}
+    assert limited_client.post("/api/public/contact", headers=headers).status_code == 200
+    assert limited_client.post("/api/public/contact", headers=headers).status_code == 200
+
+    response = limited_client.post("/api/public/contact", headers=headers)
+    assert response.status_code == 429
+    assert response.headers["retry-after"] == "1"
+    assert response.json() == {"detail": "Too many requests", "status_code": 429}
+
+
+def test_limit_is_per_client_ip(limited_client):
+    for _ in range(3):
+        limited_client.post("/api/public/contact", headers={"X-Real-IP": "10.0.0.1"})
+
+    assert limited_client.post("/api/public/contact", headers={"X-Real-IP": "10.0.0.2"}).status_code == 200
+
+
+def test_limit_recovers_after_refill(limited_client, clock):
+    headers = {"X-Real-IP": "10.0.0.1"}
+    for _ in range(3):
+        limited_client.post("/api/public/contact", headers=headers)
+
+    clock.advance(1)
+    assert limited_client.post("/api/public/contact", headers=headers).status_code == 200
+
+
+def test_other_routes_are_not_limited(limited_client):
+    headers = {"X-Real-IP": "10.0.0.1"}
+    for _ in range(3):
+        limited_client.post("/api/public/contact", headers=headers)
+
+    assert all(limited_client.get("/api/public/projects", headers=headers).status_code == 200 for _ in range(5))
+
+
+# Подключение в приложении
+
+def test_app_uses_rate_limit_settings():
+    app = create_app()
+    [middleware] = [m for m in app.user_middleware if m.cls is RateLimitMiddleware]
+    rate_limit = app.state.settings.rate_limit
+
+    assert middleware.kwargs["rules"] == {
+        ("POST", "/api/auth/login"): (rate_limit.login_burst, rate_limit.login_per_minute),
+        ("POST", "/api/public/contact"): (rate_limit.contact_burst, rate_limit.contact_per_minute),
+    }
+    assert middleware.kwargs["max_keys"] == rate_limit.max_keys
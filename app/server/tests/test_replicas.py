@@ -0,0 +1,97 @@
+# app/server/tests/test_replicas.py
+import asyncio
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+from storages.psql.replicas import ReadSessionRouter, Replica, replica_problem
+
+
+class FakeEngine:
+    """Движок реплики: connect() отдает заданную строку состояния или падает"""
+
+    def __init__(self, in_recovery=True, receiver_pid=42, lag_seconds=0, error=None):
+        self.row = SimpleNamespace(in_recovery=in_recovery, receiver_pid=receiver_pid, lag_seconds=lag_seconds)
+        self.error = error
+        self.pool = None
+
+    @asynccontextmanager
+    async def connect(self):
+        if self.error is not None:
+            raise self.error
+        yield self
+
+    async def execute(self, query):
+        return SimpleNamespace(one=lambda: self.row)
+
+
+def make_replica(name: str, **state) -> Replica:
+    return Replica(name=name, engine=FakeEngine(**state), sessionmaker=f"{name}-sessions")
+
+
+def check(router: ReadSessionRouter) -> None:
+    asyncio.run(router.check())
+
+
+# Здоровье
+
+def test_replica_problem():
+    assert replica_problem(True, 42, 0.0, 5) is None
+    assert replica_problem(True, 42, 5.0, 5) is None
+    assert replica_problem(True, 42, 5.1, 5) == "lag 5.1s"
+    assert replica_problem(False, None, None, 5) == "not in recovery (is it a primary?)"
+    assert replica_problem(True, None, 0.0, 5) == "WAL receiver is not running"
+    assert replica_problem(True, 42, None, 5) == "no transactions replayed yet"
+
+
+def test_primary_is_never_a_healthy_replica():
+    # У primary receive/replay LSN - NULL; раньше COALESCE превращал это в lag 0
+    replica = make_replica("primary", in_recovery=False, receiver_pid=None, lag_seconds=None)
+    router = ReadSessionRouter("primary-sessions", [replica])
+    check(router)
+
+    assert not replica.healthy
+    assert replica.lag_seconds is None
+    assert router.sessionmaker() == "primary-sessions"
+
+
+def test_replica_without_wal_receiver_is_unhealthy():
+    replica = make_replica("detached", receiver_pid=None, lag_seconds=1)
+    router = ReadSessionRouter("primary-sessions", [replica])
+    check(router)
+
+    assert not replica.healthy
+    assert replica.error == "WAL receiver is not running"
+
+
+def test_replica_recovers_when_lag_drops():
+    replica = make_replica("r1", lag_seconds=30)
+    router = ReadSessionRouter("primary-sessions", [replica], max_lag_seconds=5)
+    check(router)
+    assert not replica.healthy and replica.lag_seconds == 30
+
+    replica.engine.row.lag_seconds = 0
+    check(router)
+    assert replica.healthy and replica.error is None
+    assert router.sessionmaker() == "r1-sessions"
+
+
+def test_unreachable_replica_is_marked_down():
+    replica = make_replica("r1", error=OSError("connection refused"))
+    router = ReadSessionRouter("primary-sessions", [replica])
+    check(router)
+
+    assert not replica.healthy
+    assert replica.error == "connection refused"
+
+
+# Маршрутизация
+
+def test_reads_go_round_robin_over_healthy_replicas():
+    replicas = [make_replica("r1"), make_replica("r2", lag_seconds=60), make_replica("r3")]
+    router = ReadSessionRouter("primary-sessions", replicas)
+
+    assert router.sessionmaker() == "primary-sessions"  # До первой проверки
+    check(router)
+
+    assert [router.sessionmaker() for _ in range(4)] == ["r1-sessions", "r3-sessions", "r1-sessions", "r3-sessions"]
+    assert [status["healthy"] for status in router.status()] == [True, False, True]
@@ -0,0 +1,311 @@
+# app/server/tests/test_response_cache.py
+import asyncio
+import gzip
+
+import brotli
+import pytest
+from fastapi import HTTPException
+
+from services.response_cache import ResponseCache, etag_matches, negotiate_encoding
+from tests.conftest import BASE_TIME, make_project
+
+IDENTITY = {"Accept-Encoding": "identity"}
+
+
+# Вытеснение
+
+def test_lru_evicts_least_recently_used_entry():
+    cache = ResponseCache(max_entries=2)
+    cache.set("/a?", b"a", {"projects"})
+    cache.set("/b?", b"b", {"projects"})
+    cache.get("/a?")  # /a становится самой свежей
+    cache.set("/c?", b"c", {"projects"})
+
+    assert cache.get("/a?")[0] is not None
+    assert cache.get("/b?")[0] is None
+    assert cache.get("/c?")[0] is not None
+
+
+def test_evicts_oldest_entries_over_max_bytes():
+    cache = ResponseCache(max_bytes=10)
+    cache.set("/a?", b"123456", {"projects"})
+    cache.set("/b?", b"abcdef", {"projects"})
+
+    assert cache.get("/a?")[0] is None
+    assert cache.stats()["bytes"] == 6
+
+
+def test_replacing_key_does_not_leak_bytes():
+    cache = ResponseCache()
+    cache.set("/a?", b"123456", {"projects"})
+    cache.set("/a?", b"abc", {"projects"})
+
+    assert cache.stats()["entries"] == 1
+    assert cache.stats()["bytes"] == 3
+
+
+def test_entry_expires_after_ttl(clock):
+    cache = ResponseCache(ttl_seconds=10, stale_seconds=0)
+    cache.set("/a?", b"a", {"projects"})
+
+    clock.advance(9)
+    assert cache.get("/a?")[0] is not None
+
+    clock.advance(1)
+    assert cache.get("/a?") == (None, False)
+    assert cache.stats()["entries"] == 0
+    assert cache.stats()["bytes"] == 0
+
+
+# Теги
+
+def test_invalidate_drops_only_tagged_entries():
+    cache = ResponseCache()
+    cache.set("/projects?", b"[]", {"projects"})
+    cache.set("/developers?", b"[]", {"developers", "projects"})
+    cache.set("/technologies?", b"[]", {"technologies"})
+
+    assert cache.invalidate("projects") == 2
+
+    assert cache.get("/projects?")[0] is None
+    assert cache.get("/developers?")[0] is None
+    assert cache.get("/technologies?")[0] is not None
+    assert cache.stats()["bytes"] == 2
+
+
+def test_invalidate_unknown_tag_is_noop():
+    cache = ResponseCache()
+    cache.set("/projects?", b"[]", {"projects"})
+
+    assert cache.invalidate("developers") == 0
+    assert cache.get("/projects?")[0] is not None
+
+
+# ETag
+
+def test_invalidate_bumps_etag_of_tagged_keys_only():
+    cache = ResponseCache()
+    projects_etag = cache.etag_for("/projects?", {"projects"})
+    technologies_etag = cache.etag_for("/technologies?", {"technologies"})
+
+    cache.invalidate("projects")
+
+    assert cache.etag_for("/projects?", {"projects"}) != projects_etag
+    assert cache.etag_for("/technologies?", {"technologies"}) == technologies_etag
+
+
+def test_etag_depends_on_key():
+    cache = ResponseCache()
+    assert cache.etag_for("/projects?limit=1", {"projects"}) != cache.etag_for("/projects?limit=2", {"projects"})
+
+
+def test_etag_changes_between_processes():
+    # Версии тегов живут в памяти - после рестарта старый ETag не должен совпасть
+    assert ResponseCache().etag_for("/projects?", {"projects"}) != ResponseCache().etag_for("/projects?", {"projects"})
+
+
+def test_etag_matches():
+    assert etag_matches('"abc"', '"abc"')
+    assert etag_matches('W/"abc"', '"abc"')
+    assert etag_matches('"other", "abc"', '"abc"')
+    assert etag_matches("*", '"abc"')
+    assert not etag_matches('"abd"', '"abc"')
+    assert not etag_matches(None, '"abc"')
+
+
+# Условный GET через публичный роутер
+
+def test_conditional_get_returns_304_without_rebuilding(public_client, public_app):
+    cache: ResponseCache = public_app.state.response_cache
+
+    first = public_client.get("/api/public/projects", headers=IDENTITY)
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+
+    second = public_client.get("/api/public/projects", headers={**IDENTITY, "If-None-Match": etag})
+    assert second.status_code == 304
+    assert second.content == b""
+    assert second.headers["etag"] == etag
+    assert cache.counters["miss"] == 1
+    assert cache.counters["not_modified"] == 1
+
+
+def test_invalidation_turns_304_into_fresh_200(public_client, public_app, snapshot):
+    cache: ResponseCache = public_app.state.response_cache
+    first = public_client.get("/api/public/projects", headers=IDENTITY)
+    etag = first.headers["etag"]
+
+    # Админка добавила проект: снапшот обновлен, тег сброшен
+    snapshot.projects = {**snapshot.projects, 99: make_project(99, BASE_TIME.replace(year=2026))}
+    snapshot._reindex_projects()
+    cache.invalidate("projects")
+
+    second = public_client.get("/api/public/projects", headers={**IDENTITY, "If-None-Match": etag})
+    assert second.status_code == 200
+    assert second.headers["etag"] != etag
+    assert second.json()[0]["id"] == 99
+
+
+# Сжатые варианты
+
+def test_compressed_variants_are_counted_and_released():
+    cache = ResponseCache(compress_min_bytes=0)
+    body = b'{"items": "' + b"x" * 2000 + b'"}'
+    entry = cache.set("/a?", body, {"projects"})
+
+    gzipped, encoding = cache.variant("/a?", entry, "gzip")
+    assert encoding == "gzip"
+    assert gzip.decompress(gzipped) == body
+    brotlied, encoding = cache.variant("/a?", entry, "br")
+    assert encoding == "br"
+    assert brotli.decompress(brotlied) == body
+    assert cache.stats()["bytes"] == len(body) + len(gzipped) + len(brotlied)
+
+    # Повторный запрос не жмет заново
+    assert cache.variant("/a?", entry, "gzip")[0] is gzipped
+
+    cache.invalidate("projects")
+    assert cache.stats()["bytes"] == 0
+
+
+def test_small_bodies_are_not_compressed():
+    cache = ResponseCache(compress_min_bytes=1024)
+    entry = cache.set("/a?", b"[]", {"projects"})
+
+    assert cache.variant("/a?", entry, "gzip") == (b"[]", None)
+    assert entry.variants == {}
+
+
+def test_brotli_can_be_disabled():
+    assert ResponseCache().encodings == ("br", "gzip")
+    assert ResponseCache(brotli_quality=None).encodings == ("gzip",)
+
+
+def test_negotiate_encoding():
+    supported = ("br", "gzip")
+    assert negotiate_encoding("gzip, deflate, br", supported) == "br"
+    assert negotiate_encoding("gzip, br;q=0", supported) == "gzip"
+    assert negotiate_encoding("*;q=0.5, br;q=0", supported) == "gzip"
+    assert negotiate_encoding("identity", supported) is None
+    assert negotiate_encoding(None, supported) is None
+
+
+def test_compressed_variant_has_its_own_etag(public_client):
+    plain = public_client.get("/api/public/projects", headers=IDENTITY)
+    compressed = public_client.get("/api/public/projects", headers={"Accept-Encoding": "gzip"})
+
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert compressed.headers["etag"] == plain.headers["etag"][:-1] + '-gzip"'
+    assert compressed.json() == plain.json()
+
+    revalidated = public_client.get(
+        "/api/public/projects",
+        headers={"Accept-Encoding": "gzip", "If-None-Match": compressed.headers["etag"]}
+    )
+    assert revalidated.status_code == 304
+    # 304 подтверждает тот же валидатор, что пришел с 200
+    assert revalidated.headers["etag"] == compressed.headers["etag"]
+
+
+def test_identity_etag_still_revalidates_when_compression_is_accepted(public_client):
+    plain = public_client.get("/api/public/projects", headers=IDENTITY)
+
+    revalidated = public_client.get(
+        "/api/public/projects",
+        headers={"Accept-Encoding": "br, gzip", "If-None-Match": plain.headers["etag"]}
+    )
+    assert revalidated.status_code == 304
+    assert revalidated.headers["etag"] == plain.headers["etag"]
+
+
+# Stale-while-revalidate и single-flight
+
+def test_entry_goes_stale_after_ttl_and_expires_after_stale_window(clock):
+    cache = ResponseCache(ttl_seconds=10, stale_seconds=5)
+    cache.set("/a?", b"a", {"projects"})
+
+    clock.advance(9)
+    entry, stale = cache.get("/a?")
+    assert entry is not None and not stale
+
+    clock.advance(3)
+    entry, stale = cache.get("/a?")
+    assert entry is not None and stale
+
+    clock.advance(3)
+    assert cache.get("/a?") == (None, False)
+    assert cache.stats()["entries"] == 0
+
+
+def test_concurrent_misses_share_one_build():
+    cache = ResponseCache()
+    calls = 0
+
+    async def build():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"ok": True}
+
+    async def run():
+        etag = cache.etag_for("/a?", {"projects"})
+        return await asyncio.gather(*(cache.fill("/a?", frozenset({"projects"}), etag, build) for _ in range(5)))
+
+    entries = asyncio.run(run())
+
+    assert calls == 1
+    assert all(entry is entries[0] for entry in entries)
+    assert cache.counters["coalesced"] == 4
+    assert cache.stats()["inflight"] == 0
+
+
+def test_build_that_races_invalidation_is_not_cached():
+    cache = ResponseCache()
+
+    async def build():
+        cache.invalidate("projects")  # Админка успела поменять данные
+        return []
+
+    async def run():
+        etag = cache.etag_for("/a?", {"projects"})
+        return await cache.fill("/a?", frozenset({"projects"}), etag, build)
+
+    entry = asyncio.run(run())
+
+    assert entry.body == b"[]"
+    assert not entry.cacheable
+    assert cache.get("/a?")[0] is None
+
+
+def test_failed_build_is_not_cached():
+    cache = ResponseCache()
+
+    async def build():
+        raise HTTPException(status_code=404)
+
+    async def run():
+        etag = cache.etag_for("/a?", {"projects"})
+        await cache.fill("/a?", frozenset({"projects"}), etag, build)
+
+    with pytest.raises(HTTPException):
+        asyncio.run(run())
+    assert cache.stats()["entries"] == 0
+    assert cache.stats()["inflight"] == 0
+
+
+def test_stale_entry_is_served_while_refreshing(public_client, public_app, snapshot, clock):
+    cache: ResponseCache = public_app.state.response_cache
+    first = public_client.get("/api/public/projects", params={"limit": 1}, headers=IDENTITY)
+    assert first.json()[0]["id"] == 20
+
+    # Правка мимо админки: тег не сброшен, запись просто устарела
+    snapshot.projects = {**snapshot.projects, 99: make_project(99, BASE_TIME.replace(year=2026))}
+    snapshot._reindex_projects()
+    clock.advance(cache.ttl_seconds + 1)
+
+    stale = public_client.get("/api/public/projects", params={"limit": 1}, headers=IDENTITY)
+    assert stale.json()[0]["id"] == 20
+    assert cache.counters["stale"] == 1
+
+    fresh = public_client.get("/api/public/projects", params={"limit": 1}, headers=IDENTITY)
+    assert fresh.json()[0]["id"] == 99
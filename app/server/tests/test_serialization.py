@@ -0,0 +1,123 @@
+# app/server/tests/test_serialization.py
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+import pytest
+from fastapi import HTTPException
+from pydantic import BaseModel
+from sqlalchemy import select
+
+from routers.public import DeveloperOut, PublicDeveloper, PublicProject, developer_out, project_out
+from services.serialization import FastJSONResponse, dumps, load_only_fields, parse_fields, pick_fields
+from storages.psql.models.project_model import DBProjectModel
+from tests.conftest import BASE_TIME, make_developer
+
+IDENTITY = {"Accept-Encoding": "identity"}
+
+
+@dataclass(slots=True)
+class Point:
+    x: int
+    label: Optional[str]
+
+
+class Item(BaseModel):
+    id: int
+    created_at: datetime
+
+
+# Быстрый путь
+
+def test_dumps_handles_slots_dataclasses_models_and_datetimes():
+    content = {
+        "points": [Point(1, None), Point(2, "b")],
+        "item": Item(id=3, created_at=BASE_TIME),
+        "at": BASE_TIME,
+        "tags": ("a", "b"),
+    }
+
+    assert json.loads(dumps(content)) == {
+        "points": [{"x": 1, "label": None}, {"x": 2, "label": "b"}],
+        "item": {"id": 3, "created_at": "2025-01-01T12:00:00.123456"},
+        "at": "2025-01-01T12:00:00.123456",
+        "tags": ["a", "b"],
+    }
+
+
+def test_fast_json_response_renders_bytes():
+    response = FastJSONResponse([Point(1, "a")])
+
+    assert response.body == b'[{"x":1,"label":"a"}]'
+    assert response.headers["content-type"] == "application/json"
+
+
+# Совместимость с response_model
+
+def test_project_out_matches_public_schema(snapshot):
+    snapshot.developers = {1: make_developer(1)}
+    project = snapshot.projects[4]
+    project.developer_ids = (1,)
+
+    payload = json.loads(dumps(project_out(project, snapshot)))
+
+    # То же, что отдал бы response_model=PublicProject
+    assert payload == PublicProject.model_validate(payload).model_dump(mode="json")
+    assert payload["cover_image_url"] == "https://cdn.example/4.jpg"
+    assert payload["developers"] == [{"id": 1, "name": "Developer 1", "specialization": "backend", "avatar_url": None}]
+
+
+def test_developer_out_matches_public_schema(snapshot):
+    developer = make_developer(1, skills=["python"])
+    snapshot.project_counts = {1: 2}
+
+    out = developer_out(developer, snapshot)
+    payload = json.loads(dumps(out))
+
+    assert isinstance(out, DeveloperOut)
+    assert payload == PublicDeveloper.model_validate(payload).model_dump(mode="json")
+    assert payload["project_count"] == 2
+
+
+# ?fields=
+
+def test_parse_fields_always_keeps_id_and_drops_duplicates():
+    allowed = PublicProject.model_fields
+
+    assert parse_fields(None, allowed) is None
+    assert parse_fields("", allowed) is None
+    assert parse_fields(" title , title,category,", allowed) == ("id", "title", "category")
+    assert parse_fields("id,title", allowed) == ("id", "title")
+
+
+def test_parse_fields_rejects_unknown_fields():
+    with pytest.raises(HTTPException) as error:
+        parse_fields("title,password,secret", PublicProject.model_fields)
+
+    assert error.value.status_code == 400
+    assert error.value.detail == "Unknown fields: password, secret"
+
+
+def test_pick_fields_uses_computed_values():
+    point = Point(1, "a")
+
+    assert pick_fields(point, ("x", "double"), {"double": lambda p: p.x * 2}) == {"x": 1, "double": 2}
+
+
+def test_load_only_fields_selects_only_requested_columns():
+    query = select(DBProjectModel).options(load_only_fields(DBProjectModel, ("id", "title", "developers")))
+    sql = str(query.compile())
+
+    assert "projects.title" in sql
+    assert "projects.description" not in sql
+
+
+def test_public_list_returns_only_requested_fields(public_client):
+    projects = public_client.get("/api/public/projects", params={"fields": "title,cover_image_url", "limit": 2}, headers=IDENTITY)
+
+    assert projects.json() == [
+        {"id": 20, "title": "Project 20", "cover_image_url": "https://cdn.example/20.jpg"},
+        {"id": 19, "title": "Project 19", "cover_image_url": "https://cdn.example/19.jpg"},
+    ]
+    assert public_client.get("/api/public/projects", params={"fields": "status"}, headers=IDENTITY).status_code == 400
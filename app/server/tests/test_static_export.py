@@ -0,0 +1,65 @@
+# app/server/tests/test_static_export.py
+import asyncio
+import gzip
+import json
+
+import brotli
+import pytest
+
+from services.static_export import StaticPublisher, public_paths
+from tests.conftest import BASE_TIME, make_developer, make_project
+
+
+@pytest.fixture
+def publisher(public_app, snapshot, tmp_path) -> StaticPublisher:
+    snapshot.developers = {1: make_developer(1, order_priority=1), 2: make_developer(2, order_priority=2)}
+    snapshot.developers[2].is_active = False
+    snapshot._reindex_developers()
+    return StaticPublisher(public_app, str(tmp_path), keep_versions=2, brotli_quality=5)
+
+
+def test_public_paths_cover_projects_and_active_developers(publisher, snapshot):
+    paths = public_paths(snapshot)
+
+    assert "/api/public/bundle" in paths
+    assert "/api/public/projects/20" in paths and "/api/public/projects/1" in paths
+    assert "/api/public/developers/1/projects" in paths
+    assert not any(path.startswith("/api/public/developers/2") for path in paths)
+
+
+def test_publish_writes_precompressed_files_and_switches_current(publisher, public_client, tmp_path):
+    version_dir = asyncio.run(publisher.publish())
+
+    current = tmp_path / "current"
+    assert current.is_symlink() and current.resolve() == version_dir
+    projects = current / "api/public/projects.json"
+    # Тело совпадает с тем, что отдает сама ручка
+    assert projects.read_bytes() == public_client.get("/api/public/projects", headers={"Accept-Encoding": "identity"}).content
+    assert gzip.decompress((current / "api/public/projects.json.gz").read_bytes()) == projects.read_bytes()
+    assert brotli.decompress((current / "api/public/projects.json.br").read_bytes()) == projects.read_bytes()
+
+    manifest = json.loads((current / "manifest.json").read_text())
+    assert "api/public/projects/20.json" in manifest
+
+
+def test_unchanged_files_are_hardlinked_from_previous_version(publisher, snapshot):
+    first = asyncio.run(publisher.publish())
+
+    snapshot.projects = {**snapshot.projects, 99: make_project(99, BASE_TIME.replace(year=2026))}
+    snapshot._reindex_projects()
+    publisher.app.state.response_cache.invalidate("projects")
+    second = asyncio.run(publisher.publish())
+
+    unchanged = "api/public/technologies.json"
+    changed = "api/public/projects.json"
+    assert (first / unchanged).stat().st_ino == (second / unchanged).stat().st_ino
+    assert (first / f"{unchanged}.br").stat().st_ino == (second / f"{unchanged}.br").stat().st_ino
+    assert (first / changed).stat().st_ino != (second / changed).stat().st_ino
+    assert (second / "api/public/projects/99.json").is_file()
+
+
+def test_old_versions_are_pruned(publisher, tmp_path):
+    versions = [asyncio.run(publisher.publish()) for _ in range(3)]
+
+    assert sorted(path.name for path in (tmp_path / "versions").iterdir()) == [v.name for v in versions[1:]]
+    assert (tmp_path / "current").resolve() == versions[-1]
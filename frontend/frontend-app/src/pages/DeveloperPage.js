@@ -31,6 +31,7 @@ import ArrowForwardIcon from '@mui/icons-material/ArrowForward';
 // ИМПОРТЫ ДЛЯ ФОРМЫ
 import ContactForm from '../components/ContactForm';
 import { useContactForm } from '../hooks/useContactForm';
+import { takePrerenderData } from '../utils/prerenderData';
 
 const DeveloperPage = () => {
     const {developerSlug} = useParams();
@@ -50,6 +51,14 @@ const DeveloperPage = () => {
             try {
                 setLoading(true);
 
+                // Пререндеренная страница: разработчик и его проекты уже вшиты в HTML
+                const prerendered = takePrerenderData('developer', (data) => data.slug === developerSlug);
+                if (prerendered) {
+                    setDeveloper(prerendered.developer);
+                    setProjects(prerendered.projects);
+                    return;
+                }
+
                 // Загружаем всех разработчиков для поиска по имени
                 const developersResponse = await fetch('/api/public/developers?active_only=true&limit=50');
                 if (!developersResponse.ok) {
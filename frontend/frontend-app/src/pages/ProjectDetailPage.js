@@ -29,6 +29,7 @@ import ProjectGallery from '../components/ProjectGallery';
 // ИМПОРТЫ ДЛЯ ФОРМЫ
 import ContactForm from '../components/ContactForm';
 import { useContactForm } from '../hooks/useContactForm';
+import { takePrerenderData } from '../utils/prerenderData';
 
 const ProjectDetailPage = () => {
   const { projectId } = useParams();
@@ -47,12 +48,16 @@ const ProjectDetailPage = () => {
       try {
         setLoading(true);
 
-        // Load project details
-        const projectResponse = await fetch(`/api/public/projects/${projectId}`);
-        if (!projectResponse.ok) {
-          throw new Error('Project not found');
+        // Load project details (на пререндеренной странице данные уже вшиты в HTML)
+        const prerendered = takePrerenderData('project', (data) => String(data.id) === String(projectId));
+        let projectData = prerendered?.project;
+        if (!projectData) {
+          const projectResponse = await fetch(`/api/public/projects/${projectId}`);
+          if (!projectResponse.ok) {
+            throw new Error('Project not found');
+          }
+          projectData = await projectResponse.json();
         }
-        const projectData = await projectResponse.json();
         console.log('Project Data:', projectData);
         setProject(projectData);
 
@@ -0,0 +1,23 @@
+// frontend/frontend-app/src/utils/prerenderData.js
+
+// Данные, которые сервер вшил в пререндеренную страницу (/project/:id, /developer/:slug).
+// Берем их один раз вместо первого запроса к API; при навигации внутри SPA их уже нет.
+export const takePrerenderData = (type, matches) => {
+  const element = document.getElementById('prerender-data');
+  if (!element) {
+    return null;
+  }
+
+  try {
+    const data = JSON.parse(element.textContent);
+    if (data.type !== type || !matches(data)) {
+      return null;
+    }
+    element.remove();
+    return data;
+  } catch (error) {
+    console.error('Failed to read prerender data:', error);
+    element.remove();
+    return null;
+  }
+};
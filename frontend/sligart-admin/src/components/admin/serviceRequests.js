@@ -4,7 +4,7 @@ import {
   List, Datagrid, TextField, DateField, EmailField,
   Edit, SimpleForm, TextInput, SelectInput, ReferenceInput, AutocompleteInput,
   Show, SimpleShowLayout, Filter, SearchInput, useRecordContext,
-  FunctionField, ChipField
+  FunctionField, ChipField, DateInput, BooleanInput
 } from 'react-admin';
 import {
   Card,
@@ -39,6 +39,10 @@ const ServiceRequestFilter = (props) => (
       { id: 'maintenance', name: 'Maintenance' },
       { id: 'other', name: 'Other' }
     ]} />
+    {/* По умолчанию сервер отдает только последние месяцы (SERVICE_REQUESTS_ADMIN_RECENT_MONTHS) */}
+    <DateInput source="created_after" label="Created after" />
+    <BooleanInput source="all_time" label="Include older requests" />
+    <BooleanInput source="archived" label="Archived requests" />
   </Filter>
 );
 